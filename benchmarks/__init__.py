@@ -0,0 +1,16 @@
+"""Benchmarks for shellplot.
+
+The benchmarks follow the conventions of airspeed velocity (asv), i.e. they are
+classes with ``setup`` and ``time_*`` methods, parametrized via ``params``. They
+cover the plot functions, the axis and the drawing stages, for various data
+sizes, figsizes and dtypes. They can be run with asv (see ``asv.conf.json``) or
+directly via::
+
+    python -m benchmarks [module ...] [-b REGEX]
+
+To catch performance regressions, save a baseline before a change and compare
+against it afterwards (exits with status 1 if there are regressions)::
+
+    python -m benchmarks --save .asv/baseline.json
+    python -m benchmarks --compare .asv/baseline.json --threshold 1.2
+"""
@@ -0,0 +1,198 @@
+"""Minimal runner for the asv style benchmarks, for use without asv.
+
+Benchmarks are timed (``time_*``), or their peak memory is measured
+(``peakmem_*``, via tracemalloc, i.e. of allocations by Python and numpy).
+Timings can be saved as a baseline, and compared against a baseline to catch
+performance regressions (exits with status 1 if there are any)::
+
+    python -m benchmarks --save .asv/baseline.json
+    python -m benchmarks --compare .asv/baseline.json --threshold 1.2
+"""
+import argparse
+import importlib
+import inspect
+import itertools
+import json
+import os
+import pkgutil
+import re
+import sys
+import timeit
+import tracemalloc
+
+import benchmarks
+
+
+def iter_benchmarks(modules=None):
+    """Yield (name, cls, method name) for all benchmarks in the given modules"""
+    if not modules:
+        modules = [m.name for m in pkgutil.iter_modules(benchmarks.__path__)]
+        modules = [m for m in modules if not m.startswith("_")]
+
+    for module_name in modules:
+        module = importlib.import_module(f"benchmarks.{module_name}")
+        for cls_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            for method in sorted(dir(cls)):
+                if method.startswith(("time_", "peakmem_")):
+                    yield f"{module_name}.{cls_name}.{method}", cls, method
+
+
+def iter_params(cls):
+    """Yield all parameter combinations of a benchmark class"""
+    params = getattr(cls, "params", None)
+    if params is None:
+        yield ()
+    elif params and isinstance(params[0], list):
+        yield from itertools.product(*params)
+    else:
+        yield from ((p,) for p in params)
+
+
+def time_benchmark(cls, method, params, repeat=3):
+    """Best time per call in seconds"""
+    bench = cls()
+    if hasattr(bench, "setup"):
+        try:
+            bench.setup(*params)
+        except NotImplementedError:  # asv convention for skipping benchmarks
+            return None
+    func = getattr(bench, method)
+
+    timer = timeit.Timer(lambda: func(*params))
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    if hasattr(bench, "teardown"):
+        bench.teardown(*params)
+    return best
+
+
+def peakmem_benchmark(cls, method, params):
+    """Peak of the memory allocated during a call, in bytes"""
+    bench = cls()
+    if hasattr(bench, "setup"):
+        try:
+            bench.setup(*params)
+        except NotImplementedError:
+            return None
+    func = getattr(bench, method)
+
+    tracemalloc.start()
+    try:
+        func(*params)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    if hasattr(bench, "teardown"):
+        bench.teardown(*params)
+    return float(peak)
+
+
+def format_value(key, value):
+    """Format a timing, or the peak memory of a peakmem benchmark"""
+    if ".peakmem_" not in key:
+        return format_time(value)
+    for unit, scale in [("GiB", 2**30), ("MiB", 2**20), ("KiB", 2**10)]:
+        if value >= scale:
+            return f"{value / scale:7.3f}{unit}"
+    return f"{value:8.0f}B"
+
+
+def format_time(seconds):
+    for unit, scale in [("s", 1), ("ms", 1e-3), ("us", 1e-6)]:
+        if seconds >= scale:
+            return f"{seconds / scale:8.3f}{unit}"
+    return f"{seconds / 1e-9:8.3f}ns"
+
+
+def run_benchmarks(modules=None, pattern=None, repeat=3):
+    """Run benchmarks, print and return their timings (or peak memory) by
+    benchmark name.
+
+    Timings are None for skipped benchmarks, and "failed" for benchmarks that
+    raised an error.
+    """
+    timings = dict()
+    for name, cls, method in iter_benchmarks(modules):
+        for params in iter_params(cls):
+            key = f"{name}{params}"
+            if pattern is not None and re.search(pattern, key) is None:
+                continue
+            try:
+                if method.startswith("peakmem_"):
+                    seconds = peakmem_benchmark(cls, method, params)
+                else:
+                    seconds = time_benchmark(cls, method, params, repeat=repeat)
+            except Exception as error:  # report, but keep running the others
+                seconds, timing = "failed", f"    failed  ({type(error).__name__})"
+            else:
+                timing = "   skipped" if seconds is None else format_value(key, seconds)
+            print(f"{timing}  {key}", flush=True)
+            timings[key] = seconds
+    return timings
+
+
+def compare(timings, baseline, threshold=1.2):
+    """Print ratios of timings to baseline, returns names of regressions"""
+    regressions = list()
+    print(f"\n{'baseline':>10}  {'current':>10}  {'ratio':>6}  benchmark")
+    for key, seconds in timings.items():
+        before = baseline.get(key)
+        if not isinstance(seconds, float) or not isinstance(before, float):
+            continue
+        ratio = seconds / before
+        flag = ""
+        if ratio > threshold:
+            flag = "  <- regression"
+            regressions.append(key)
+        elif ratio < 1 / threshold:
+            flag = "  <- improvement"
+        print(
+            f"{format_value(key, before)}  {format_value(key, seconds)}  "
+            f"{ratio:6.2f}  {key}{flag}"
+        )
+    return regressions
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("modules", nargs="*", help="benchmark modules to run")
+    parser.add_argument("-b", "--bench", help="regex of the benchmarks to run")
+    parser.add_argument("--repeat", type=int, default=3, help="default: 3")
+    parser.add_argument("--save", metavar="FILE", help="save timings as baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare to baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="slowdown ratio that counts as regression, default: 1.2",
+    )
+    args = parser.parse_args(args)
+
+    timings = run_benchmarks(args.modules, pattern=args.bench, repeat=args.repeat)
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.save) or ".", exist_ok=True)
+        with open(args.save, "w") as file:
+            json.dump(timings, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(timings, baseline, threshold=args.threshold)
+        if len(regressions) > 0:
+            print(
+                f"\n{len(regressions)} benchmark(s) regressed by more than "
+                f"{args.threshold}x"
+            )
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,16 @@
+"""Helpers for generating benchmark data"""
+import numpy as np
+
+DTYPES = ["float", "int", "datetime64"]
+
+
+def random_walk(n_points, dtype="float", seed=42):
+    """Random walk of n_points, as float, int or datetime64 array"""
+    rng = np.random.default_rng(seed)
+    x = np.cumsum(rng.standard_normal(n_points))
+    if dtype == "int":
+        return (100 * x).astype(int)
+    if dtype == "datetime64":
+        seconds = (3600 * (x - x.min())).astype("timedelta64[s]")
+        return np.datetime64("2021-01-01T00:00:00") + seconds
+    return x
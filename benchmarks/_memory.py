@@ -0,0 +1,12 @@
+"""Helpers for benchmarks on large data"""
+import os
+
+
+def require_memory(n_bytes):
+    """Skip a benchmark (in its setup) if the machine has too little memory"""
+    try:
+        total = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        return
+    if n_bytes > total:
+        raise NotImplementedError(f"Benchmark requires {n_bytes / 1e9:.1f} GB")
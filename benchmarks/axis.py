@@ -0,0 +1,43 @@
+"""Benchmarks for fitting axes and transforming data to display coordinates"""
+from shellplot.axis import Axis
+
+from ._data import DTYPES, random_walk
+
+
+class AxisFitTransform:
+    params = [[10**3, 10**5, 10**6, 10**7], DTYPES]
+    param_names = ["n_points", "dtype"]
+
+    def setup(self, n_points, dtype):
+        self.x = random_walk(n_points, dtype)
+        self.axis = Axis(display_length=71).fit(self.x)
+
+    def time_fit(self, n_points, dtype):
+        self.axis.reset()
+        self.axis.fit(self.x)
+
+    def time_transform(self, n_points, dtype):
+        self.axis.transform(self.x)
+
+    def time_display_coordinates(self, n_points, dtype):
+        self.axis.display_coordinates(self.x)
+
+    def peakmem_transform(self, n_points, dtype):
+        self.axis.transform(self.x)
+
+    def peakmem_display_coordinates(self, n_points, dtype):
+        self.axis.display_coordinates(self.x)
+
+
+class AxisTicks:
+    params = [[20, 71, 200], DTYPES]
+    param_names = ["display_length", "dtype"]
+
+    def setup(self, display_length, dtype):
+        self.x = random_walk(100, dtype)
+        self.axis = Axis(display_length=display_length)
+
+    def time_auto_ticks(self, display_length, dtype):
+        self.axis.reset()
+        self.axis.fit(self.x)
+        list(self.axis.generate_display_ticks())
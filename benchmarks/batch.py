@@ -0,0 +1,25 @@
+"""Benchmarks for batch rendering of many plots"""
+import os
+
+import numpy as np
+
+from shellplot.batch import PlotSpec, render_many
+
+
+class RenderMany:
+    params = [[1, 2, 4, 8], ["thread", "process"]]
+    param_names = ["workers", "executor"]
+    timeout = 600
+
+    def setup(self, workers, executor):
+        if workers > (os.cpu_count() or 1):
+            raise NotImplementedError("Not enough cpus")
+        rng = np.random.default_rng(42)
+        x = np.linspace(0, 1, 10**5)
+        self.specs = [
+            PlotSpec("plot", (x, np.cumsum(rng.standard_normal(len(x)))))
+            for _ in range(64)
+        ]
+
+    def time_render_many(self, workers, executor):
+        render_many(self.specs, workers=workers, executor=executor)
@@ -0,0 +1,74 @@
+"""Benchmarks for the drawing module"""
+import numpy as np
+
+from shellplot.axis import Axis
+from shellplot.drawing import (
+    CANVAS_DTYPE,
+    CANVAS_MODES,
+    PALETTE,
+    LegendItem,
+    _draw_canvas,
+    _draw_x_axis,
+    _draw_y_axis,
+    _join_frame,
+    draw_frame,
+)
+
+FIGSIZES = [(71, 27), (200, 60), (1000, 300)]
+
+
+class DrawCanvas:
+    params = [FIGSIZES, list(CANVAS_MODES)]
+    param_names = ["figsize", "canvas_mode"]
+
+    def setup(self, figsize, canvas_mode):
+        rng = np.random.default_rng(42)
+        shape = (figsize[1], figsize[0])  # rows in display order
+        self.canvas = rng.choice(list(PALETTE.keys()), size=shape)
+        self.canvas = self.canvas.astype(CANVAS_DTYPE)
+        self.subcanvas = None
+        if canvas_mode != "char":  # sparse sub-cells, as for plotted series
+            n_x, n_y = CANVAS_MODES[canvas_mode]
+            subshape = (figsize[1] * n_y, figsize[0] * n_x)
+            self.subcanvas = rng.random(subshape) < 0.1
+            self.canvas[rng.random(shape) < 0.9] = 0
+
+    def time_draw_canvas(self, figsize, canvas_mode):
+        _draw_canvas(self.canvas, self.subcanvas, canvas_mode)
+
+
+class DrawAxes:
+    params = FIGSIZES
+    param_names = ["figsize"]
+
+    def setup(self, figsize):
+        self.x_axis = Axis(display_length=figsize[0], label="x", limits=(0, 1))
+        self.y_axis = Axis(display_length=figsize[1], label="y", limits=(-1e3, 1e3))
+        # generate ticks upfront, such that only drawing is timed
+        list(self.x_axis.generate_display_ticks())
+        list(self.y_axis.generate_display_ticks())
+
+    def time_draw_x_axis(self, figsize):
+        _draw_x_axis(self.x_axis, left_pad=6)
+
+    def time_draw_y_axis(self, figsize):
+        _draw_y_axis(self.y_axis, left_pad=6)
+
+
+class JoinFrame:
+    params = FIGSIZES
+    param_names = ["figsize"]
+
+    def setup(self, figsize):
+        rng = np.random.default_rng(42)
+        canvas = rng.choice(list(PALETTE.keys()), size=(figsize[1], figsize[0]))
+        canvas = canvas.astype(CANVAS_DTYPE)
+        x_axis = Axis(display_length=figsize[0], label="x", limits=(0, 1))
+        y_axis = Axis(display_length=figsize[1], label="y", limits=(0, 1))
+
+        self.canvas_lines = _draw_canvas(canvas)
+        legend = [LegendItem(1, "a"), LegendItem(2, "b")]
+        self.frame = draw_frame(canvas.shape, x_axis, y_axis, legend, "title")
+
+    def time_join_frame(self, figsize):
+        _join_frame(self.frame, self.canvas_lines)
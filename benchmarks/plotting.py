@@ -0,0 +1,124 @@
+"""Benchmarks for the plot functions, and for plotting of large series"""
+import numpy as np
+
+from shellplot._plotting import PlotCall, _barh, _boxplot, _hist, _plot
+from shellplot.figure import figure
+
+from ._data import DTYPES, random_walk
+from ._memory import require_memory
+
+N_POINTS = [10**3, 10**5, 10**6]
+
+
+class Plot:
+    params = [N_POINTS, DTYPES, [None, True]]
+    param_names = ["n_points", "dtype", "line"]
+
+    def setup(self, n_points, dtype, line):
+        self.x = random_walk(n_points, dtype, seed=1)
+        self.y = random_walk(n_points, "float", seed=2)
+        self.fig = figure(figsize=(71, 27))
+        self.fig.x_axis.fit(self.x)
+        self.fig.y_axis.fit(self.y)
+
+    def time_plot(self, n_points, dtype, line):
+        PlotCall(_plot, [self.x, self.y], {"line": line})(self.fig)
+
+    def peakmem_plot(self, n_points, dtype, line):
+        PlotCall(_plot, [self.x, self.y], {"line": line})(self.fig)
+
+
+class Hist:
+    params = [N_POINTS, ["float", "int"], [10, 50]]
+    param_names = ["n_points", "dtype", "bins"]
+
+    def setup(self, n_points, dtype, bins):
+        self.x = random_walk(n_points, dtype)
+        self.fig = figure(figsize=(71, 27))
+
+    def time_hist(self, n_points, dtype, bins):
+        PlotCall(_hist, [self.x], {"bins": bins})(self.fig)
+
+
+class Barh:
+    params = [[2, 5, 10], [(71, 27), (200, 60)]]
+    param_names = ["n_bars", "figsize"]
+
+    def setup(self, n_bars, figsize):
+        self.x = np.arange(1, n_bars + 1)
+        self.fig = figure(figsize=figsize)
+
+    def time_barh(self, n_bars, figsize):
+        PlotCall(_barh, [self.x], {})(self.fig)
+
+
+class Boxplot:
+    params = [N_POINTS, ["float", "int"], [1, 5]]
+    param_names = ["n_points", "dtype", "n_boxes"]
+
+    def setup(self, n_points, dtype, n_boxes):
+        self.x = np.stack(
+            [random_walk(n_points, dtype, seed=ii) for ii in range(n_boxes)]
+        )
+        self.fig = figure(figsize=(71, 27))
+
+    def time_boxplot(self, n_points, dtype, n_boxes):
+        PlotCall(_boxplot, [self.x], {})(self.fig)
+
+
+class PlotManySeries:
+    params = [[10, 100, 500], [None, True]]
+    param_names = ["n_series", "line"]
+
+    def setup(self, n_series, line):
+        rng = np.random.default_rng(42)
+        x = np.arange(1000)
+        y = np.cumsum(rng.standard_normal((n_series, len(x))), axis=1)
+
+        self.fig = figure(figsize=(71, 27))
+        self.fig.plot(np.tile(x, (n_series, 1)), y, line=line)
+
+    def time_draw(self, n_series, line):
+        self.fig.set_title(None)  # drop the cached figure and layers, to redraw
+        self.fig._plot_builder._layers = []
+        self.fig.draw()
+
+    def time_fit(self, n_series, line):
+        self.fig._plot_builder.fit(self.fig)
+
+
+class PlotColor:
+    params = [[10**4, 10**6], [10, 100, 2000]]
+    param_names = ["n_points", "n_colors"]
+
+    def setup(self, n_points, n_colors):
+        rng = np.random.default_rng(42)
+        self.x = rng.standard_normal(n_points)
+        self.y = rng.standard_normal(n_points)
+        self.color = rng.integers(0, n_colors, n_points)
+
+    def time_plot_color(self, n_points, n_colors):
+        fig = figure(figsize=(71, 27))
+        fig.plot(self.x, self.y, color=self.color)
+
+
+class PlotLargeSeries:
+    params = [[10**6, 10**7, 10**8], [None, True]]
+    param_names = ["n_points", "line"]
+    timeout = 600
+
+    def setup(self, n_points, line):
+        require_memory(n_points * 8 * 8)  # x, y and the transform temporaries
+        rng = np.random.default_rng(42)
+        x = np.linspace(0, 1, n_points)
+        y = np.cumsum(rng.standard_normal(n_points))
+
+        self.fig = figure(figsize=(71, 27))
+        self.fig.plot(x, y, line=line)
+
+    def time_draw(self, n_points, line):
+        self.fig.set_title(None)  # drop the cached figure, to redraw
+        self.fig.draw()
+
+    def time_draw_cached(self, n_points, line):
+        self.fig.draw()
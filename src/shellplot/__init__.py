@@ -1,22 +1,50 @@
 # -*- coding: utf-8 -*-
-from pkg_resources import DistributionNotFound, get_distribution
-
-try:
-    # Change here if project is renamed and does not equal the package name
-    dist_name = __name__
-    __version__ = get_distribution(dist_name).version
-except DistributionNotFound:
-    __version__ = "unknown"
-finally:
-    del get_distribution, DistributionNotFound
-
-
 # -----------------------------------------------------------------------------
 # Expose imports to be directly available via import shellplot as plt
 # -----------------------------------------------------------------------------
 
-from shellplot import pandas_api  # noqa: F401
-from shellplot._config import get_option, set_option  # noqa: F401
+from shellplot._config import (  # noqa: F401
+    get_option,
+    register_profile_hook,
+    set_option,
+    unregister_profile_hook,
+)
+from shellplot.batch import PlotSpec, render_many  # noqa: F401
 from shellplot.figure import figure  # noqa: F401
+from shellplot.histogram import Histogram  # noqa: F401
+from shellplot.layout import Layout, subplots  # noqa: F401
 from shellplot.plots import barh, boxplot, hist, plot  # noqa: F401
-from shellplot.utils import load_dataset  # noqa: F401
+from shellplot.profiling import profile  # noqa: F401
+from shellplot.quantiles import QuantileSketch  # noqa: F401
+from shellplot.utils import ChunkedArray, load_dataset  # noqa: F401
+
+# -----------------------------------------------------------------------------
+# Lazy attributes, which are slow to look up or import
+# -----------------------------------------------------------------------------
+
+
+def __getattr__(name):
+    """Lazily look up the version and import the pandas backend, as both take
+    long compared to importing the rest of shellplot"""
+    if name == "__version__":
+        globals()[name] = _version()
+        return globals()[name]
+    elif name == "pandas_api":
+        import importlib
+
+        return importlib.import_module("shellplot.pandas_api")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _version():
+    """Version from the installed package metadata, without scanning all
+    distributions of the environment (as pkg_resources does)"""
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:  # python < 3.8
+        return "unknown"
+    try:
+        # Change here if project is renamed and does not equal the package name
+        return version(__name__)
+    except PackageNotFoundError:
+        return "unknown"
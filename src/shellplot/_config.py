@@ -1,10 +1,12 @@
 """
 Configuration options for shellplot
 """
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List
 
 _global_config: Dict[str, Any] = {"figsize": (71, 27)}
 
+_profile_hooks: List[Callable] = list()
+
 _available_keys = _global_config.keys()
 
 
@@ -18,3 +20,19 @@ def set_option(key, value):
             f"Option not available! Please use one of {_available_keys}"
         )
     _global_config[key] = value
+
+
+def register_profile_hook(hook: Callable) -> None:
+    """Register a hook, which is called with the `ProfileReport` of every draw.
+
+    While hooks are registered, all draws are profiled, see
+    `shellplot.profiling`. This allows to forward the timings to e.g. a
+    metrics system.
+    """
+    if hook not in _profile_hooks:
+        _profile_hooks.append(hook)
+
+
+def unregister_profile_hook(hook: Callable) -> None:
+    """Remove a registered profile hook"""
+    _profile_hooks.remove(hook)
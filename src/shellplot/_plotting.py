@@ -3,25 +3,152 @@
 These functions require an instantiated figure, their call then updates the
 figure state.
 """
-from dataclasses import dataclass
-from typing import Callable, Dict, List
+import hashlib
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
 
 import numpy as np
 
-from shellplot.drawing import LegendItem
-from shellplot.utils import numpy_1d, numpy_2d
+from shellplot._series import Series, as_series
+from shellplot.drawing import (
+    CANVAS_MODES,
+    LEGEND_SYMBOLS,
+    LegendItem,
+    empty_canvas,
+    register_symbol,
+    xy_view,
+)
+from shellplot.histogram import Histogram
+from shellplot.profiling import stage
+from shellplot.quantiles import QuantileSketch
+from shellplot.utils import (
+    ChunkedArray,
+    chunked,
+    fingerprint,
+    numpy_1d,
+    numpy_2d,
+    remove_any_nan,
+    zip_chunks,
+)
+
+BOX_QUANTILES = [0, 0.25, 0.5, 0.75, 1.0]
 
 
 @dataclass(frozen=True)
 class PlotCall:
-    """Class for storing a call to a plot functions."""
+    """Class for storing a call to a plot functions.
+
+    A call is executed in two steps: `fit` fits the axes of the figure to it
+    (and assigns its style), `render` then draws it into its own `Layer`.
+    """
 
     func: Callable
     args: List
     kwargs: Dict
+    _fingerprint: Hashable = field(default=None, compare=False, repr=False)
+    _limits: Optional[Tuple] = field(default=None, compare=False, repr=False)
+    _last: Optional[Tuple] = field(default=None, compare=False, repr=False)
 
     def __call__(self, fig):
-        self.func(fig, *self.args, **self.kwargs)
+        """Fit the axes to the call, and render it into a new layer"""
+        layer = Layer.empty(fig, subcells=self.func is _plot)
+        self.render(fig, layer, self.fit(fig))
+        return layer
+
+    @property
+    def name(self):
+        return self.func.__name__.lstrip("_")
+
+    @property
+    def zorder(self):
+        """Layers of higher z-order are drawn on top. By default, series are
+        drawn on top of histograms, bars and boxes."""
+        return self.kwargs.get("zorder", 2 if self.func is _plot else 1)
+
+    def fit(self, fig):
+        """Fit the axes of the figure, returns the arguments to render with.
+        Series do not fit the axes, see `PlotBuilder.fit`."""
+        return FIT_FUNCS[self.func](fig, *self.args, **self.kwargs)
+
+    def render(self, fig, layer, args):
+        """Render the call into a layer, with the arguments of `fit`"""
+        with stage(self.name):
+            self.func(fig, layer, *args)
+
+    def limits(self):
+        """Min and max of the x, y points of a `_plot` call, which the axes are
+        fitted to. These are computed once, as plotted data is not expected to
+        change."""
+        if self._limits is None:
+            if _any_chunked(*self.args):  # the last point comes with the same pass
+                limits, last = _chunked_xy_stats(*self.args)
+                object.__setattr__(self, "_last", last)
+            else:
+                limits = _xy_limits(*self.args)
+            object.__setattr__(self, "_limits", limits)
+        return self._limits
+
+    def last_point(self):
+        """Last x, y point of a `_plot` call, which appended points continue the
+        line from. Computed once, along with the limits for chunked points."""
+        if self._last is None:
+            object.__setattr__(self, "_last", _last_xy(*self.args))
+        return self._last
+
+    def fingerprint(self):
+        """Fingerprint of the content of the call, to cache drawn figures.
+
+        Plotted data is only hashed once, as it is not expected to change.
+        Histograms and sketches however can be updated after plotting, so that
+        they are fingerprinted on every call (which is cheap).
+        """
+        if self._fingerprint is None:
+            object.__setattr__(
+                self, "_fingerprint", fingerprint([self.func, self.args, self.kwargs])
+            )
+        args = [
+            x for arg in self.args for x in (arg if isinstance(arg, list) else [arg])
+        ]
+        accumulators = [x for x in args if isinstance(x, (Histogram, QuantileSketch))]
+        return self._fingerprint, tuple(fingerprint(x) for x in accumulators)
+
+
+@dataclass
+class Layer:
+    """Canvas that a single plot call is rendered into.
+
+    Layers are kept between draws, and composited onto the canvas of the figure
+    in z-order. A layer is only rendered anew if its key changed, i.e. the call,
+    its style or the scale of the axes.
+    """
+
+    canvas: np.ndarray
+    subcanvas: Optional[np.ndarray] = None  # of sub-cells, for series
+    key: Hashable = None  # (call fingerprint, style, axes) it was rendered for
+
+    @classmethod
+    def empty(cls, fig, subcells=False):
+        """Empty layer of the figure, with sub-cells in sub-cell canvas modes"""
+        layers, _ = cls.empty_stack(fig, 1, subcells=subcells)
+        return layers[0]
+
+    @classmethod
+    def empty_stack(cls, fig, n, subcells=False):
+        """n empty layers, whose canvases are views of a single stack. Returns
+        the layers and the stack that points are added to, of shape (n, rows,
+        columns), see `_plot_series`"""
+        canvases = empty_canvas((n,) + fig.canvas.shape)
+        if not subcells or fig.subcanvas is None:
+            return [cls(canvas=canvas) for canvas in canvases], canvases
+
+        subcanvases = np.zeros((n,) + fig.subcanvas.shape, dtype=bool)
+        layers = [cls(canvas=c, subcanvas=sub) for c, sub in zip(canvases, subcanvases)]
+        return layers, subcanvases
+
+    @property
+    def points_canvas(self):
+        """Canvas that the points of series are added to"""
+        return self.canvas if self.subcanvas is None else self.subcanvas
 
 
 class PlotBuilder:
@@ -29,94 +156,417 @@ class PlotBuilder:
 
     def __init__(self):
         self._plot_calls = list()
+        self._layers = list()  # rendered layer of each plot call, once created
+        self._appended = dict()  # index of plot call -> list of appended x, y
+        self._appended_rendered = dict()  # index -> number rendered into layer
+        self._styles = list()  # (marker, line) of each plot call, once created
+        self._appended_fingerprint = None  # chained over all appended points
 
     def add(self, call):
         self._plot_calls.append(call)
 
-    def fit(self, fig):
-        l_x, l_y = list(), list()
-        for plot_call in self._plot_calls:
-            x, y = plot_call.args
-            l_x.append(x)
-            l_y.append(y)
-
-        fig.x_axis.fit(np.concatenate([x for x in l_x]))
-        fig.y_axis.fit(np.concatenate([y for y in l_y]))
-
-    def create(self, fig):
+    def fingerprint(self):
+        """Fingerprint of all plot calls and appended points"""
+        calls = tuple(call.fingerprint() for call in self._plot_calls)
+        return calls, self._appended_fingerprint
+
+    def find(self, series=None):
+        """Find index of a `_plot` call, by order of plotting or by label.
+
+        If series is None, the last `_plot` call is returned. Returns None if
+        there is no matching call.
+        """
+        plot_indices = [
+            ii for ii, call in enumerate(self._plot_calls) if call.func is _plot
+        ]
+        if series is None:
+            return plot_indices[-1] if len(plot_indices) > 0 else None
+        if isinstance(series, int):
+            if -len(plot_indices) <= series < len(plot_indices):
+                return plot_indices[series]
+            return None
+        for ii in plot_indices:
+            if self._plot_calls[ii].kwargs.get("label") == series:
+                return ii
+        return None
+
+    def append(self, index, x, y):
+        """Append x, y points to the `_plot` call at index.
+
+        Appended points are only merged into the call when the figure is
+        created, so that appending does not copy all previous points.
+        """
+        self._appended.setdefault(index, list()).append((x, y))
+        # chained digest of all appended points, which does not nest deeper
+        key = (self._appended_fingerprint, index, fingerprint(x), fingerprint(y))
+        self._appended_fingerprint = hashlib.sha1(repr(key).encode()).hexdigest()
+
+    def render_appended(self, fig, index, x, y):
+        """Render x, y points, before appending them to the `_plot` call at
+        index, directly into the layer of the call. The new lines do not cover
+        markers of the layer, such that it matches rendering all points."""
+        marker, line = self.style(index)
+        if line is not None:  # the line needs to continue from the last point
+            x_last, y_last = self.last_point(index)
+            x, y = np.concatenate([x_last, x]), np.concatenate([y_last, y])
+
+        _plot(fig, self._layers[index], x, y, marker=marker, line=line)
+        self._appended_rendered[index] = self._appended_rendered.get(index, 0) + 1
+
+    def last_point(self, index):
+        """Last x, y point of the `_plot` call at index, including appended"""
+        return _last_appended(self._appended.get(index, [])) or (
+            self._plot_calls[index].last_point()
+        )
+
+    def style(self, index):
+        """Marker and line of a created `_plot` call"""
+        return self._styles[index]
+
+    def is_empty(self):
+        return len(self._plot_calls) == 0
+
+    def is_streamable(self):
+        """Whether points can be added without re-creating the figure, i.e.
+        whether all plot calls are `_plot` (other calls modify the axes)"""
+        return all(call.func is _plot for call in self._plot_calls)
+
+    def _merge_appended(self):
+        for index, points in self._appended.items():
+            call = self._plot_calls[index]
+            x = _concatenate(call.args[0], [x for x, _ in points])
+            y = _concatenate(call.args[1], [y for _, y in points])
+            x_limits, y_limits = call.limits()  # updated by the appended points
+            limits = _xy_limits(
+                np.concatenate([x_limits] + [x for x, _ in points]),
+                np.concatenate([y_limits] + [y for _, y in points]),
+            )
+            self._plot_calls[index] = PlotCall(
+                func=call.func,
+                args=[x, y],
+                kwargs=call.kwargs,
+                _fingerprint=fingerprint((call.fingerprint(), points)),
+                _limits=limits,
+                _last=_last_appended(points) or call._last,
+            )
+            # the layer is kept, if all appended points were rendered into it
+            layer = self._layers[index] if index < len(self._layers) else None
+            if (
+                layer is not None
+                and layer.key[0] == call.fingerprint()
+                and self._appended_rendered.get(index, 0) == len(points)
+            ):
+                layer.key = (self._plot_calls[index].fingerprint(), *layer.key[1:])
+        self._appended = dict()
+        self._appended_rendered = dict()
+        self._appended_fingerprint = None
+
+    def fit_data(self):
+        """x, y data that the axes of a streamable figure are fitted to, i.e.
+        the limits of all series (which are cached, such that refitting does
+        not depend on the number of points)"""
+        self._merge_appended()
+        limits = [plot_call.limits() for plot_call in self._plot_calls]
+        return (
+            np.concatenate([x for x, _ in limits]),
+            np.concatenate([y for _, y in limits]),
+        )
+
+    def fit(self, fig, fit_data=True):
+        """Fit the axes of the figure to all plot calls, before any is rendered.
+
+        The axes of streamable figures are fitted to the data of all series (if
+        fit_data). Otherwise, histograms, bars and boxes fit the axes, in order
+        of plotting. Returns the arguments to render each call with.
+        """
+        with stage("fit"):
+            if fit_data and self.is_streamable():
+                x, y = self.fit_data()
+                fig.x_axis.fit(x)
+                fig.y_axis.fit(y)
+            return [plot_call.fit(fig) for plot_call in self._plot_calls]
+
+    def create(self, fig, fit=True):
+        """Create the figure, i.e. fit the axes, render all layers that changed
+        and composite them. If fit is False, the axes of a streamable figure
+        need to be fitted already"""
         if len(self._plot_calls) == 0:
             raise ValueError("Cannot plot empty figure!")
 
-        if all(plot_call.func is _plot for plot_call in self._plot_calls):
-            self.fit(fig)
-        else:
-            # if we mix plot types, we make sure that _plot function is called
-            # last. all other plotting funcs will Internally fit fig axes.
-            self._plot_calls.sort(key=lambda x: 1 if x.func is _plot else 0)
-        for plot_call in self._plot_calls:
-            plot_call(fig)
-
+        self._merge_appended()
+        render_args = self.fit(fig, fit_data=fit)
+        self._styles = [
+            tuple(args[2:]) if call.func is _plot else None
+            for call, args in zip(self._plot_calls, render_args)
+        ]
+
+        axes_key = (
+            fig.canvas_mode,
+            fig.x_axis.scale_fingerprint(),
+            fig.y_axis.scale_fingerprint(),
+        )
+        keys = [
+            (call.fingerprint(), style, axes_key)
+            for call, style in zip(self._plot_calls, self._styles)
+        ]
+        layers = [
+            layer if layer.key == key else None
+            for layer, key in zip(self._layers, keys)
+        ]
+        layers += [None] * (len(keys) - len(layers))
+
+        # series are rendered together, others (and chunked series) one by one
+        stale = [ii for ii, layer in enumerate(layers) if layer is None]
+        series = [
+            ii
+            for ii in stale
+            if self._plot_calls[ii].func is _plot and not _any_chunked(*render_args[ii])
+        ]
+        stack = fig.canvas if fig.subcanvas is None else fig.subcanvas
+        for batch in _batches(series, stack.size):
+            batch_layers, canvases = Layer.empty_stack(fig, len(batch), subcells=True)
+            with stage("plot"):
+                _plot_series(fig, canvases, *zip(*[render_args[ii] for ii in batch]))
+            for ii, layer in zip(batch, batch_layers):
+                layers[ii] = layer
+        for ii in stale:
+            if layers[ii] is None:
+                layers[ii] = Layer.empty(
+                    fig, subcells=self._plot_calls[ii].func is _plot
+                )
+                self._plot_calls[ii].render(fig, layers[ii], render_args[ii])
+        for layer, key in zip(layers, keys):
+            layer.key = key
+
+        self._layers = layers
+        self.composite(fig)
+
+    def composite(self, fig):
+        """Composite the layers onto the canvas of the figure, in z-order (and
+        order of plotting). Sub-cells are combined, regardless of z-order."""
+        with stage("composite", count=len(self._layers)):
+            fig.canvas[:] = 0
+            if fig.subcanvas is not None:
+                fig.subcanvas[:] = False
+
+            order = sorted(
+                range(len(self._layers)), key=lambda ii: self._plot_calls[ii].zorder
+            )
+            for ii in order:
+                layer = self._layers[ii]
+                np.copyto(fig.canvas, layer.canvas, where=layer.canvas != 0)
+                if layer.subcanvas is not None:
+                    fig.subcanvas |= layer.subcanvas
 
-def _plot(fig, x, y, marker=True, line=None, label=None, **kwargs):
-    # TODO: the kwargs is a catch all cop out. this arises from kwargs
-    # containing figure params, which should really be popped out somewhere
 
-    x_scaled = fig.x_axis.transform(numpy_1d(x))
-    y_scaled = fig.y_axis.transform(numpy_1d(y))
+# -----------------------------------------------------------------------------
+# Plot functions, each as a pair of functions: one fits the axes of the figure
+# (called for all plots first), the other renders the plot into its layer
+# -----------------------------------------------------------------------------
 
-    if marker is not None:
-        marker = next(fig.markers)
-    if line is not None:
-        line = next(fig.lines)
 
-    idx, idy = _within_display(x_scaled, y_scaled)
+def _fit_plot(fig, x, y, marker=True, line=None, label=None, **kwargs):
+    """Style and legend entry of a series, whose axes are fitted separately"""
+    # TODO: the kwargs is a catch all cop out. this arises from kwargs
+    # containing figure params, which should really be popped out somewhere
 
-    _add_xy(
-        canvas=fig.canvas,
-        idx=idx,
-        idy=idy,
-        marker=marker,
-        line=line,
-    )
+    marker = _style_code(marker, fig.markers)
+    line = _style_code(line, fig.lines)
 
     if label is not None:
-        key = marker or line
+        key = LEGEND_SYMBOLS.get(fig.canvas_mode, marker or line)
         fig.legend.append(LegendItem(symbol=key, name=label))
 
+    return x, y, marker, line
 
-def _within_display(x, y):
-    outside_display = np.logical_or(x.mask, y.mask)
-    x.mask = outside_display
-    y.mask = outside_display
-
-    idx = x.compressed()
-    idy = y.compressed()
-    return idx, idy
 
-
-def _hist(fig, x, bins=10, **kwargs):
-    """Histogram"""
+def _plot(fig, layer, x, y, marker=None, line=None):
+    """Scatter and/ or line plot"""
+    canvases = layer.points_canvas[np.newaxis]
+    if _any_chunked(x, y):
+        _plot_chunks(fig, canvases, x, y, marker=marker, line=line)
+    else:
+        _plot_series(fig, canvases, [x], [y], [marker], [line])
+
+
+def _style_code(style, styles):
+    """Palette code of a marker or line: None, a symbol, or the next style"""
+    if style is None:
+        return None
+    if isinstance(style, str):
+        return register_symbol(style)
+    return next(styles)
+
+
+def _plot_series(fig, canvases, xs, ys, markers, lines):
+    """Add many series of x, y points at once, with the fitted axes of the figure
+
+    The points of all series are transformed together, and added to a stack of
+    canvases (one per series) in one go. In sub-cell canvas modes, these are the
+    canvases of sub-cells.
+    """
+    xs, ys = [as_series(x) for x in xs], [as_series(y) for y in ys]
+    series = np.repeat(np.arange(len(xs)), [len(x) for x in xs])
+    x = xs[0].numeric if len(xs) == 1 else np.concatenate([x.numeric for x in xs])
+    y = ys[0].numeric if len(ys) == 1 else np.concatenate([y.numeric for y in ys])
+
+    subcells_x, subcells_y = CANVAS_MODES[fig.canvas_mode]
+    with stage("transform", count=len(x)):
+        buffer = np.empty(len(x))  # shared by the transforms of both axes
+        idx, visible = fig.x_axis.display_coordinates(x, subcells_x, out=buffer)
+        idy, visible_y = fig.y_axis.display_coordinates(y, subcells_y, out=buffer)
+        visible &= visible_y
+        del buffer, visible_y
+        if not visible.all():
+            idx, idy, series = idx[visible], idy[visible], series[visible]
+
+    lines = _codes(lines)
+    is_sorted = np.any(lines) and all(x.is_sorted for x in xs)
+    _add_series(canvases, series, idx, idy, _codes(markers), lines, is_sorted)
+
+
+def _plot_chunks(fig, canvases, x, y, marker=None, line=None):
+    """Add chunked x, y points of a series to its canvas, one chunk at a time"""
+    x_last, y_last = np.empty(0), np.empty(0)
+
+    for x_chunk, y_chunk in zip_chunks(x, y):
+        x_chunk, y_chunk = remove_any_nan(x_chunk, y_chunk)
+        if len(x_chunk) == 0:
+            continue
+        if line is not None:  # the line needs to continue from the last chunk
+            x_chunk = np.concatenate([x_last, x_chunk])
+            y_chunk = np.concatenate([y_last, y_chunk])
+            x_last, y_last = x_chunk[-1:], y_chunk[-1:]
+
+        _plot_series(fig, canvases, [x_chunk], [y_chunk], [marker], [line])
+
+
+def _xy_limits(x, y):
+    """Min and max of x, y points, or none if there are no points. Chunked
+    points are reduced chunk by chunk, ignoring any nan."""
+    if not _any_chunked(x, y):
+        return as_series(x).limits(), as_series(y).limits()
+    limits, _ = _chunked_xy_stats(x, y)
+    return limits
+
+
+def _chunked_xy_stats(x, y):
+    """Limits (see `_xy_limits`) and last point of chunked x, y points, in a
+    single pass over the chunks"""
+    x_limits, y_limits = list(), list()
+    x_last, y_last = np.empty(0), np.empty(0)
+    for x_chunk, y_chunk in zip_chunks(x, y):
+        x_chunk, y_chunk = remove_any_nan(x_chunk, y_chunk)
+        if len(x_chunk) > 0:
+            x_limits.extend([x_chunk.min(), x_chunk.max()])
+            y_limits.extend([y_chunk.min(), y_chunk.max()])
+            x_last, y_last = x_chunk[-1:], y_chunk[-1:]
+
+    x_limits, y_limits = np.array(x_limits), np.array(y_limits)
+    if len(x_limits) > 0:
+        x_limits = np.array([x_limits.min(), x_limits.max()])
+        y_limits = np.array([y_limits.min(), y_limits.max()])
+    return (x_limits, y_limits), (x_last, y_last)
+
+
+def _last_xy(x, y):
+    """Last point of x, y (ignoring nan for chunked arrays)"""
+    if _any_chunked(x, y):
+        _, last = _chunked_xy_stats(x, y)
+        return last
+    return as_series(x).values[-1:], as_series(y).values[-1:]
+
+
+def _last_appended(points):
+    """Last point of a list of appended x, y points, None if there is none"""
+    for x, y in reversed(points):
+        if len(x) > 0:
+            return x[-1:], y[-1:]
+    return None
+
+
+def _concatenate(x, arrays):
+    """Concatenate arrays (without nan) to the end of (chunked) x"""
+    if isinstance(x, ChunkedArray):
+        return x.concatenate(arrays)
+    x = as_series(x)
+    values = np.concatenate([x.values] + arrays)
+    return Series(values, has_nan=False if x.nan_mask is None else None)
+
+
+def _any_chunked(*arrays):
+    return any(isinstance(x, ChunkedArray) for x in arrays)
+
+
+def _codes(styles):
+    """Palette codes of the markers or lines of series, 0 for none"""
+    return np.array([0 if style is None else style for style in styles])
+
+
+def _batches(indices, canvas_size, max_cells=2**24):
+    """Split indices of series into batches, whose stacks of canvases are not
+    larger than max_cells (except a single series on a larger canvas)"""
+    size = max(1, max_cells // canvas_size)
+    return [indices[ii : ii + size] for ii in range(0, len(indices), size)]
+
+
+def _fit_hist(fig, x, bins=10, **kwargs):
+    """Fit the axes to a histogram, returns its counts"""
+    if isinstance(x, Histogram):
+        if x.edges is None:
+            raise ValueError("Cannot plot empty histogram!")
+        bins = len(x.counts)
     _check_bins(bins, fig.x_axis)
 
-    x = numpy_1d(x)
-    x = x[~np.isnan(x)]
-    counts, bin_edges = np.histogram(x, bins)
+    counts, bin_edges = _histogram(x, bins)
 
     fig.y_axis.limits = (0, max(counts))
+    fig.x_axis.reset()  # edges of accumulated histograms may have changed
     fig.x_axis.fit(bin_edges)
 
-    counts_scaled = fig.y_axis.transform(counts)
     bin_width = fig.x_axis.display_max // len(counts) - 1
     display_max = (bin_width + 1) * len(counts)
     fig.x_axis._scale = display_max / (fig.x_axis.limits[1] - fig.x_axis.limits[0])
+    return (counts,)
+
+
+def _hist(fig, layer, counts):
+    """Histogram"""
+    counts_scaled = fig.y_axis.transform(counts)
+    bin_width = fig.x_axis.display_max // len(counts) - 1
 
     bin = 0
 
     for count in counts_scaled:
-        _add_vbar(fig.canvas, bin, bin_width, count)
+        _add_vbar(xy_view(layer.canvas), bin, bin_width, count)
         bin += bin_width + 1
 
 
+def _histogram(x, bins):
+    """Histogram counts and edges of (chunked) x or accumulated histogram"""
+    if isinstance(x, Histogram):
+        return x.counts, x.edges
+    if not isinstance(x, ChunkedArray):
+        x = as_series(x).dropna()
+        # bins span the cached range of x, which np.histogram would search for
+        hist_range = tuple(x.limits()) if isinstance(bins, int) and len(x) else None
+        return np.histogram(x.values, bins, range=hist_range)
+
+    hist_range = None
+    if isinstance(bins, int):  # bins span the range of x, as for np.histogram
+        limits = list()
+        for chunk in x:
+            chunk = chunk[~np.isnan(chunk)]
+            if len(chunk) > 0:
+                limits.extend([chunk.min(), chunk.max()])
+        hist_range = (min(limits), max(limits))
+
+    histogram = Histogram(bins, range=hist_range, expand=False)
+    for chunk in x:
+        histogram.update(chunk)
+    return histogram.counts, histogram.edges
+
+
 def _check_bins(bins, x_axis):
     if isinstance(bins, int):
         bin_len = bins
@@ -128,11 +578,10 @@ def _check_bins(bins, x_axis):
         raise ValueError("Number of bins needs to be less than figsize along x!")
 
 
-def _barh(fig, x, labels=None, **kwargs):
-    """Horizontal bar plot"""
-
-    fig.x_axis.limits = (0, x.max())
-    x_scaled = fig.x_axis.transform(x)
+def _fit_barh(fig, x, labels=None, **kwargs):
+    """Fit the axes to horizontal bars, returns their widths"""
+    x = as_series(x)
+    fig.x_axis.limits = (0, x.limits()[1])
 
     fig.y_axis.fit(np.arange(0, len(x) + 1, 1))
     fig.y_axis.ticks = np.array(list(range(len(x)))) + 0.5
@@ -143,78 +592,247 @@ def _barh(fig, x, labels=None, **kwargs):
 
     if labels is not None:
         fig.y_axis.ticklabels = labels
+    return (x,)
+
+
+def _barh(fig, layer, x):
+    """Horizontal bar plot"""
+    x_scaled, _ = fig.x_axis.display_coordinates(x.numeric)
+    bin_width = fig.y_axis.display_max // len(x) - 1
 
     bin = 0
-    for val in x_scaled.data:
-        _add_hbar(fig.canvas, bin, bin_width, val)
+    for val in x_scaled:
+        _add_hbar(xy_view(layer.canvas), bin, bin_width, val)
         bin += bin_width + 1
 
 
-def _boxplot(fig, x, labels=None, **kwargs):
-    """Box plot"""
-
-    x = numpy_2d(x)
-    x = np.ma.masked_where(np.isnan(x), x)
+def _fit_boxplot(fig, x, labels=None, sketch_eps=None, **kwargs):
+    """Fit the axes to box plots, returns the quantiles of the boxes"""
+    quantiles = _box_quantiles(x, sketch_eps)
+    fig.x_axis.fit(quantiles)
+    n_boxes = len(quantiles)
 
-    quantiles = np.array(
-        [np.quantile(dist[dist.mask == 0], q=[0, 0.25, 0.5, 0.75, 1.0]) for dist in x]
-    )
-    quantiles_scaled = fig.x_axis.fit_transform(quantiles)
-
-    fig.y_axis.fit(np.array([0, len(x)]))
-    y_lims = fig.y_axis.transform(
-        np.array([0.2, 0.50, 0.8]) + np.arange(0, len(x), 1)[np.newaxis].T
-    )
-    fig.y_axis.ticks = np.arange(0.5, len(x), 1)
+    fig.y_axis.fit(np.array([0, n_boxes]))
+    fig.y_axis.ticks = np.arange(0.5, n_boxes, 1)
 
     if labels is not None:
         fig.y_axis.ticklabels = numpy_1d(labels)
+    return (quantiles,)
+
+
+def _boxplot(fig, layer, quantiles):
+    """Box plot"""
+    quantiles_scaled, _ = fig.x_axis.display_coordinates(quantiles)
+    n_boxes = len(quantiles)
+    y_lims, _ = fig.y_axis.display_coordinates(
+        np.array([0.2, 0.50, 0.8]) + np.arange(0, n_boxes, 1)[np.newaxis].T
+    )
 
-    for ii in range(len(x)):
+    for ii in range(n_boxes):
         quants = quantiles_scaled[ii, :]
         lims = y_lims[ii, :]
-        _add_box_and_whiskers(fig.canvas, quants, lims)
+        _add_box_and_whiskers(xy_view(layer.canvas), quants, lims)
+
+
+FIT_FUNCS = {
+    _plot: _fit_plot,
+    _hist: _fit_hist,
+    _barh: _fit_barh,
+    _boxplot: _fit_boxplot,
+}
+
+
+def _box_quantiles(x, sketch_eps=None):
+    """Quantiles of each distribution of the boxplot, one row per distribution
+
+    Quantiles are exact, unless sketch_eps is given or x contains sketches or
+    chunked arrays, for which they are approximated by a `QuantileSketch`.
+    """
+    dists = _distributions(x)
+    if sketch_eps is None and not any(
+        isinstance(dist, (QuantileSketch, ChunkedArray)) for dist in dists
+    ):
+        return np.array(
+            [
+                np.quantile(as_series(dist).dropna().values, q=BOX_QUANTILES)
+                for dist in dists
+            ]
+        )
+
+    sketches = [_quantile_sketch(dist, sketch_eps) for dist in dists]
+    return np.array([sketch.quantile(BOX_QUANTILES) for sketch in sketches])
+
+
+def _distributions(x):
+    """Distributions of a boxplot: a list of sketches and chunked arrays (if x
+    contains any), or of the series of each 1d slice of x"""
+    if isinstance(x, (QuantileSketch, ChunkedArray, Series)):
+        return [x]
+    if isinstance(x, list) and any(
+        isinstance(dist, (QuantileSketch, ChunkedArray, Series)) for dist in x
+    ):
+        return x
+    return [Series(dist) for dist in numpy_2d(x)]
+
+
+def _quantile_sketch(x, eps=None):
+    """Quantile sketch of x, updated chunk by chunk"""
+    if isinstance(x, QuantileSketch):
+        return x
+    sketch = QuantileSketch() if eps is None else QuantileSketch(eps=eps)
+    for chunk in chunked(x):
+        sketch.update(chunk)
+    return sketch
 
 
 # -----------------------------------------------------------------------------
-# Function to add canvas elements
+# Function to add canvas elements, in display coordinates (see `xy_view`)
 # -----------------------------------------------------------------------------
 
 
-def _add_xy(canvas, idx, idy, marker=None, line=None):
-    """Add x, y series to canvas, as marker and/ or line"""
-    if line is not None:
-        x_line, y_line = _line_interp(idx, idy)
-        canvas[x_line, y_line] = line
-    if marker is not None:
-        canvas[idx, idy] = marker
-    return canvas
+def _add_series(canvases, series, idx, idy, markers, lines, is_sorted=False):
+    """Add x, y points of many series to their canvases, as markers and/ or lines
+
+    Parameters
+    ----------
+    canvases : np.ndarray
+        Stack of canvases, one per series, of shape (n_series, rows, columns)
+    series : np.ndarray
+        Series of each point
+    idx, idy : np.ndarray
+        Display coordinates of each point
+    markers, lines : np.ndarray
+        Palette codes of the marker and line of each series, 0 for none.
+        Lines are added first, such that markers are on top. Lines also do not
+        overwrite markers that are on the canvases already (e.g. of earlier
+        chunks or appended points).
+    is_sorted : bool, optional
+        Whether the points of each series are known to be sorted along x,
+        default False (then this is checked before decimating lines)
+    """
+    if np.any(lines) and len(idx) > 0:
+        with stage("line", count=len(idx)):
+            points = _of_styled_series(lines, series, idx, idy)
+            points = _decimate_lines(*points, is_sorted=is_sorted)
+            x_line, y_line, s_line = _rasterize_lines(*points)
+            _fill_cells(canvases, s_line, x_line, y_line, lines, keep=markers)
+    if np.any(markers):
+        with stage("markers", count=len(idx)):
+            x_marker, y_marker, s_marker = _of_styled_series(markers, series, idx, idy)
+            _fill_cells(canvases, s_marker, x_marker, y_marker, markers)
+    return canvases
+
+
+def _of_styled_series(codes, series, idx, idy):
+    """Points of the series whose code is not 0"""
+    if np.all(codes):
+        return idx, idy, series
+    styled = (codes != 0)[series]
+    return idx[styled], idy[styled], series[styled]
+
+
+def _fill_cells(canvases, series, idx, idy, codes, keep=None):
+    """Set the cells at x, y of each canvas in the stack to the code of its series
+
+    Points are first marked in a boolean stack (at their flat index, with rows
+    in display order), which is then filled with the codes in one step. Cells
+    that hold the code of their series in keep (if not 0) are left as they are.
+    Canvases of sub-cells are boolean, for which keep has no effect.
+    """
+    n_rows, n_cols = canvases.shape[1:]
+    cells = n_rows - 1 - idy
+    cells *= n_cols
+    cells += idx
+    if canvases.dtype == bool or keep is None or not np.any(keep):
+        keep = None
+    if len(canvases) == 1:
+        flat = canvases.reshape(-1)
+        if keep is not None and keep[0] != 0:
+            cells = cells[flat[cells] != keep[0]]
+        flat[cells] = codes[0]
+        return
+    cells += series * (n_rows * n_cols)
+
+    occupied = np.zeros(canvases.shape, dtype=bool)
+    occupied.reshape(-1)[cells] = True
+    if keep is not None:
+        keep = keep.astype(canvases.dtype).reshape(-1, 1, 1)
+        occupied &= (canvases != keep) | (keep == 0)
+    codes = codes.astype(canvases.dtype).reshape(-1, 1, 1)
+    np.copyto(canvases, codes, where=occupied)
+
 
+# -----------------------------------------------------------------------------
+# Decimation of display coordinates before adding them to the canvas
+# -----------------------------------------------------------------------------
 
-def _line_interp(x, y, round_tol=0.4):
-    """Interpolate for line plotting"""
 
-    x_min, x_max = x.min(), x.max()
-    if x_min == x_max:
-        y_interp = np.arange(y.min(), y.max(), 1)
-        x_interp = np.interp(y_interp, y, x)
-    else:
-        x_interp = np.arange(x.min(), x.max(), 1)
-        y_interp = np.interp(x_interp, x, y)
-
-    # Point selection is turned off for now
-    # (This could allow 'nicer' plotting when no good fit in the grid is found)
-    # is_discrete = np.isclose(
-    #     y_interp,
-    #     np.around(y_interp).astype(int),
-    #     atol=round_tol,
-    # )
-    is_discrete = True
-
-    x_line = x_interp[is_discrete].astype(int)
-    y_line = np.around(y_interp[is_discrete]).astype(int)
-
-    return x_line, y_line
+def _decimate_lines(idx, idy, series, is_sorted=False):
+    """Reduce lines to the first, min, max and last point of each column (M4),
+    for each series
+
+    This yields the same lines on the canvas, as long as the points of each
+    series are sorted along x (which is checked, unless is_sorted). Otherwise,
+    the points are returned as they are.
+    """
+    new_series = series[1:] != series[:-1]
+    if len(idx) < 5:
+        return idx, idy, series
+    if not is_sorted and np.any((idx[1:] < idx[:-1]) & ~new_series):
+        return idx, idy, series
+
+    starts = np.flatnonzero((idx[1:] != idx[:-1]) | new_series) + 1
+    starts = np.concatenate([[0], starts])
+    ends = np.concatenate([starts[1:], [len(idx)]]) - 1
+
+    x_line = np.repeat(idx[starts], 4)
+    y_line = np.column_stack(
+        [
+            idy[starts],
+            np.minimum.reduceat(idy, starts),
+            np.maximum.reduceat(idy, starts),
+            idy[ends],
+        ]
+    ).ravel()
+    return x_line, y_line, np.repeat(series[starts], 4)
+
+
+def _rasterize_lines(x, y, series):
+    """Cells of the lines through consecutive x, y points of each series (DDA,
+    for all segments), and the series of each cell
+
+    Each segment is drawn in as many steps as its longer side, such that lines
+    are connected for any slope. The cells of all segments are computed at once,
+    the cost is proportional to the number of cells drawn.
+    """
+    if len(x) == 0:
+        return x, y, series
+
+    # segments within a single cell add nothing, and are dropped first, as are
+    # the segments between series
+    same_series = series[1:] == series[:-1]
+    drawn = np.flatnonzero(((x[1:] != x[:-1]) | (y[1:] != y[:-1])) & same_series)
+    x0, y0 = x[drawn], y[drawn]
+    dx, dy = x[drawn + 1] - x0, y[drawn + 1] - y0
+    steps = np.maximum(np.abs(dx), np.abs(dy))  # per segment, excluding its end
+
+    segment = np.repeat(np.arange(len(steps)), steps)
+    starts = np.cumsum(steps) - steps
+    step = np.arange(len(segment)) - starts[segment]
+
+    # rounded offsets of the steps, in integer arithmetic (round half up)
+    half, n_steps = steps[segment], 2 * steps[segment]
+    x_line = x0[segment] + (2 * step * dx[segment] + half) // n_steps
+    y_line = y0[segment] + (2 * step * dy[segment] + half) // n_steps
+    s_line = series[drawn][segment]
+
+    # segments exclude their end, i.e. the last point of each series is added
+    ends = np.append(np.flatnonzero(~same_series), len(x) - 1)
+    return (
+        np.concatenate([x_line, x[ends]]),
+        np.concatenate([y_line, y[ends]]),
+        np.concatenate([s_line, series[ends]]),
+    )
 
 
 def _add_vbar(canvas, start, width, height):
@@ -0,0 +1,123 @@
+"""Private container of the data of a single series (or distribution).
+
+Inputs are normalised into a `Series` once, when they are plotted. The values
+that the plot functions and axes need from the data (its numeric values, nan
+mask, limits, and whether it is sorted) are derived lazily, and cached.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+from shellplot.utils import as_nanoseconds, fingerprint, numpy_1d, to_numeric
+
+
+class Series:
+    """1d data of a plot, with its numeric view and cached statistics.
+
+    As for `PlotCall`, the data is not expected to change after plotting.
+    """
+
+    __slots__ = ("values", "_numeric", "_nan_mask", "_limits", "_is_sorted")
+
+    def __init__(self, values, has_nan: Optional[bool] = None):
+        """Instantiate a new series.
+
+        Parameters
+        ----------
+        values : array-like
+            1d data, datetimes are converted to nanoseconds (see
+            `shellplot.utils.as_nanoseconds`)
+        has_nan : Optional[bool], optional
+            Whether the values contain nan, default None (found out lazily).
+            If False, the values are not checked for nan.
+        """
+        self.values = as_nanoseconds(np.atleast_1d(numpy_1d(values)))
+        self._numeric = None
+        self._nan_mask = False if has_nan is False else None
+        self._limits = None
+        self._is_sorted = None
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.values.dtype
+
+    @property
+    def numeric(self) -> np.ndarray:
+        """Numeric values, a view of the values (see `to_numeric`)"""
+        if self._numeric is None:
+            self._numeric = to_numeric(self.values)
+        return self._numeric
+
+    @property
+    def nan_mask(self) -> Optional[np.ndarray]:
+        """Where the values are nan (or NaT), None if there are none"""
+        if self._nan_mask is None:  # not computed yet, False if there is no nan
+            self._nan_mask = False
+            if self.dtype.kind in "fcmM":
+                mask = np.isnan(self.values)
+                self._nan_mask = mask if mask.any() else False
+        return None if self._nan_mask is False else self._nan_mask
+
+    @property
+    def count(self) -> int:
+        """Number of values that are not nan"""
+        mask = self.nan_mask
+        return len(self) if mask is None else len(self) - int(mask.sum())
+
+    @property
+    def is_sorted(self) -> bool:
+        """Whether the values are sorted in ascending order (and not nan)"""
+        if self._is_sorted is None:
+            x = self.numeric
+            self._is_sorted = self.nan_mask is None and bool(np.all(x[1:] >= x[:-1]))
+        return self._is_sorted
+
+    def limits(self) -> np.ndarray:
+        """Min and max of the values that are not nan, of the dtype of the values
+        (empty, if there are none)"""
+        if self._limits is None:
+            values = self.dropna().values
+            if len(values) == 0:
+                self._limits = values[:0]
+            else:
+                self._limits = np.array([values.min(), values.max()])
+        return self._limits
+
+    def dropna(self) -> "Series":
+        """Series of the values that are not nan (itself, if all are not)"""
+        mask = self.nan_mask
+        if mask is None:
+            return self
+        return Series(self.values[~mask], has_nan=False)
+
+
+def as_series(x) -> Series:
+    """Series of array-like x, which is returned as it is if it is a series"""
+    return x if isinstance(x, Series) else Series(x)
+
+
+def drop_any_nan(x: Series, y: Series) -> Tuple[Series, Series]:
+    """Series x, y without the points where any of them is nan"""
+    if x.nan_mask is None and y.nan_mask is None:
+        return x, y
+    if x.nan_mask is None or y.nan_mask is None:
+        valid = ~(y.nan_mask if x.nan_mask is None else x.nan_mask)
+    else:
+        valid = ~(x.nan_mask | y.nan_mask)
+    return (
+        Series(x.values[valid], has_nan=False),
+        Series(y.values[valid], has_nan=False),
+    )
+
+
+@numpy_1d.register(Series)
+def _(x):
+    return x.values
+
+
+@fingerprint.register(Series)
+def _(x):
+    return fingerprint(x.values)
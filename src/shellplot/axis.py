@@ -1,22 +1,44 @@
 """Module that contains Axis class (usable for both x and y axis)
 """
-from typing import Optional
+from typing import Optional, Tuple
 
 import numpy as np
 
+from shellplot._series import as_series
 from shellplot.utils import (
     array_like,
     difference_round,
+    fingerprint,
     is_datetime,
     numpy_1d,
     round_down,
     round_up,
-    timedelta_round,
-    to_datetime,
     to_numeric,
     tolerance_round,
 )
 
+# steps of datetime ticks, from fine to coarse, as (number, unit of time)
+DATETIME_TICK_STEPS = (
+    [
+        (n * 10**e, unit)
+        for unit in ["ns", "us", "ms"]
+        for e in range(3)
+        for n in (1, 2, 5)
+    ]
+    + [(n, "s") for n in (1, 2, 5, 10, 15, 30)]
+    + [(n, "m") for n in (1, 2, 5, 10, 15, 30)]
+    + [(n, "h") for n in (1, 2, 3, 6, 12)]
+    + [(n, "D") for n in (1, 2, 7, 14)]
+    + [(n, "M") for n in (1, 2, 3, 6)]
+    + [(n * 10**e, "Y") for e in range(4) for n in (1, 2, 5)]
+)
+_NS_PER_UNIT = {"ns": 1, "us": 10**3, "ms": 10**6, "s": 10**9, "m": 60 * 10**9}
+_NS_PER_UNIT.update({"h": 3600 * 10**9, "D": 86400 * 10**9})
+_NS_PER_UNIT.update({"M": 2629746 * 10**9, "Y": 31556952 * 10**9})  # on average
+_DATETIME_TICK_STEPS_NS = np.array(
+    [n * _NS_PER_UNIT[unit] for n, unit in DATETIME_TICK_STEPS], dtype=float
+)
+
 
 class Axis:
     """Enables mapping from data to display / plot coordinates.
@@ -63,6 +85,8 @@ class Axis:
         self.display_max = display_length - 1
         self._is_datetime = False  # whether or not we are a datetime axis
         self._scale = None
+        self._fixed_limits = False  # whether limits were set, rather than fitted
+        self._fixed_ticks = False  # whether ticks were set, rather than auto
 
         self.label = label
         self.limits = limits
@@ -89,6 +113,7 @@ class Axis:
     @limits.setter
     def limits(self, limits):
         self._limits = limits
+        self._fixed_limits = limits is not None
         if limits is not None:  # new limits need to update scale and ticks
             self._limits = to_numeric(limits)
             self._set_scale()
@@ -115,6 +140,7 @@ class Axis:
     def ticks(self, ticks):
         self._reset_ticks()
         self._ticks = numpy_1d(ticks)
+        self._fixed_ticks = ticks is not None
 
     @property
     def ticklabels(self):
@@ -136,22 +162,66 @@ class Axis:
     # -------------------------------------------------------------------------
 
     def fit(self, x):
-        """Fit axis to get conversion from data to plot scale"""
-        self._is_datetime = is_datetime(x)
-        x = to_numeric(x)
+        """Fit axis to get conversion from data to plot scale. Only the (cached)
+        limits of x are used, if x is a series."""
+        x = as_series(x)
+        self._is_datetime = is_datetime(x.values)
 
         if self.limits is None:
-            self._limits = self._auto_limits(x)
+            self._limits = self._auto_limits(to_numeric(x.limits()))
 
         self._set_scale()
         return self
 
-    def transform(self, x):
-        """Transform data to the plot coordinates"""
+    def transform(self, x, subcells: int = 1):
+        """Transform data to the plot coordinates
+
+        If subcells > 1, the display cells are divided into this many sub-cells,
+        and the coordinates are of the sub-cells (e.g. for braille characters).
+        Coordinates outside of the display are masked.
+        """
+        x_display, visible = self.display_coordinates(x, subcells=subcells)
+        return np.ma.masked_array(x_display, mask=~visible)
+
+    def display_coordinates(
+        self, x, subcells: int = 1, out: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Transform data to the plot coordinates, as plain arrays
+
+        This is `transform`, fused into in-place operations on a single float
+        buffer, without masked arrays.
+
+        Parameters
+        ----------
+        x : array-like
+            Data to transform
+        subcells : int, optional
+            Number of sub-cells per display cell, default 1
+        out : Optional[np.ndarray], optional
+            Float buffer of the shape of x, for the intermediate scaled values.
+            Default None, i.e. a buffer is allocated. Once the coordinates are
+            returned, it can be reused (e.g. for the other axis).
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Integer coordinates, and whether each is within the display
+        """
         x = to_numeric(x)
-        x_scaled = self._scale * (x - self.limits[0]).astype(float)
-        x_display = np.around(x_scaled).astype(int)
-        return np.ma.masked_outside(x_display, 0, self.display_max)
+        if out is None:
+            out = np.empty(x.shape, dtype=float)
+        np.subtract(x, self.limits[0], out=out, casting="unsafe")
+        np.multiply(out, self._scale, out=out)
+        if subcells == 1:
+            np.around(out, out=out)
+        else:  # display cell i spans the scaled coordinates i - 0.5 to i + 0.5
+            np.add(out, 0.5, out=out)
+            np.multiply(out, subcells, out=out)
+            np.floor(out, out=out)
+
+        visible = out >= 0
+        visible &= out <= (self.display_max + 1) * subcells - 1
+        return out.astype(int), visible
 
     def fit_transform(self, x):
         """Fit axis and transform data to the plot coordinates"""
@@ -160,15 +230,53 @@ class Axis:
 
     def generate_display_ticks(self):
         """Generate display tick locations and labels"""
-        display_ticks = self.transform(self.ticks)
-        within_display = np.logical_and(
-            display_ticks >= 0, display_ticks <= self.display_max
-        )
+        display_ticks, within_display = self.display_coordinates(self.ticks)
         display_labels = self.ticklabels[within_display]
         display_ticks = display_ticks[within_display]
 
         return zip(display_ticks, display_labels)
 
+    def exceeds_limits(self, x):
+        """Whether data falls outside of the automatically fitted limits
+
+        Always False for axes that are not fitted yet or whose limits have been
+        set, as data outside of set limits is meant to be clipped.
+        """
+        x = to_numeric(x)
+        if self._fixed_limits or self.limits is None or len(x) == 0:
+            return False
+        return bool(x.min() < self.limits[0] or x.max() > self.limits[1])
+
+    def reset(self):
+        """Reset automatically determined limits and ticks, so that the next
+        call to `.fit` determines them anew. Limits and ticks that have been set
+        are kept."""
+        if not self._fixed_limits:
+            self._limits = None
+            self._scale = None
+        if not self._fixed_ticks:
+            self._reset_ticks()
+
+    def scale_fingerprint(self):
+        """Fingerprint of the mapping from data to display coordinates only"""
+        return fingerprint((self.display_max, self._limits, self._scale))
+
+    def fingerprint(self):
+        """Fingerprint of the axis state, including fitted limits and ticks"""
+        return fingerprint(
+            (
+                self.display_max,
+                self._label,
+                self._limits,
+                self._fixed_limits,
+                self._nticks,
+                self._ticks,
+                self._fixed_ticks,
+                self._ticklabels,
+                self._is_datetime,
+            )
+        )
+
     # -------------------------------------------------------------------------
     # Private methods: Auto scaling & ticks
     # -------------------------------------------------------------------------
@@ -178,6 +286,8 @@ class Axis:
 
     def _auto_limits(self, x, margin=0.25):
         """Automatically find good axis limits"""
+        if self._is_datetime:
+            return self._auto_datetime_limits(x, margin=margin)
         x_max, x_min = x.max(), x.min()
 
         max_difference = margin * (x_max - x_min)
@@ -186,6 +296,17 @@ class Axis:
 
         return ax_min, ax_max
 
+    def _auto_datetime_limits(self, x, margin=0.25):
+        """Limits rounded outwards to the coarsest step of `DATETIME_TICK_STEPS`
+        that is within margin of the span. Computed on the integer nanoseconds,
+        so that the limits exactly cover the data."""
+        x_min, x_max = int(x.min()), int(x.max())
+        ii = np.searchsorted(
+            _DATETIME_TICK_STEPS_NS, margin * (x_max - x_min), side="right"
+        )
+        n, unit = DATETIME_TICK_STEPS[max(ii - 1, 0)]
+        return _round_datetime(x_min, n, unit), _round_datetime(x_max, n, unit, up=True)
+
     def _auto_nticks(self):
         """Automatically find number of ticks that fit display"""
         max_ticks = int(1.5 * self.display_max ** 0.3) + 1
@@ -212,17 +333,28 @@ class Axis:
         )[: self.nticks]
 
     def _auto_datetime_ticks(self):
-        axis_td = to_datetime(np.array(self.limits, dtype="timedelta64[ns]"))
-        limits_delta = axis_td[1] - axis_td[0]
-        unit = timedelta_round(limits_delta)
-        n_units = limits_delta / np.timedelta64(1, unit)
-        td_step = np.timedelta64(int(n_units / (self.nticks - 1)), unit)
-
-        return np.arange(
-            np.datetime64(axis_td[0], unit),
-            np.datetime64(axis_td[1], unit) + td_step,
-            td_step,
-        )[: self.nticks]
+        """Calendar aligned datetime ticks, of the finest step of
+        `DATETIME_TICK_STEPS` that spans the limits with at most nticks ticks.
+        Steps of months and years are calendar months and years, see
+        `_step_offset` for the alignment of the steps."""
+        lower, upper = (int(limit) for limit in self.limits)
+        min_step = (upper - lower) / max(self.nticks - 1, 1)
+        ii = np.searchsorted(_DATETIME_TICK_STEPS_NS, min_step)
+        n, unit = DATETIME_TICK_STEPS[min(ii, len(DATETIME_TICK_STEPS) - 1)]
+
+        # the limits in units of the step (rounded inwards), of which the ticks
+        # are the aligned multiples of n
+        lower_ns = np.datetime64(lower, "ns")
+        first = lower_ns.astype(f"datetime64[{unit}]")
+        first = first.astype(np.int64) + int(first < lower_ns)
+        last = np.datetime64(upper, "ns").astype(f"datetime64[{unit}]")
+
+        offset = _step_offset(n, unit)
+        first = -(-(first + offset) // n) * n - offset
+        ticks = np.arange(first, last.astype(np.int64) + 1, n)
+        if len(ticks) == 0:  # a coarse step may miss the limits, e.g. for 2D -> 7D
+            return _exact_datetimes(np.array([lower, upper]))
+        return ticks.astype(f"datetime64[{unit}]")
 
     def _auto_ticklabels(self):
         if self._is_datetime:
@@ -233,3 +365,38 @@ class Axis:
     def _reset_ticks(self):
         self._ticks = None
         self._ticklabels = None
+        self._fixed_ticks = False
+
+
+def _round_datetime(x: int, n: int, unit: str, up: bool = False) -> int:
+    """Round nanoseconds x down (or up) to an aligned multiple of n of the time
+    unit, where months and years are calendar months and years"""
+    units = np.datetime64(x, "ns").astype(f"datetime64[{unit}]").astype(np.int64)
+    offset = _step_offset(n, unit)
+    units = (units + offset) // n * n - offset
+    rounded = _to_ns(units, unit)
+    if up and rounded < x:
+        rounded = _to_ns(units + n, unit)
+    return rounded
+
+
+def _step_offset(n: int, unit: str) -> int:
+    """Offset of multiples of n of the time unit (counted from the 1970 epoch), at
+    which steps are aligned: years divisible by n, and weeks on Mondays"""
+    if unit == "Y":
+        return 1970
+    if unit == "D" and n % 7 == 0:
+        return 3  # 1970-01-05 (day 4) is a Monday
+    return 0
+
+
+def _to_ns(x: int, unit: str) -> int:
+    return int(np.datetime64(int(x), unit).astype("datetime64[ns]").astype(np.int64))
+
+
+def _exact_datetimes(x: np.ndarray) -> np.ndarray:
+    """Nanoseconds x as datetimes of the coarsest time unit that keeps them"""
+    for unit in ["D", "h", "m", "s", "ms", "us"]:
+        if np.all(x % _NS_PER_UNIT[unit] == 0):
+            return (x // _NS_PER_UNIT[unit]).astype(f"datetime64[{unit}]")
+    return x.astype("datetime64[ns]")
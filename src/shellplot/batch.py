@@ -0,0 +1,162 @@
+"""Batch API for rendering many independent plots in parallel
+"""
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from shellplot import plots
+
+_ALIGNMENT = 64  # bytes, alignment of arrays in shared memory
+
+_shared_memory = None  # shared memory block that a worker process attached to
+
+
+@dataclass
+class PlotSpec:
+    """Lightweight specification of a plot, i.e. a call of a plot function.
+
+    >>> spec = PlotSpec("plot", (x, y), {"label": "y", "figsize": (71, 27)})
+
+    which is rendered as `shellplot.plots.plot(x, y, label="y", ...)`.
+    """
+
+    kind: str = "plot"  # name of the function in `shellplot.plots`
+    args: Tuple = ()
+    kwargs: Dict = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class _SharedArray:
+    """Reference to an array in shared memory, which is cheap to pickle"""
+
+    offset: int
+    shape: Tuple[int, ...]
+    dtype: str
+
+    def to_numpy(self) -> np.ndarray:
+        return np.ndarray(
+            self.shape, dtype=self.dtype, buffer=_shared_memory.buf, offset=self.offset
+        )
+
+
+def render_many(
+    specs: Sequence[PlotSpec],
+    workers: Optional[int] = None,
+    executor: str = "process",
+) -> List[str]:
+    """Render many independent plots in parallel, as strings.
+
+    Parameters
+    ----------
+    specs : Sequence[PlotSpec]
+        The plots to render
+    workers : Optional[int], optional
+        Number of worker processes or threads, default None (number of cpus).
+        If 1, the plots are rendered serially.
+    executor : str, optional
+        Either `"process"` (default) or `"thread"`. For processes, numeric
+        np.ndarray arguments are passed to the workers via shared memory, rather
+        than being pickled. Other arguments (e.g. pandas series) are pickled.
+
+    Returns
+    -------
+    List[str]
+        The rendered plots, in the same order as specs
+    """
+    # imported here, as executors & shared memory are slow to import
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    workers = workers or os.cpu_count()
+    if executor not in ["process", "thread"]:
+        raise ValueError("Executor needs to be one of: process, thread")
+
+    if workers == 1 or len(specs) <= 1:
+        return [_render(spec) for spec in specs]
+    chunksize = max(1, len(specs) // (4 * workers))
+
+    if executor == "thread":
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_render, specs))
+
+    shm, shared_specs = _share_arrays(specs)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_attach, initargs=(shm.name,)
+        ) as pool:
+            return list(pool.map(_render_shared, shared_specs, chunksize=chunksize))
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+# -----------------------------------------------------------------------------
+# Private functions: rendering & shared memory
+# -----------------------------------------------------------------------------
+
+
+def _render(spec: PlotSpec) -> str:
+    plot_func = getattr(plots, spec.kind)
+    kwargs = dict(spec.kwargs, return_type="str")
+    return plot_func(*spec.args, **kwargs)
+
+
+def _render_shared(spec: PlotSpec) -> str:
+    """Render spec in a worker, whose arrays are in shared memory"""
+    return _render(
+        PlotSpec(
+            kind=spec.kind,
+            args=tuple(_from_shared(x) for x in spec.args),
+            kwargs={key: _from_shared(val) for key, val in spec.kwargs.items()},
+        )
+    )
+
+
+def _attach(name: str) -> None:
+    """Attach worker process to the shared memory block of the arrays"""
+    from multiprocessing import shared_memory
+
+    global _shared_memory
+    _shared_memory = shared_memory.SharedMemory(name=name)
+
+
+def _from_shared(x):
+    return x.to_numpy() if isinstance(x, _SharedArray) else x
+
+
+def _is_shareable(x) -> bool:
+    return isinstance(x, np.ndarray) and not x.dtype.hasobject
+
+
+def _share_arrays(specs):
+    """Copy all numeric arrays of specs into one shared memory block (arrays
+    used by multiple specs are copied once), and replace them by references"""
+    shared = dict()  # id of array -> (array, reference)
+    size = 0
+    for spec in specs:
+        for x in list(spec.args) + list(spec.kwargs.values()):
+            if _is_shareable(x) and id(x) not in shared:
+                shared[id(x)] = (x, _SharedArray(size, x.shape, x.dtype.str))
+                size += -(-x.nbytes // _ALIGNMENT) * _ALIGNMENT
+
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    for x, ref in shared.values():
+        view = np.ndarray(x.shape, dtype=x.dtype, buffer=shm.buf, offset=ref.offset)
+        view[...] = x
+        del view  # release the buffer, such that shm can be closed
+
+    def to_shared(x):
+        return shared[id(x)][1] if _is_shareable(x) else x
+
+    shared_specs = [
+        PlotSpec(
+            kind=spec.kind,
+            args=tuple(to_shared(x) for x in spec.args),
+            kwargs={key: to_shared(val) for key, val in spec.kwargs.items()},
+        )
+        for spec in specs
+    ]
+    return shm, shared_specs
@@ -0,0 +1,445 @@
+"""Command line interface, for plotting columns of CSV, TSV or whitespace
+separated data from files or stdin:
+
+    $ seq 100 | awk '{print $1, sin($1 / 10)}' | shellplot -x 0
+    $ shellplot --kind hist --bins 20 -y latency requests.csv
+    $ tail -f requests.csv | shellplot -y latency --follow
+
+Lines are read in blocks, which are parsed in bulk by `np.loadtxt`. Histograms
+and boxplots are accumulated block by block, without keeping the data around.
+"""
+import argparse
+import contextlib
+import os
+import queue
+import stat
+import sys
+import threading
+import time
+import warnings
+from itertools import islice
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from shellplot.drawing import CANVAS_MODES
+from shellplot.figure import figure
+from shellplot.histogram import Histogram
+from shellplot.quantiles import QuantileSketch
+
+KINDS = ["plot", "hist", "barh", "boxplot"]
+
+
+def parse_args(args: List[str]) -> argparse.Namespace:
+    """Parse command line parameters
+
+    Parameters
+    ----------
+    args : List[str]
+        Command line parameters as list of strings, e.g. `["-k", "hist"]`
+
+    Returns
+    -------
+    argparse.Namespace
+        The parsed command line parameters
+    """
+    parser = argparse.ArgumentParser(
+        prog="shellplot",
+        description="Plot columns of CSV, TSV or whitespace separated data",
+    )
+    parser.add_argument(
+        "files",
+        nargs="*",
+        default=["-"],
+        help="files to read, stdin if none (or -)",
+    )
+    parser.add_argument("-k", "--kind", choices=KINDS, default="plot")
+    parser.add_argument(
+        "-x",
+        help="column of x values, by name or 0-based index. For plots, default "
+        "is the row number. For barh, the column of the bar labels",
+    )
+    parser.add_argument(
+        "-y",
+        help="comma separated columns of y values, default all other columns",
+    )
+    parser.add_argument(
+        "-d",
+        "--delimiter",
+        help="column delimiter, default detected from the first line",
+    )
+    parser.add_argument("--figsize", type=int, nargs=2, metavar=("WIDTH", "HEIGHT"))
+    parser.add_argument(
+        "-m",
+        "--canvas-mode",
+        choices=list(CANVAS_MODES),
+        default="char",
+        help="characters points of plots are drawn as, braille and quadrant "
+        "draw multiple points per character",
+    )
+    parser.add_argument("--bins", type=int, default=10, help="bins of hist")
+    parser.add_argument("--title")
+    parser.add_argument("--xlabel")
+    parser.add_argument("--ylabel")
+    parser.add_argument(
+        "-f",
+        "--follow",
+        action="store_true",
+        help="redraw as lines arrive, and wait for more at the end of a file",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.2,
+        help="minimum seconds between redraws when following, default 0.2",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=2**16,
+        help="maximum number of lines parsed at once, default 65536",
+    )
+    parser.add_argument("--version", action="version", version=_version())
+
+    parsed = parser.parse_args(args)
+    if parsed.follow and len(parsed.files) > 1:
+        parser.error("can only follow a single file")
+    return parsed
+
+
+def main(args: List[str]) -> None:
+    """Plot the data of files or stdin, as specified by command line parameters
+
+    Parameters
+    ----------
+    args : List[str]
+        Command line parameters as list of strings
+    """
+    args = parse_args(args)
+    fig = figure(
+        figsize=args.figsize and tuple(args.figsize),
+        title=args.title,
+        xlabel=args.xlabel,
+        ylabel=args.ylabel,
+        canvas_mode=args.canvas_mode,
+    )
+    parser = ColumnParser(
+        delimiter=args.delimiter,
+        x=args.x,
+        y=args.y,
+        x_dtype=str if args.kind == "barh" else float,
+    )
+    plotter = _Plotter(fig, parser, kind=args.kind, bins=args.bins)
+
+    if args.follow:  # redrawn in place, at most once per interval
+        live = fig.live(fps=1 / args.interval if args.interval > 0 else None)
+    else:
+        live = contextlib.nullcontext()
+
+    with live:
+        for path in args.files:
+            with _open(path) as stream:
+                parser.new_source()
+                if args.follow:
+                    blocks = _follow_blocks(stream, args.chunksize, args.interval)
+                else:
+                    blocks = _blocks(stream, args.chunksize)
+
+                for lines in blocks:
+                    if plotter.add(*parser.parse(lines)) and args.follow:
+                        plotter.flush()
+                        live.refresh()
+        plotter.flush()
+
+    if fig._plot_builder.is_empty():
+        raise SystemExit("shellplot: no data to plot")
+    if not args.follow:
+        fig.show()
+
+
+def run() -> None:
+    """Entry point of the `shellplot` console script"""
+    try:
+        main(sys.argv[1:])
+    except ValueError as e:  # e.g. columns that do not exist or are not numeric
+        raise SystemExit(f"shellplot: error: {e}")
+    except KeyboardInterrupt:  # i.e. stop following
+        pass
+
+
+class ColumnParser:
+    """Parses blocks of lines into columns of x and y values.
+
+    The delimiter and whether there is a header are detected from the first
+    line. Headers of subsequent sources (files) are skipped.
+    """
+
+    def __init__(
+        self,
+        delimiter: Optional[str] = None,
+        x: Optional[str] = None,
+        y: Optional[str] = None,
+        x_dtype: type = float,
+    ):
+        """Instantiate a new parser.
+
+        Parameters
+        ----------
+        delimiter : Optional[str], optional
+            Column delimiter, default None (comma, tab or whitespace, whichever
+            occurs in the first line)
+        x : Optional[str], optional
+            Column of x values, by name or 0-based index, default None (the
+            x values are the row numbers)
+        y : Optional[str], optional
+            Comma separated columns of y values, default None (all columns but
+            the x column)
+        x_dtype : type, optional
+            Type of the x values, default float
+        """
+        self.delimiter = delimiter
+        self.x, self.y = x, y
+        self.x_dtype = x_dtype
+        self.names = None  # of all columns, from the header or their indices
+        self.has_header = False
+        self._first_line = True  # of the current source
+        self._n_rows = 0
+
+    @property
+    def x_name(self) -> Optional[str]:
+        return None if self.x_col is None else self.names[self.x_col]
+
+    @property
+    def y_names(self) -> List[str]:
+        return [self.names[col] for col in self.y_cols]
+
+    def new_source(self) -> None:
+        """Start parsing a new source, whose first line may be a header"""
+        self._first_line = True
+
+    def parse(self, lines: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Parse lines into 1d array of x values and 2d array of y values, with
+        one row per y column"""
+        if self._first_line:
+            first = next((ii for ii, line in enumerate(lines) if _has_data(line)), None)
+            if first is not None:
+                self._first_line = False
+                if self.names is None:
+                    self._init_columns(lines[first])
+                if self.has_header:
+                    lines = lines[first + 1 :]
+        if self.names is None:  # no data yet
+            return np.empty(0), np.empty((0, 0))
+
+        with warnings.catch_warnings():  # blocks of only blank lines or comments
+            warnings.simplefilter("ignore", UserWarning)
+            y = np.loadtxt(
+                lines, delimiter=self.delimiter, usecols=self.y_cols, ndmin=2
+            ).T
+            if self.x_col is None:
+                x = np.arange(self._n_rows, self._n_rows + y.shape[1])
+            else:
+                x = np.loadtxt(
+                    lines,
+                    delimiter=self.delimiter,
+                    usecols=self.x_col,
+                    ndmin=1,
+                    dtype=self.x_dtype,
+                )
+        self._n_rows += y.shape[1]
+        return x, y
+
+    def _init_columns(self, line: str) -> None:
+        """Detect delimiter & header, and find the columns from the first line"""
+        if self.delimiter is None:
+            self.delimiter = next((d for d in [",", "\t"] if d in line), None)
+        fields = [field.strip() for field in line.split(self.delimiter)]
+        self.has_header = not all(_is_number(field) for field in fields)
+        if self.has_header:
+            self.names = fields
+        else:
+            self.names = [str(col) for col in range(len(fields))]
+
+        self.x_col = None if self.x is None else self._column(self.x)
+        if self.y is None:
+            self.y_cols = [col for col in range(len(fields)) if col != self.x_col]
+        else:
+            self.y_cols = [self._column(name) for name in self.y.split(",")]
+        if len(self.y_cols) == 0:
+            raise ValueError("No columns of y values to plot!")
+
+    def _column(self, name: str) -> int:
+        if name in self.names:
+            return self.names.index(name)
+        if name.isdigit() and int(name) < len(self.names):
+            return int(name)
+        raise ValueError(f"Column {name} not found, columns are: {self.names}")
+
+
+class _Plotter:
+    """Adds parsed blocks of data to a figure, by kind of plot. Histograms and
+    boxplots are accumulated, such that blocks need not be kept. Bars are
+    collected, and only plotted on `flush`."""
+
+    def __init__(self, fig, parser: ColumnParser, kind: str = "plot", bins=10):
+        self.fig = fig
+        self.parser = parser
+        self.kind = kind
+        self.bins = bins
+        self._accumulators = None  # histogram or quantile sketches
+        self._values, self._labels = list(), list()  # of barh blocks
+        self._n_flushed = 0  # number of barh blocks plotted
+
+    def add(self, x: np.ndarray, y: np.ndarray) -> bool:
+        """Add the values of a block, returns whether there were any"""
+        if y.shape[1] == 0:
+            return False
+        if self.kind in ["hist", "barh"] and len(y) > 1:
+            raise ValueError(f"Can only plot a single column of y as {self.kind}!")
+        if self.fig._plot_builder.is_empty():
+            self._set_labels()
+        getattr(self, f"_add_{self.kind}")(x, y)
+        return True
+
+    def flush(self):
+        """Plot the bars of all blocks added so far (other kinds of plots are
+        added to the figure as blocks come in)"""
+        if len(self._values) == self._n_flushed:
+            return
+        self._values = [np.concatenate(self._values)]
+        self._labels = [np.concatenate(self._labels)]
+        self._n_flushed = 1
+        self.fig.clear()
+        self.fig.barh(self._values[0], labels=self._labels[0].astype(str))
+
+    def _set_labels(self):
+        """Label the axes by the names of the columns, if not set already"""
+        x_name, y_names = self.parser.x_name, self.parser.y_names
+        if self.kind == "hist":
+            x_name, y_names = y_names[0], ["counts"]
+        elif self.kind == "barh":
+            x_name, y_names = y_names[0], [None]
+
+        if self.fig.x_axis.label is None and self.kind != "boxplot":
+            self.fig.set_xlabel(x_name if self.parser.has_header else None)
+        if self.fig.y_axis.label is None and len(y_names) == 1:
+            self.fig.set_ylabel(
+                y_names[0] if self.parser.has_header or self.kind == "hist" else None
+            )
+
+    def _add_plot(self, x, y):
+        names = self.parser.y_names
+        for name, y_col in zip(names, y):
+            self.fig.append(x, y_col, series=name if len(names) > 1 else None)
+
+    def _add_hist(self, x, y):
+        if self._accumulators is None:
+            self._accumulators = Histogram(bins=self.bins)
+            self.fig.hist(self._accumulators)
+        self._accumulators.update(y[0])
+
+    def _add_boxplot(self, x, y):
+        if self._accumulators is None:
+            self._accumulators = [QuantileSketch() for _ in y]
+            self.fig.boxplot(self._accumulators, labels=self.parser.y_names)
+        for sketch, y_col in zip(self._accumulators, y):
+            sketch.update(y_col)
+
+    def _add_barh(self, x, y):
+        self._values.append(y[0])
+        self._labels.append(x)
+
+
+# -----------------------------------------------------------------------------
+# Private functions: reading & drawing
+# -----------------------------------------------------------------------------
+
+
+def _version() -> str:
+    import shellplot
+
+    return f"shellplot {shellplot.__version__}"
+
+
+def _has_data(line: str) -> bool:
+    """Whether line is neither blank nor a comment, as for `np.loadtxt`"""
+    line = line.strip()
+    return len(line) > 0 and not line.startswith("#")
+
+
+def _is_number(field: str) -> bool:
+    try:
+        float(field)
+    except ValueError:
+        return False
+    return True
+
+
+def _open(path: str):
+    if path == "-":
+        return contextlib.nullcontext(sys.stdin)  # stdin is not to be closed
+    return open(path, "r")
+
+
+def _blocks(stream, chunksize: int):
+    """Blocks of up to chunksize lines, until the end of the stream"""
+    return iter(lambda: list(islice(stream, chunksize)), [])
+
+
+def _follow_blocks(stream, chunksize: int, interval: float):
+    """Blocks of lines as they arrive. A block is yielded once lines have been
+    collected for interval seconds, or once it has chunksize lines. At the end
+    of a regular file, the file is polled for new lines (as by `tail -f`)."""
+    lines = queue.Queue()
+    poll = _is_regular_file(stream)
+    reader = threading.Thread(
+        target=_enqueue_lines, args=(stream, lines, poll, interval), daemon=True
+    )
+    reader.start()
+
+    while True:
+        block = [lines.get()]  # wait for the first line of the block
+        deadline = time.monotonic() + interval
+        while block[-1] is not None and len(block) < chunksize:
+            try:
+                block.append(lines.get(timeout=max(0, deadline - time.monotonic())))
+            except queue.Empty:
+                break
+        if block[-1] is None:  # end of stream
+            if len(block) > 1:
+                yield block[:-1]
+            return
+        yield block
+
+
+def _is_regular_file(stream) -> bool:
+    try:
+        return stat.S_ISREG(os.fstat(stream.fileno()).st_mode)
+    except (AttributeError, OSError, ValueError):  # e.g. in-memory streams
+        return False
+
+
+def _enqueue_lines(stream, lines: queue.Queue, poll: bool, interval: float):
+    """Put lines of the stream into the queue, and None at its end. When polling,
+    a line without its newline may still be being written, it is held back until
+    the rest of it arrives."""
+    partial = ""
+    while True:
+        try:
+            line = stream.readline()
+        except ValueError:  # closed, e.g. once plotting is interrupted
+            line, poll = "", False
+        if line:
+            partial += line
+            if not poll or partial.endswith("\n"):
+                lines.put(partial)
+                partial = ""
+        elif poll:
+            time.sleep(interval)
+        else:
+            lines.put(None)
+            return
+
+
+if __name__ == "__main__":
+    run()
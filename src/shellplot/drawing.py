@@ -7,6 +7,10 @@ type of plot.
 from collections import namedtuple
 from typing import List
 
+import numpy as np
+
+from shellplot.profiling import stage
+
 MARKER_STYLES = {1: "+", 2: "*", 3: "o", 4: "x", 5: "@", 6: "■"}
 
 LINE_STYLES = {10: "·", 11: ":", 12: "÷", 13: "×"}
@@ -17,14 +21,109 @@ PALETTE = {
     21: "_",
     22: "-",
     23: "┐",
+    30: "⣿",  # legend symbol of series in braille canvas mode
+    31: "▟",  # legend symbol of series in quadrant canvas mode
 }
 PALETTE.update(MARKER_STYLES)
 PALETTE.update(LINE_STYLES)
 
+# Canvas modes: number of sub-cells per character along x and y, the weights of
+# the sub-cells (in display order, i.e. rows top to bottom) in the pattern of the
+# character, and a function from the pattern to unicode code points
+CANVAS_MODES = {
+    "char": (1, 1),
+    "braille": (2, 4),
+    "quadrant": (2, 2),
+}
+SUBCELL_WEIGHTS = {
+    "braille": np.array([[0x01, 0x08], [0x02, 0x10], [0x04, 0x20], [0x40, 0x80]]),
+    "quadrant": np.array([[1, 2], [4, 8]]),
+}
+QUADRANTS = " ▘▝▀▖▌▞▛▗▚▐▜▄▙▟█"
+SUBCELL_LUTS = {  # empty patterns are blanks, as empty cells of the canvas
+    "braille": np.concatenate([[ord(" ")], 0x2801 + np.arange(255)]).astype(np.uint32),
+    "quadrant": np.array([ord(char) for char in QUADRANTS], dtype=np.uint32),
+}
+LEGEND_SYMBOLS = {"braille": 30, "quadrant": 31}
+
+
+# Canvas values are palette codes, which fit into a single byte. Codes below
+# USER_CODES are reserved for the styles above, symbols registered at runtime
+# (e.g. custom markers) are assigned the next free code.
+CANVAS_DTYPE = np.uint8
+USER_CODES = 32
+N_CODES = np.iinfo(CANVAS_DTYPE).max + 1
+
+
+def _palette_lut(palette) -> np.ndarray:
+    """Lookup table from canvas values to unicode code points of the palette"""
+    lut = np.zeros(N_CODES, dtype=np.uint32)
+    for key, symbol in palette.items():
+        lut[key] = ord(symbol)
+    return lut
+
+
+PALETTE_LUT = _palette_lut(PALETTE)
+_PALETTE_CODES = {symbol: key for key, symbol in PALETTE.items()}
+
+
+def register_symbol(symbol: str) -> int:
+    """Palette code of a symbol, which is registered if it is not known yet
+
+    Parameters
+    ----------
+    symbol : str
+        Single character, e.g. a custom marker
+
+    Returns
+    -------
+    int
+        Code of the symbol, to be used as canvas value
+
+    Raises
+    ------
+    ValueError
+        If symbol is not a single character, or if the palette is full
+    """
+    if not isinstance(symbol, str) or len(symbol) != 1:
+        raise ValueError(f"Symbol must be a single character, got {symbol!r}")
+    if symbol in _PALETTE_CODES:
+        return _PALETTE_CODES[symbol]
+
+    code = max(USER_CODES - 1, *PALETTE) + 1
+    if code >= N_CODES:
+        raise ValueError(f"Palette is full, cannot register {symbol!r}")
+    PALETTE[code] = symbol
+    PALETTE_LUT[code] = ord(symbol)
+    _PALETTE_CODES[symbol] = code
+    return code
+
+
+def empty_canvas(shape) -> np.ndarray:
+    """Canvas of given shape (rows, columns), without any symbols.
+
+    Rows of canvases are in display order, i.e. the top row first, such that
+    each row of the drawn figure is a contiguous block of the canvas. Plots are
+    added via `xy_view`, in display coordinates.
+    """
+    return np.zeros(shape, dtype=CANVAS_DTYPE)
+
+
+def xy_view(canvas) -> np.ndarray:
+    """View of a canvas that is indexed by display coordinates [x, y], with y
+    from the bottom (as the axes), i.e. the view flips the rows of the canvas"""
+    return canvas[::-1].T
+
+
 LegendItem = namedtuple("LegendItem", ["symbol", "name"])
 
+# lines of a figure around its canvas, see `draw_frame`
+Frame = namedtuple("Frame", ["lines", "right", "row", "col"])
+
 
-def draw(canvas, x_axis, y_axis, legend=None, title=None) -> str:
+def draw(
+    canvas, x_axis, y_axis, legend=None, title=None, subcanvas=None, mode="char"
+) -> str:
     """Draw figure from plot elements (i.e. canvas, x-axis, y-axis, legend)
 
     Internally, this functions draws all elements as list of strings, and then
@@ -33,13 +132,20 @@ def draw(canvas, x_axis, y_axis, legend=None, title=None) -> str:
     Parameters
     ----------
     canvas : np.ndarray
-        The data to be drawn
+        Palette codes to be drawn, rows in display order (see `empty_canvas`)
     x_axis : shellplot.axis.Axis
         Fitted x-axis
     y_axis : shellplot.axis.Axis
         Fitted y-axis
     legend : dict[str, str], optional
         Legend of the plot
+    title : str, optional
+        Title of the plot
+    subcanvas : np.ndarray, optional
+        Boolean canvas of sub-cells, which is packed into the characters of
+        canvas cells that are empty, see `CANVAS_MODES`
+    mode : str, optional
+        Canvas mode of the subcanvas, default "char" (no sub-cells)
 
     Returns
     -------
@@ -47,23 +153,80 @@ def draw(canvas, x_axis, y_axis, legend=None, title=None) -> str:
         The drawn figure
 
     """
-    canvas_lines = _draw_canvas(canvas)
+    return "\n".join(draw_lines(canvas, x_axis, y_axis, legend, title, subcanvas, mode))
+
+
+def draw_lines(
+    canvas, x_axis, y_axis, legend=None, title=None, subcanvas=None, mode="char"
+) -> List[str]:
+    """Draw figure from plot elements as a list of lines (without newlines)
+
+    Same as `draw`, but the lines are not joined, which allows to combine the
+    lines of multiple figures (e.g. in a grid layout).
+    """
+    with stage("canvas", count=canvas.size):
+        canvas_lines = _draw_canvas(canvas, subcanvas, mode)
+    frame = draw_frame(canvas.shape, x_axis, y_axis, legend, title)
+
+    with stage("join", count=len(frame.lines)):
+        return _join_frame(frame, canvas_lines)
 
-    left_pad = max([len(str(val)) for (t, val) in y_axis.generate_display_ticks()]) + 1
-    y_lines = _draw_y_axis(y_axis, left_pad)
-    x_lines = _draw_x_axis(x_axis, left_pad)
 
-    if legend is not None:
-        legend_lines = _draw_legend(legend)
-    else:
-        legend_lines = None
+def draw_frame(canvas_shape, x_axis, y_axis, legend=None, title=None) -> Frame:
+    """Draw the elements of a figure around its canvas (i.e. axes, legend, title)
+
+    This allows to write the canvas elsewhere, e.g. as code points straight into
+    the buffer of a grid layout (see `canvas_code_points`).
+
+    Returns
+    -------
+    Frame
+        Named tuple of the `lines` of the figure without the canvas, in which the
+        lines of canvas rows end before the canvas, the `right` remainders of the
+        canvas rows (i.e. the legend), and the `row`, `col` of the canvas
+    """
+    with stage("ticks"):  # ticks are generated on first access, then kept
+        y_ticks = y_axis.generate_display_ticks()
+        left_pad = max([len(str(val)) for (t, val) in y_ticks]) + 1
+        x_axis.generate_display_ticks()
+    with stage("axes"):
+        y_lines = _draw_y_axis(y_axis, left_pad)
+        x_lines = _draw_x_axis(x_axis, left_pad)
+
+    legend_lines = _draw_legend(legend) if legend is not None else None
+    legend_lines = _pad_lines(legend_lines, y_lines)
 
+    lines = [""]
     if title is not None:
-        title_line = _draw_title(title, x_axis.display_max, left_pad)
-    else:
-        title_line = None
+        lines.append(_draw_title(title, x_axis.display_max, left_pad))
 
-    return _join_plot_lines(canvas_lines, y_lines, x_lines, legend_lines, title_line)
+    n_above = len(y_lines) - canvas_shape[0]  # e.g. the label of the y-axis
+    row = len(lines) + n_above
+    for ii, (ax, leg) in enumerate(zip(y_lines, legend_lines)):
+        lines.append(ax if ii >= n_above else ax + leg)
+    lines.extend("".join(x_lines).split("\n"))
+    return Frame(lines, legend_lines[n_above:], row, left_pad + 1)
+
+
+def canvas_code_points(canvas, subcanvas=None, mode="char", out=None) -> np.ndarray:
+    """Unicode code points of the canvas, of shape (rows, columns)
+
+    Parameters
+    ----------
+    canvas, subcanvas, mode
+        See `draw`
+    out : np.ndarray, optional
+        uint32 array of the shape of the canvas to write the code points to, e.g.
+        a slice of a larger buffer. Default None, i.e. a new array.
+    """
+    # compact canvas values are cast to indices first, as indexing with intp is
+    # much faster than with small integer types
+    rows = np.asarray(canvas, dtype=np.intp, order="C")
+    code_points = np.take(PALETTE_LUT, rows, out=out)
+    if subcanvas is not None and mode != "char":  # sub-cells of empty cells
+        packed = _pack_subcanvas(subcanvas, mode)
+        np.copyto(code_points, packed, where=rows == 0)
+    return code_points
 
 
 # ------------------------------------------------------------------------------
@@ -71,16 +234,25 @@ def draw(canvas, x_axis, y_axis, legend=None, title=None) -> str:
 # ------------------------------------------------------------------------------
 
 
-def _draw_canvas(canvas) -> List[str]:
-    plt_lines = list()
+def _draw_canvas(canvas, subcanvas=None, mode="char") -> List[str]:
+    # map the whole canvas to code points in one go. As rows are in display
+    # order, each row is then a contiguous block of code points that can be
+    # viewed as a single unicode string, i.e. joined without a loop.
+    code_points = canvas_code_points(canvas, subcanvas, mode)
+    return code_points.view(f"U{canvas.shape[1]}").ravel().tolist()
 
-    for i in reversed(range(canvas.shape[1])):
-        plt_str = ""
-        for j in range(canvas.shape[0]):
-            plt_str += PALETTE[canvas[j, i]]
-        plt_lines.append(plt_str)
 
-    return plt_lines
+def _pack_subcanvas(subcanvas, mode) -> np.ndarray:
+    """Pack the sub-cells of each character into its pattern, as code points"""
+    n_x, n_y = CANVAS_MODES[mode]
+    height, width = subcanvas.shape[0] // n_y, subcanvas.shape[1] // n_x
+    cells = subcanvas.reshape(height, n_y, width, n_x)
+
+    # or-ing the strided views of each sub-cell is faster than a (tensor) dot
+    pattern = np.zeros((height, width), dtype=np.uint8)
+    for (row, col), weight in np.ndenumerate(SUBCELL_WEIGHTS[mode]):
+        pattern |= cells[:, row, :, col] * np.uint8(weight)
+    return SUBCELL_LUTS[mode][pattern.astype(np.intp)]
 
 
 def _draw_y_axis(y_axis, left_pad) -> List[str]:
@@ -152,21 +324,12 @@ def _draw_title(title, x_display_max, left_pad) -> List[str]:
 # ------------------------------------------------------------------------------
 
 
-def _join_plot_lines(canvas_lines, y_lines, x_lines, legend_lines, title_str):
-    plt_str = "\n"
-    canvas_lines = _pad_lines(canvas_lines, y_lines)
-    legend_lines = _pad_lines(legend_lines, y_lines)
-
-    if title_str is not None:
-        plt_str += f"{title_str}\n"
-
-    for ax, canvas, leg in zip(y_lines, canvas_lines, legend_lines):
-        plt_str += f"{ax}{canvas}{leg}\n"
-
-    for ax in x_lines:
-        plt_str += ax
-
-    return plt_str
+def _join_frame(frame: Frame, canvas_lines: List[str]) -> List[str]:
+    """Lines of the figure, with the lines of the canvas inserted into its frame"""
+    lines = list(frame.lines)
+    for ii, (canvas_line, right) in enumerate(zip(canvas_lines, frame.right)):
+        lines[frame.row + ii] += canvas_line + right
+    return lines
 
 
 def _pad_lines(lines, ref_lines):
@@ -7,10 +7,41 @@ from typing import Optional, Tuple
 import numpy as np
 
 from shellplot._config import _global_config as config
-from shellplot._plotting import PlotBuilder, PlotCall, _barh, _boxplot, _hist, _plot
+from shellplot._config import _profile_hooks
+from shellplot._plotting import (
+    PlotBuilder,
+    PlotCall,
+    _barh,
+    _boxplot,
+    _distributions,
+    _hist,
+    _plot,
+)
+from shellplot._series import Series, drop_any_nan
 from shellplot.axis import Axis
-from shellplot.drawing import LINE_STYLES, MARKER_STYLES, draw
-from shellplot.utils import array_like, get_index, numpy_1d, numpy_2d, remove_any_nan
+from shellplot.drawing import (
+    CANVAS_MODES,
+    LINE_STYLES,
+    MARKER_STYLES,
+    draw_frame,
+    draw_lines,
+    empty_canvas,
+)
+from shellplot.histogram import Histogram
+from shellplot.live import LiveDisplay
+from shellplot.profiling import profile as profile_stages
+from shellplot.profiling import stage
+from shellplot.utils import (
+    array_like,
+    chunked,
+    factorize,
+    get_index,
+    group_slices,
+    is_chunked,
+    numpy_1d,
+    numpy_2d,
+    remove_any_nan,
+)
 
 
 class Figure:
@@ -28,7 +59,8 @@ class Figure:
         yticklabels: Optional[array_like] = None,
         ylabel: Optional[str] = None,
         title: Optional[str] = None,
-        **kwargs
+        canvas_mode: str = "char",
+        **kwargs,
     ) -> None:
         """Instantiate a new figure
 
@@ -54,7 +86,18 @@ class Figure:
             Name to use for the ylabel on y-axis.
         title : Optional[str], optional
             The title of the figure.
+        canvas_mode : str, optional
+            How points of `plot` are drawn. Default "char", i.e. one point per
+            character. "braille" or "quadrant" draw 2x4 or 2x2 points per
+            character, using braille or quadrant block characters. This gives
+            a higher resolution, but series are no longer distinguished by
+            their marker and line style.
         """
+        if canvas_mode not in CANVAS_MODES:
+            raise ValueError(
+                f"Canvas mode needs to be one of: {', '.join(CANVAS_MODES)}"
+            )
+        self.canvas_mode = canvas_mode
         self.figsize = figsize or config["figsize"]
         self.x_axis = Axis(
             display_length=self.figsize[0],
@@ -77,9 +120,23 @@ class Figure:
         """Clear the figure, by removing all attached plots."""
         self._plot_builder = PlotBuilder()
         self.__init_figure_elements()
+        self._canvas_valid = False  # whether canvas can be drawn on incrementally
+        self._canvas_updated = False  # whether canvas has new points to draw
+        self._rendered = None  # (fingerprint, string) of the last drawn figure
+        self.profile_report = None  # of the last profiled draw
+
+    def _invalidate(self) -> None:
+        """Invalidate canvas and drawn figure, after plots or axes changed"""
+        self._canvas_valid = False
+        self._rendered = None
 
     def __init_figure_elements(self) -> None:
-        self.canvas = np.zeros(shape=(self.figsize[0], self.figsize[1]), dtype=int)
+        self.canvas = empty_canvas(shape=(self.figsize[1], self.figsize[0]))
+        self.subcanvas = None  # of sub-cells, which plotted points are added to
+        if self.canvas_mode != "char":
+            n_x, n_y = CANVAS_MODES[self.canvas_mode]
+            shape = (self.figsize[1] * n_y, self.figsize[0] * n_x)
+            self.subcanvas = np.zeros(shape, dtype=bool)
         self.legend = list()
         self.markers = cycle(MARKER_STYLES.keys())
         self.lines = cycle(LINE_STYLES.keys())
@@ -98,20 +155,94 @@ class Figure:
         color : array, optional
             Color of scatter. Needs to be of same dimension as x, y
             Should be 1-d np.ndarray or pandas series
-        line : bool, optional, default False
+        marker : bool or str, optional, default True
+            Whether markers should be plotted at the x, y points. If a single
+            character, it is used as marker instead of the next marker style.
+        line : bool or str, optional, default False
             Whether a line should be plotted using the x, y points. This will use a
-            linear interpolation of the points.
+            linear interpolation of the points. If a single character, it is used
+            as line symbol instead of the next line style.
         label : str
             The label of the plot for display in the legend
+        zorder : float, optional, default 2
+            Plots of higher zorder are drawn on top of plots of lower zorder
+
+        Notes
+        -----
+        For data that does not fit into memory, x and y can be 1d `np.memmap`
+        or `shellplot.utils.ChunkedArray`, which are plotted chunk by chunk.
         """
-        x = numpy_2d(x)
-        y = numpy_2d(y)
+        if is_chunked(x) or is_chunked(y):
+            if color is not None:
+                raise ValueError("Color is not supported for chunked arrays!")
+            call = PlotCall(func=_plot, args=[chunked(x), chunked(y)], kwargs=kwargs)
+            self._plot_builder.add(call)
+            self._invalidate()
+            return
+
+        with stage("convert", count=np.size(x)):
+            x = numpy_2d(x)
+            y = numpy_2d(y)
+
+            for x, y, kwargs in array_split(x, y, kwargs):
+                for x, y, kwargs in color_split(x, y, color, kwargs):
+                    x, y = drop_any_nan(Series(x), Series(y))
+                    call = PlotCall(func=_plot, args=[x, y], kwargs=kwargs)
+                    self._plot_builder.add(call)
+        self._invalidate()
+
+    def append(
+        self,
+        x: array_like,
+        y: array_like,
+        series=None,
+        autoscale: bool = False,
+        **kwargs,
+    ) -> None:
+        """Append x, y points to a plotted series, for streaming data.
 
-        for x, y, kwargs in array_split(x, y, kwargs):
-            for x, y, kwargs in color_split(x, y, color, kwargs):
-                x, y = remove_any_nan(x, y)
-                call = PlotCall(func=_plot, args=[x, y], kwargs=kwargs)
-                self._plot_builder.add(call)
+        If the figure has been drawn, the new points are added directly to its
+        canvas, without redrawing the points plotted before. The axes are only
+        refitted (and the figure is redrawn) if the new points fall outside of
+        the fitted axis limits, or if `autoscale` is True.
+
+        Parameters
+        ----------
+        x : array-like
+            The horizontal coordinates of the new data points.
+        y : array-like
+            The vertical coordinates of the new data points.
+        series : int or str, optional
+            The series to append to, either by order of plotting or by label.
+            Defaults to the last plotted series. If there is no such series, a
+            new series is plotted (with `series` as label).
+        autoscale : bool, optional, default False
+            Whether to refit the axes (and redraw) regardless of the new points
+        **kwargs
+            Passed to `Figure.plot`, if a new series is plotted
+        """
+        x, y = remove_any_nan(numpy_1d(x), numpy_1d(y))
+
+        index = self._plot_builder.find(series)
+        if index is None:
+            if series is not None and not isinstance(series, int):
+                kwargs.setdefault("label", series)
+            self.plot(x, y, **kwargs)
+            return
+
+        if not self._plot_builder.is_streamable():
+            self._plot_builder.append(index, x, y)
+            return
+
+        if autoscale or self.x_axis.exceeds_limits(x) or self.y_axis.exceeds_limits(y):
+            self.x_axis.reset()
+            self.y_axis.reset()
+            self._invalidate()
+        elif self._canvas_valid:  # added to the layer of the series directly
+            self._plot_builder.render_appended(self, index, x, y)
+            self._canvas_updated = True
+
+        self._plot_builder.append(index, x, y)
 
     def hist(self, x: array_like, **kwargs) -> None:
         """Plot a histogram of x
@@ -120,14 +251,23 @@ class Figure:
         ----------
         x : array-like
             The array of points to plot a histogram of. Should be 1d np.ndarray or
-            pandas series.
+            pandas series. For data that does not fit into memory, x can also be
+            a 1d `np.memmap` or a `shellplot.utils.ChunkedArray`. Alternatively,
+            x can be an accumulated `shellplot.histogram.Histogram`.
         bins : int, optional
             Number of bins in histogram. Default is 10 bins.
         label : str
             The label of the plot for display in the legend
+        zorder : float, optional, default 1
+            Plots of higher zorder are drawn on top of plots of lower zorder
         """
+        if is_chunked(x):
+            x = chunked(x)
+        elif not isinstance(x, Histogram):
+            x = Series(x)
         call = PlotCall(func=_hist, args=[x], kwargs=kwargs)
         self._plot_builder.add(call)
+        self._invalidate()
 
     def barh(self, x: array_like, **kwargs) -> None:
         """Plot horizontal bars
@@ -139,11 +279,14 @@ class Figure:
             series.
         labels : array-like
             Array that is used to label the bars. Needs to have the same dim as x.
+        zorder : float, optional, default 1
+            Plots of higher zorder are drawn on top of plots of lower zorder
         """
         if kwargs.get("labels") is None:
             kwargs["labels"] = get_index(x)
-        call = PlotCall(func=_barh, args=[x], kwargs=kwargs)
+        call = PlotCall(func=_barh, args=[Series(x)], kwargs=kwargs)
         self._plot_builder.add(call)
+        self._invalidate()
 
     def boxplot(self, x: array_like, **kwargs) -> None:
         """Plot a boxplot of x
@@ -156,13 +299,22 @@ class Figure:
         x : array-like
             The horizontal coordinates of the data points.
             Can be 1d or 2d np.ndarray/ pandas series/ dataframe. If 2d, each 1d
-            slice will be plotted as a separate boxplot.
+            slice will be plotted as a separate boxplot. Can also be a
+            QuantileSketch or ChunkedArray, or a list of them, which is useful
+            for data that does not fit into memory.
         labels : array-like
             Array that is used to label the boxplots.
+        sketch_eps : float, optional
+            If given, quantiles are approximated by a QuantileSketch with this
+            rank error, rather than computed exactly. Sketches and chunked
+            arrays are always approximated (default rank error 0.01).
+        zorder : float, optional, default 1
+            Plots of higher zorder are drawn on top of plots of lower zorder
         """
-
+        x = _distributions(chunked(x) if is_chunked(x) else x)
         call = PlotCall(func=_boxplot, args=[x], kwargs=kwargs)
         self._plot_builder.add(call)
+        self._invalidate()
 
     def show(self) -> None:
         """Show the figure by printing to stdout.
@@ -175,24 +327,118 @@ class Figure:
         plt_str = self.draw()
         print(plt_str)
 
-    def draw(self) -> str:
+    def live(self, fps: Optional[float] = 10, **kwargs) -> LiveDisplay:
+        """Display the figure live in the terminal, i.e. redrawn in place.
+
+        >>> with fig.live(fps=10) as live:
+        ...     for x, y in stream:
+        ...         fig.append(x, y)
+        ...         live.refresh()
+
+        Only the cells that changed since the last frame are written to the
+        terminal, see `shellplot.live.LiveDisplay`.
+
+        Parameters
+        ----------
+        fps : Optional[float], optional
+            Maximum number of frames per second, default 10. Refreshes in
+            between are not drawn.
+        **kwargs
+            Passed to `shellplot.live.LiveDisplay`, e.g. `out`
+
+        Returns
+        -------
+        LiveDisplay
+            The display, whose `refresh` draws the figure
+        """
+        return LiveDisplay(self, fps=fps, **kwargs)
+
+    def draw(self, profile: bool = False) -> str:
         """Draw the figure as a string
 
+        Parameters
+        ----------
+        profile : bool, optional
+            Whether to profile the stages of drawing, default False. The report
+            is kept as `profile_report`, see `shellplot.profiling`. Draws are
+            always profiled while profile hooks are registered.
+
         Returns
         -------
         str
             Ascii string of figure
 
+        Notes
+        -----
+        The drawn string is cached, and returned directly as long as the plotted
+        data, axes, figsize and title are unchanged. Plotted arrays are assumed
+        not to be modified in place.
         """
-        self.__init_figure_elements()
-        self._plot_builder.create(self)
-
-        return draw(
-            canvas=self.canvas,
-            y_axis=self.y_axis,
-            x_axis=self.x_axis,
-            legend=self.legend,
-            title=self.title,
+        if profile or len(_profile_hooks) > 0:
+            with profile_stages() as report:
+                plt_str = self._draw()
+            self.profile_report = report
+            return plt_str
+        return self._draw()
+
+    def _draw(self) -> str:
+        if self._rendered is not None and self._rendered[0] == self._fingerprint():
+            with stage("cached"):
+                return self._rendered[1]
+
+        plt_str = "\n".join(self._draw_lines())
+        # fingerprint after drawing, as fitting the axes changes their state
+        self._rendered = (self._fingerprint(), plt_str)
+        return plt_str
+
+    def _draw_lines(self):
+        """Create the figure and draw it as list of lines"""
+        self._create()
+        with stage("draw"):
+            return draw_lines(
+                canvas=self.canvas,
+                y_axis=self.y_axis,
+                x_axis=self.x_axis,
+                legend=self.legend,
+                title=self.title,
+                subcanvas=self.subcanvas,
+                mode=self.canvas_mode,
+            )
+
+    def _draw_frame(self, fit=True):
+        """Create the figure and draw the frame around its canvas, which is left
+        to be written by the caller (see `shellplot.drawing.draw_frame`)"""
+        self._create(fit=fit)
+        with stage("draw"):
+            return draw_frame(
+                self.canvas.shape,
+                y_axis=self.y_axis,
+                x_axis=self.x_axis,
+                legend=self.legend,
+                title=self.title,
+            )
+
+    def _create(self, fit=True):
+        """Create the canvas of the figure. If fit is False, the axes have been
+        fitted already (e.g. as they are shared by panels of a layout), and the
+        canvas is always re-created."""
+        if not fit or not (self._canvas_valid and self._canvas_updated):
+            with stage("create"):
+                self.__init_figure_elements()
+                self._plot_builder.create(self, fit=fit)
+                self._canvas_valid = fit and self._plot_builder.is_streamable()
+        else:  # only the layers of appended points changed
+            self._plot_builder.composite(self)
+        self._canvas_updated = False
+
+    def _fingerprint(self):
+        return (
+            self.figsize,
+            self.canvas_mode,
+            self.title,
+            self.x_axis.fingerprint(),
+            self.y_axis.fingerprint(),
+            self._plot_builder.fingerprint(),
         )
 
     # -------------------------------------------------------------------------
@@ -203,37 +449,46 @@ class Figure:
     def set_xlim(self, value):
         """Set limits of x-axis"""
         self.x_axis.limits = value
+        self._invalidate()
 
     def set_xticks(self, value):
         """Set x-axis ticks"""
         self.x_axis.ticks = value
+        self._invalidate()
 
     def set_xticklabels(self, value):
         """Set x-axis tick labels."""
         self.x_axis.ticklabels = value
+        self._invalidate()
 
     def set_xlabel(self, value):
         """Set the label of the x-axis"""
         self.x_axis.label = value
+        self._invalidate()
 
     def set_ylim(self, value):
         """Set limits of y-axis"""
         self.y_axis.limits = value
+        self._invalidate()
 
     def set_yticks(self, value):
         """Set y-axis ticks"""
         self.y_axis.ticks = value
+        self._invalidate()
 
     def set_yticklabels(self, value):
         """Set y-axis tick labels."""
         self.y_axis.ticklabels = value
+        self._invalidate()
 
     def set_ylabel(self, value):
         """Set y-axis tick labels."""
         self.y_axis.label = value
+        self._invalidate()
 
     def set_title(self, value):
         self.title = value
+        self._rendered = None
 
 
 def color_split(x, y, color, kwargs):
@@ -241,14 +496,13 @@ def color_split(x, y, color, kwargs):
     if color is None:
         yield x, y, kwargs
     else:
-        color = numpy_1d(color).squeeze()
-        values = np.unique(color)
+        # sorting x, y by color once, each color is a contiguous slice
+        codes, values = factorize(numpy_1d(color).squeeze())
+        order, slices = group_slices(codes, len(values))
+        x, y = x[order], y[order]
 
-        for value in values:
-            mask = value == color
-            val_kwargs = copy.deepcopy(kwargs)
-            val_kwargs.update({"label": value})
-            yield x[mask], y[mask], val_kwargs
+        for value, group in zip(values, slices):
+            yield x[group], y[group], {**kwargs, "label": value}
 
 
 def array_split(x, y, kwargs):
@@ -0,0 +1,190 @@
+"""Module that contains Histogram class, for accumulating histograms of streams
+"""
+import copy
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from shellplot.utils import array_like, fingerprint, numpy_1d
+
+
+class Histogram:
+    """Histogram that is accumulated from chunks of data.
+
+    Chunks are counted as they come in, without keeping the data around:
+
+    >>> hist = Histogram(bins=10)
+    >>> for chunk in stream:
+    ...     hist.update(chunk)
+    >>> fig.hist(hist)
+
+    Histograms of different workers can be combined via `.merge`, and a
+    histogram can be drawn by `Figure.hist` at any time.
+
+    If `bins` is an integer, the bins are auto-expanding: the first chunk (or
+    `range`) determines the bin edges, as for `np.histogram`. When later data
+    falls outside of the edges, the bin width is doubled (merging neighbouring
+    bins) until all data is covered, so that the number of bins stays fixed.
+    Otherwise, if `bins` are edges (or `expand` is False), the bins are fixed
+    and data outside of them is ignored, as for `np.histogram`.
+    """
+
+    def __init__(
+        self,
+        bins: Union[int, array_like] = 10,
+        range: Optional[Tuple[float, float]] = None,
+        expand: Optional[bool] = None,
+    ):
+        """Instantiate a new histogram.
+
+        Parameters
+        ----------
+        bins : int or array-like, optional
+            Number of bins, or the bin edges. Default is 10 bins.
+        range : Optional[Tuple[float, float]], optional
+            Initial lower and upper edge of the bins, if bins is an integer.
+            Default None, i.e. determined by the first chunk.
+        expand : Optional[bool], optional
+            Whether bins are expanded to cover data outside of the bin edges.
+            Default None, i.e. True if bins is an integer, False otherwise.
+            Bin edges can only be expanded if they are of uniform width.
+
+        Raises
+        ------
+        ValueError
+            If bin edges of non-uniform width are to be expanded
+        """
+        if isinstance(bins, int):
+            self._n_bins = bins
+            self._edges = None
+            if range is not None:
+                self._set_edges(*range)
+        else:
+            self._edges = numpy_1d(bins)
+            self._n_bins = len(self._edges) - 1
+        self._counts = np.zeros(self._n_bins, dtype=int)
+        self.expand = isinstance(bins, int) if expand is None else expand
+        if self.expand and not isinstance(bins, int):
+            widths = np.diff(self._edges)
+            if not np.allclose(widths, widths[0]):
+                raise ValueError("Can only expand bins of uniform width!")
+            self._set_edges(self._edges[0], self._edges[-1])
+
+    @property
+    def counts(self) -> np.ndarray:
+        """Counts of each bin"""
+        return self._counts
+
+    @property
+    def edges(self) -> Optional[np.ndarray]:
+        """Edges of the bins, None if the histogram has not seen any data"""
+        return self._edges
+
+    def update(self, x: array_like) -> "Histogram":
+        """Count a chunk of data (nan values are ignored)"""
+        x = numpy_1d(x)
+        x = x[~np.isnan(x)]
+        if len(x) == 0:
+            return self
+
+        if self._edges is None:
+            self._set_edges(x.min(), x.max())
+        elif self.expand:
+            self._expand(x.min(), x.max())
+
+        self._counts += self._histogram(x)
+        return self
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        """Add the counts of another histogram to this histogram.
+
+        Fixed bins need to be identical. Auto-expanding bins are expanded to
+        cover the bins of the other histogram, whose counts are then added to
+        the bin that contains their center. This is exact if both histograms
+        started from the same bins, i.e. same number of bins and `range`.
+        """
+        if other.edges is None:
+            return self
+        if self._edges is None:
+            self.__dict__.update(copy.deepcopy(other.__dict__))
+            return self
+
+        if not self.expand:
+            if not np.array_equal(self._edges, other.edges):
+                raise ValueError("Can only merge histograms with the same bins!")
+            self._counts += other.counts
+            return self
+
+        if other.expand:
+            self._expand(*other._data_range)
+        else:
+            self._expand(other.edges[0], other.edges[-1])
+        centers = (other.edges[1:] + other.edges[:-1]) / 2
+        counts = self._histogram(centers, weights=other.counts)
+        self._counts += np.around(counts).astype(int)
+        return self
+
+    # -------------------------------------------------------------------------
+    # Private methods: bin edges & counting
+    # -------------------------------------------------------------------------
+
+    def _set_edges(self, lower, upper):
+        """Set initial bin edges, which define the grid for later expansion"""
+        if lower == upper:  # same as np.histogram
+            lower, upper = lower - 0.5, upper + 0.5
+        self._edges = np.linspace(lower, upper, self._n_bins + 1)
+
+        # expanded bins are tracked in units of the initial bin width. They only
+        # depend on the initial edges and the range of data, such that bins of
+        # histograms with the same initial edges remain aligned
+        self._origin, self._width = lower, (upper - lower) / self._n_bins
+        self._lower, self._scale = 0, 1
+        self._data_range = (lower, upper)
+
+    def _histogram(self, x, weights=None):
+        if self.expand:  # use the faster, uniform bins code path of numpy
+            bins, hist_range = self._n_bins, (self._edges[0], self._edges[-1])
+        else:
+            bins, hist_range = self._edges, None
+        counts, _ = np.histogram(x, bins=bins, range=hist_range, weights=weights)
+        return counts
+
+    def _expand(self, x_min, x_max):
+        """Expand bins to cover x_min, x_max, by doubling their width
+
+        The bins are expanded to the smallest width (power of two of the initial
+        width) for which a multiple of the width is a lower edge that covers
+        the initial edges and all data seen.
+        """
+        x_min = min(x_min, self._data_range[0])
+        x_max = max(x_max, self._data_range[1])
+        self._data_range = (x_min, x_max)
+        if x_min >= self._edges[0] and x_max <= self._edges[-1]:
+            return
+
+        unit_min = min(0, np.floor((x_min - self._origin) / self._width))
+        scale = self._scale
+        while True:
+            lower = (unit_min // scale) * scale
+            edges = self._origin + self._width * np.array(
+                [lower, lower + self._n_bins * scale]
+            )
+            if edges[0] <= x_min and edges[1] >= x_max:
+                break
+            scale *= 2
+
+        # old bins are nested in the new bins. empty bins may lie outside of them
+        new_bins = (
+            self._lower + np.arange(self._n_bins) * self._scale - lower
+        ) // scale
+        is_filled = self._counts > 0
+        counts = np.zeros(self._n_bins, dtype=int)
+        np.add.at(counts, new_bins[is_filled].astype(int), self._counts[is_filled])
+
+        self._counts, self._lower, self._scale = counts, lower, scale
+        self._edges = np.linspace(edges[0], edges[1], self._n_bins + 1)
+
+
+@fingerprint.register(Histogram)
+def _(x):
+    return ("Histogram", fingerprint(x.counts), fingerprint(x.edges))
@@ -0,0 +1,260 @@
+"""Module that contains Layout class, for drawing a grid of figures
+"""
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from shellplot.drawing import Frame, canvas_code_points
+from shellplot.figure import Figure
+from shellplot.utils import code_points
+
+Share = Union[bool, str]
+
+
+class Layout:
+    """Grid of figures (panels), which are drawn together.
+
+    >>> layout = subplots(1, 2, sharey=True)
+    >>> layout[0, 0].plot(x, y1)
+    >>> layout[0, 1].plot(x, y2)
+    >>> layout.show()
+
+    The panels are rasterized into one combined character buffer, which is
+    converted to a string in one go. The canvas of each panel is written into
+    its region of the buffer as code points, only the frames around the canvases
+    (axes, legends and titles) are drawn as strings. Panels that share an axis
+    also share the same `shellplot.axis.Axis`, which is fitted once to the data
+    of all of them.
+    """
+
+    def __init__(
+        self,
+        nrows: int = 1,
+        ncols: int = 1,
+        sharex: Share = False,
+        sharey: Share = False,
+        wspace: int = 2,
+        **kwargs,
+    ):
+        """Instantiate a new layout.
+
+        Parameters
+        ----------
+        nrows : int, optional
+            Number of rows of panels, default 1
+        ncols : int, optional
+            Number of columns of panels, default 1
+        sharex : bool or str, optional
+            Whether panels share the x-axis. True or "all" for all panels, "row"
+            or "col" for panels in the same row or column. Default False.
+        sharey : bool or str, optional
+            Whether panels share the y-axis, as for `sharex`
+        wspace : int, optional
+            Number of blank characters between columns of panels, default 2
+        **kwargs
+            Passed to `shellplot.figure.Figure` of each panel, e.g. `figsize`
+        """
+        self.nrows, self.ncols = nrows, ncols
+        self.wspace = wspace
+        self.figures = [[Figure(**kwargs) for _ in range(ncols)] for _ in range(nrows)]
+
+        self._shared = {
+            "x": self._share_axes("x_axis", sharex),
+            "y": self._share_axes("y_axis", sharey),
+        }
+        self._buffer = np.empty((0, 0), dtype=np.uint32)
+        self._rendered = None  # (fingerprint, string) of the last drawn layout
+
+    def __getitem__(self, index: Union[int, Tuple[int, int]]) -> Figure:
+        """Panel at (row, column), or at position index in row-major order"""
+        if isinstance(index, tuple):
+            row, col = index
+            return self.figures[row][col]
+        return self.figures[index // self.ncols][index % self.ncols]
+
+    def __iter__(self):
+        for row in self.figures:
+            yield from row
+
+    def __len__(self):
+        return self.nrows * self.ncols
+
+    def show(self) -> None:
+        """Show the layout by printing to stdout."""
+        print(self.draw())
+
+    def draw(self) -> str:
+        """Draw all panels of the layout as a string
+
+        Returns
+        -------
+        str
+            Ascii string of the layout
+        """
+        if self._rendered is not None and self._rendered[0] == self._fingerprint():
+            return self._rendered[1]
+
+        if all(fig._plot_builder.is_empty() for fig in self):
+            raise ValueError("Cannot plot empty figure!")
+
+        shared = self._fit_shared_axes()
+        frames = [
+            [self._draw_panel(fig, fit=id(fig) not in shared) for fig in row]
+            for row in self.figures
+        ]
+        plt_str = self._join_panels(frames)
+
+        self._rendered = (self._fingerprint(), plt_str)
+        return plt_str
+
+    # -------------------------------------------------------------------------
+    # Private methods: shared axes & rasterizing
+    # -------------------------------------------------------------------------
+
+    def _share_axes(self, axis: str, share: Share) -> List[List[Figure]]:
+        """Groups of panels that share an axis, which are given the same Axis"""
+        if share is True or share == "all":
+            groups = [list(self)]
+        elif share == "row":
+            groups = [list(row) for row in self.figures]
+        elif share == "col":
+            groups = [list(col) for col in zip(*self.figures)]
+        elif share is False:
+            groups = list()
+        else:
+            raise ValueError("Share needs to be one of: True, False, all, row, col")
+
+        for group in groups:
+            for fig in group[1:]:
+                setattr(fig, axis, getattr(group[0], axis))
+        return groups
+
+    def _fit_shared_axes(self) -> set:
+        """Fit the axes of panels with shared axes, returns ids of the panels"""
+        panels = {
+            id(fig): fig
+            for groups in self._shared.values()
+            for group in groups
+            for fig in group
+            if not fig._plot_builder.is_empty()
+        }
+        if any(not fig._plot_builder.is_streamable() for fig in panels.values()):
+            raise ValueError("Shared axes are only supported for `plot` figures!")
+
+        data = {key: fig._plot_builder.fit_data() for key, fig in panels.items()}
+        for dim, (axis, groups) in enumerate(
+            [("x_axis", self._shared["x"]), ("y_axis", self._shared["y"])]
+        ):
+            fitted = set()
+            for group in groups:  # one fit of the shared axis for all panels
+                keys = [id(fig) for fig in group if id(fig) in data]
+                if len(keys) > 0:
+                    self._fit(getattr(group[0], axis), [data[k][dim] for k in keys])
+                    fitted.update(keys)
+            for key in panels.keys() - fitted:  # the axis of this dim is not shared
+                self._fit(getattr(panels[key], axis), [data[key][dim]])
+        return set(panels)
+
+    @staticmethod
+    def _fit(axis, data):
+        axis.reset()
+        axis.fit(np.concatenate(data))
+
+    @staticmethod
+    def _draw_panel(fig: Figure, fit: bool = True) -> Optional[Frame]:
+        if fig._plot_builder.is_empty():
+            return None  # left blank
+        return fig._draw_frame(fit=fit)
+
+    def _join_panels(self, frames) -> str:
+        """Rasterize the frames and canvases of all panels into one buffer, and
+        convert it to a string in one go"""
+        sizes = [
+            [_panel_size(frame, fig) for frame, fig in zip(*rows)]
+            for rows in zip(frames, self.figures)
+        ]
+        heights = [max(height for height, _ in row) for row in sizes]
+        widths = [max(width for _, width in col) for col in zip(*sizes)]
+        col_starts = np.cumsum([0] + [width + self.wspace for width in widths])
+        row_starts = np.cumsum([0] + heights)
+
+        shape = (row_starts[-1], col_starts[-1] - self.wspace)
+        if self._buffer.shape != shape:
+            self._buffer = np.empty(shape, dtype=np.uint32)
+        self._buffer.fill(ord(" "))
+
+        for ii, (frame_row, fig_row) in enumerate(zip(frames, self.figures)):
+            for jj, (frame, fig) in enumerate(zip(frame_row, fig_row)):
+                if frame is not None:
+                    panel = self._buffer[row_starts[ii] :, col_starts[jj] :]
+                    _write_panel(panel, frame, fig)
+
+        return "\n".join(self._buffer.view(f"U{shape[1]}").ravel().tolist())
+
+    def _fingerprint(self):
+        return self.wspace, tuple(fig._fingerprint() for fig in self)
+
+
+def _panel_size(frame: Optional[Frame], fig: Figure) -> Tuple[int, int]:
+    """Number of lines and characters of a drawn panel"""
+    if frame is None:
+        return 0, 0
+    canvas_end = frame.col + fig.canvas.shape[1]
+    width = max(
+        max(map(len, frame.lines)), canvas_end + max(map(len, frame.right), default=0)
+    )
+    return len(frame.lines), width
+
+
+def _write_panel(buffer: np.ndarray, frame: Frame, fig: Figure) -> None:
+    """Write the frame of a panel into the (blank) buffer at its top left, and its
+    canvas straight into the region of the canvas"""
+    width = max(map(len, frame.lines))
+    if width > 0:
+        buffer[: len(frame.lines), :width] = code_points(frame.lines, width)
+
+    n_rows, n_cols = fig.canvas.shape
+    rows = slice(frame.row, frame.row + n_rows)
+    canvas_code_points(
+        fig.canvas,
+        fig.subcanvas,
+        fig.canvas_mode,
+        out=buffer[rows, frame.col : frame.col + n_cols],
+    )
+    right_width = max(map(len, frame.right), default=0)
+    if right_width > 0:
+        right_start = frame.col + n_cols
+        buffer[rows, right_start : right_start + right_width] = code_points(
+            frame.right, right_width
+        )
+
+
+def subplots(
+    nrows: int = 1,
+    ncols: int = 1,
+    sharex: Share = False,
+    sharey: Share = False,
+    **kwargs,
+) -> Layout:
+    """Create a grid layout of figures, see `shellplot.layout.Layout`
+
+    Parameters
+    ----------
+    nrows : int, optional
+        Number of rows of panels, default 1
+    ncols : int, optional
+        Number of columns of panels, default 1
+    sharex : bool or str, optional
+        Whether panels share the x-axis. True or "all" for all panels, "row" or
+        "col" for panels in the same row or column. Default False.
+    sharey : bool or str, optional
+        Whether panels share the y-axis, as for `sharex`
+    **kwargs
+        Passed to `shellplot.layout.Layout`, e.g. `figsize` of the panels
+
+    Returns
+    -------
+    Layout
+        The layout, whose panels are indexed by [row, column]
+    """
+    return Layout(nrows=nrows, ncols=ncols, sharex=sharex, sharey=sharey, **kwargs)
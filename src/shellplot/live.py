@@ -0,0 +1,144 @@
+"""Live display of figures in the terminal, redrawn in place
+
+>>> with fig.live(fps=10) as live:
+...     for x, y in stream:
+...         fig.append(x, y)
+...         live.refresh()
+
+Rather than printing every frame, only the cells that changed since the last
+frame are written, by moving the cursor with ANSI escape codes. Refreshes are
+throttled to the target frames per second, i.e. the figure is only drawn (and
+written) if the last frame is old enough.
+"""
+import sys
+import time
+from typing import Optional, TextIO
+
+import numpy as np
+
+from shellplot.utils import code_points
+
+_GAP = 8  # changed cells closer than this are written in one go (cursor moves
+# take ~6 bytes, such that writing the unchanged cells in between is cheaper)
+
+
+class LiveDisplay:
+    """Displays a figure (or any object with a `draw` method) in place.
+
+    The rows of the last frame are kept, as 2d array of code points. Each
+    refresh writes runs of changed cells only, whose rows and columns are
+    reached by relative cursor moves from the line below the frame.
+    """
+
+    def __init__(
+        self,
+        fig,
+        fps: Optional[float] = 10,
+        out: Optional[TextIO] = None,
+        ansi: Optional[bool] = None,
+    ):
+        """Instantiate a new live display.
+
+        Parameters
+        ----------
+        fig : Figure
+            The figure to display
+        fps : Optional[float], optional
+            Maximum number of frames per second, default 10. If None, every
+            refresh draws a frame.
+        out : Optional[TextIO], optional
+            Output stream, default None (stdout)
+        ansi : Optional[bool], optional
+            Whether to redraw in place, via ANSI escape codes. Default None, i.e.
+            if out is a terminal. Otherwise, every frame is written in full.
+        """
+        self.fig = fig
+        self.fps = fps
+        self.out = out or sys.stdout
+        self.ansi = self.out.isatty() if ansi is None else ansi
+        self.bytes_written = 0  # e.g. to monitor terminal I/O
+        self._frame = None  # code points of the displayed frame
+        self._last_refresh = -np.inf
+        self._pending = False  # whether there was a refresh that is not shown
+
+    def __enter__(self) -> "LiveDisplay":
+        if self.ansi:
+            self._write("\x1b[?25l")  # hide cursor
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.close()
+        return False
+
+    def refresh(self, force: bool = False) -> bool:
+        """Draw the figure and display the changes since the last frame, unless
+        the last frame is too recent (then the refresh is pending, and shown by
+        the next refresh or on close).
+
+        Parameters
+        ----------
+        force : bool, optional
+            Whether to display the figure regardless of the fps, default False
+
+        Returns
+        -------
+        bool
+            Whether a frame was drawn
+        """
+        now = time.monotonic()
+        if not force and self.fps and now - self._last_refresh < 1 / self.fps:
+            self._pending = True
+            return False
+        self._last_refresh = now
+        self._pending = False
+
+        lines = self.fig.draw().split("\n")
+        if not self.ansi:
+            self._write("\n".join(lines) + "\n")
+            return True
+
+        frame = code_points(lines, max(1, max(map(len, lines))))
+        if self._frame is None:
+            self._write("\n".join(lines) + "\n")
+        elif self._frame.shape != frame.shape:
+            self._write(f"\x1b[{len(self._frame)}F\x1b[J" + "\n".join(lines) + "\n")
+        else:
+            self._write(_diff(self._frame, frame))
+        self._frame = frame
+        return True
+
+    def close(self) -> None:
+        """Display a pending refresh, and restore the cursor"""
+        if self._pending:
+            self.refresh(force=True)
+        if self.ansi:
+            self._write("\x1b[?25h")  # show cursor
+
+    def _write(self, text: str) -> None:
+        self.out.write(text)
+        self.out.flush()
+        self.bytes_written += len(text.encode())
+
+
+def _diff(old: np.ndarray, new: np.ndarray) -> str:
+    """ANSI codes to change the old frame into the new frame (of same shape),
+    with the cursor starting and ending on the line below the frames"""
+    changed = old != new
+    rows = np.flatnonzero(changed.any(axis=1))
+    if len(rows) == 0:
+        return ""
+
+    # rows are in ascending order, i.e. the cursor moves up to the first changed
+    # row (from the line below the frame), and then down
+    codes = [f"\x1b[{len(old) - rows[0]}A"]
+    for ii, row in enumerate(rows):
+        if ii > 0:
+            codes.append(f"\x1b[{row - rows[ii - 1]}B")
+
+        cols = np.flatnonzero(changed[row])
+        runs = np.split(cols, np.flatnonzero(np.diff(cols) > _GAP) + 1)
+        for run in runs:
+            cells = new[row, run[0] : run[-1] + 1]
+            codes.append(f"\x1b[{run[0] + 1}G" + cells.view(f"U{len(cells)}")[0])
+    codes.append(f"\x1b[{len(old) - row}B\r")
+    return "".join(codes)
@@ -0,0 +1,162 @@
+"""Opt-in profiling of the stages of plotting and drawing figures
+
+Stages (e.g. fitting the axes, drawing the canvas) record their wall time, the
+number of elements they processed and the bytes they allocated, while a profile
+is active:
+
+>>> with profile() as report:
+...     fig.plot(x, y)
+...     fig.draw()
+>>> print(report)
+
+Alternatively, a single draw can be profiled via `Figure.draw(profile=True)`,
+or every draw by registering a hook via `shellplot.register_profile_hook`.
+"""
+import contextlib
+import threading
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Optional
+
+from shellplot._config import _profile_hooks
+
+_NULL_STAGE = contextlib.nullcontext()
+
+_state = threading.local()  # active report & stack of stages, per thread
+
+
+@dataclass
+class StageRecord:
+    """Aggregated measurements of a profiled stage"""
+
+    stage: str
+    calls: int = 0
+    seconds: float = 0.0
+    count: Optional[int] = None  # number of processed elements, if known
+    bytes: Optional[int] = None  # peak bytes allocated, if memory is traced
+
+
+@dataclass
+class ProfileReport:
+    """Report of all stages recorded while profiling.
+
+    Nested stages are named by their path, e.g. `create/plot/line` is the line
+    drawing within the `_plot` call of creating a figure.
+    """
+
+    stages: Dict[str, StageRecord] = field(default_factory=dict)
+    seconds: float = 0.0  # total wall time of the profile
+
+    def to_dict(self) -> Dict:
+        """Report as dict, e.g. for forwarding to a metrics system"""
+        return {
+            "seconds": self.seconds,
+            "stages": [asdict(record) for record in self.stages.values()],
+        }
+
+    def _record(self, stage, seconds, count=None, n_bytes=None):
+        record = self.stages.setdefault(stage, StageRecord(stage))
+        record.calls += 1
+        record.seconds += seconds
+        if count is not None:
+            record.count = (record.count or 0) + int(count)
+        if n_bytes is not None:
+            record.bytes = max(record.bytes or 0, n_bytes)
+
+    def __str__(self):
+        lines = [f"{'stage':<28}{'calls':>6}{'ms':>10}{'count':>12}{'KiB':>10}"]
+        for record in self.stages.values():
+            count = "" if record.count is None else record.count
+            kib = "" if record.bytes is None else f"{record.bytes / 1024:.1f}"
+            lines.append(
+                f"{record.stage:<28}{record.calls:>6}{1e3 * record.seconds:>10.3f}"
+                f"{count:>12}{kib:>10}"
+            )
+        lines.append(f"{'total':<28}{'':>6}{1e3 * self.seconds:>10.3f}")
+        return "\n".join(lines)
+
+
+@contextlib.contextmanager
+def profile(memory: bool = True):
+    """Profile all stages within the context, yields a `ProfileReport`
+
+    If a profile is active already, its report is used (i.e. profiles are not
+    nested). Registered profile hooks are called with the finished report.
+
+    Parameters
+    ----------
+    memory : bool, optional
+        Whether to trace allocated bytes via `tracemalloc` (Python >= 3.9),
+        default True. This slows down pure Python code while profiling.
+    """
+    if is_profiling():
+        yield _state.report
+        return
+
+    report = _state.report = ProfileReport()
+    _state.stack = list()
+    memory = memory and hasattr(tracemalloc, "reset_peak")
+    trace = memory and not tracemalloc.is_tracing()
+    if trace:
+        tracemalloc.start()
+    _state.memory = memory
+
+    start = time.perf_counter()
+    try:
+        yield report
+    finally:
+        report.seconds = time.perf_counter() - start
+        if trace:
+            tracemalloc.stop()
+        _state.report = None
+
+    for hook in list(_profile_hooks):
+        hook(report)
+
+
+def is_profiling() -> bool:
+    return getattr(_state, "report", None) is not None
+
+
+def stage(name: str, count: Optional[int] = None):
+    """Context of a stage, which is recorded if a profile is active"""
+    if not is_profiling():
+        return _NULL_STAGE
+    return _Stage(name, count)
+
+
+class _Stage:
+    """Records wall time and peak allocated bytes of a stage. The peak of traced
+    memory is reset for each stage, and propagated to the enclosing stage."""
+
+    def __init__(self, name, count=None):
+        self.name = name
+        self.count = count
+
+    def __enter__(self):
+        stack = _state.stack
+        if _state.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if len(stack) > 0:
+                stack[-1].peak = max(stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+            self.start_bytes, self.peak = current, current
+        self.path = "/".join([s.name for s in stack] + [self.name])
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.start
+        stack = _state.stack
+        stack.pop()
+        n_bytes = None
+        if _state.memory:
+            peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            n_bytes = peak - self.start_bytes
+            if len(stack) > 0:
+                stack[-1].peak = max(stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+        _state.report._record(self.path, seconds, self.count, n_bytes)
+        return False
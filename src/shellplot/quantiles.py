@@ -0,0 +1,129 @@
+"""Module that contains QuantileSketch class, for approximate quantiles of streams
+"""
+from typing import Optional
+
+import numpy as np
+
+from shellplot.utils import array_like, fingerprint, numpy_1d
+
+
+class QuantileSketch:
+    """Mergeable sketch for approximate quantiles of large or streaming data.
+
+    This is a KLL sketch (Karnin, Lang & Liberty, 2016): data is kept in a
+    hierarchy of compactors, where items on level h represent 2^h data points.
+    When a compactor is full, it is sorted and every other item is promoted to
+    the next level. The memory only grows logarithmically with the number of
+    data points, while quantiles have a bounded rank error:
+
+    >>> sketch = QuantileSketch(eps=0.01)
+    >>> for chunk in stream:
+    ...     sketch.update(chunk)
+    >>> sketch.quantile([0.25, 0.5, 0.75])
+
+    Sketches of different shards can be combined via `.merge`, and drawn by
+    `Figure.boxplot`. The minimum and maximum are always exact.
+    """
+
+    def __init__(self, eps: float = 0.01, seed: Optional[int] = None):
+        """Instantiate a new quantile sketch.
+
+        Parameters
+        ----------
+        eps : float, optional
+            Approximate bound on the rank error of quantiles (with 99%
+            confidence), default 0.01. Smaller values need more memory.
+        seed : Optional[int], optional
+            Seed for the random compaction offsets, default None
+        """
+        self.eps = eps
+        # empirical relation between k and rank error, as in Apache DataSketches
+        self.k = max(8, int(np.ceil((2.296 / eps) ** (1 / 0.9723))))
+        self.n = 0
+        self.min = None
+        self.max = None
+        self._compactors = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, x: array_like) -> "QuantileSketch":
+        """Add a chunk of data to the sketch (nan values are ignored)"""
+        x = numpy_1d(x)
+        x = x[~np.isnan(x)]
+        if len(x) == 0:
+            return self
+
+        self._update_limits(x.min(), x.max(), len(x))
+        self._compactors[0] = np.concatenate([self._compactors[0], x])
+        self._compress()
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Add the data of another sketch to this sketch"""
+        if other.n == 0:
+            return self
+
+        self._update_limits(other.min, other.max, other.n)
+        for level, items in enumerate(other._compactors):
+            if level == len(self._compactors):
+                self._compactors.append(np.empty(0))
+            self._compactors[level] = np.concatenate([self._compactors[level], items])
+        self._compress()
+        return self
+
+    def quantile(self, q: array_like) -> np.ndarray:
+        """Approximate quantiles q of the data, which lie in [0, 1]"""
+        if self.n == 0:
+            raise ValueError("Cannot compute quantiles of empty sketch!")
+        q = np.asarray(q, dtype=float)
+
+        items = np.concatenate(self._compactors)
+        weights = np.concatenate(
+            [np.full(len(c), 2**level) for level, c in enumerate(self._compactors)]
+        )
+        order = np.argsort(items, kind="stable")
+        items, cum_weights = items[order], np.cumsum(weights[order])
+
+        ranks = q * cum_weights[-1]
+        quantiles = items[
+            np.minimum(np.searchsorted(cum_weights, ranks), len(items) - 1)
+        ]
+        quantiles = np.where(q <= 0, self.min, quantiles)
+        return np.where(q >= 1, self.max, quantiles)
+
+    # -------------------------------------------------------------------------
+    # Private methods: compaction
+    # -------------------------------------------------------------------------
+
+    def _update_limits(self, x_min, x_max, n):
+        self.min = x_min if self.min is None else min(self.min, x_min)
+        self.max = x_max if self.max is None else max(self.max, x_max)
+        self.n += n
+
+    def _capacity(self, level):
+        depth = len(self._compactors) - 1 - level
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        """Compact all levels that exceed their capacity"""
+        level = 0
+        while level < len(self._compactors):
+            if len(self._compactors[level]) < self._capacity(level):
+                level += 1
+                continue
+
+            if level == len(self._compactors) - 1:
+                self._compactors.append(np.empty(0))
+            items = np.sort(self._compactors[level])
+            n_kept = len(items) % 2  # an odd item out stays on its level
+            offset = self._rng.integers(2)
+
+            self._compactors[level] = items[len(items) - n_kept :]
+            self._compactors[level + 1] = np.concatenate(
+                [self._compactors[level + 1], items[offset : len(items) - n_kept : 2]]
+            )
+            level = 0  # capacities change with the number of levels
+
+
+@fingerprint.register(QuantileSketch)
+def _(x):
+    return ("QuantileSketch", x.n, fingerprint(x._compactors))
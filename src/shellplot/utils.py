@@ -1,20 +1,27 @@
 """Utility functions
 """
+import hashlib
+import itertools
 import math
+import numbers
 import os
+import sys
 from functools import singledispatch
-from typing import Any
+from typing import TYPE_CHECKING, Any, Hashable, List
 
 import numpy as np
-import pandas as pd
 
-__all__ = ["load_dataset"]
+if TYPE_CHECKING:
+    import pandas
+
+__all__ = ["load_dataset", "ChunkedArray"]
 
-ANCHOR_DATETIME = np.datetime64("1970-01-01")  # I remember the day well
 array_like = Any
 
+_chunked_array_ids = itertools.count()  # unique ids, as id() can be reused
+
 
-def load_dataset(name: str) -> pd.DataFrame:
+def load_dataset(name: str) -> "pandas.DataFrame":
     """Load dataset from shellplot library
 
     Parameters
@@ -32,6 +39,8 @@ def load_dataset(name: str) -> pd.DataFrame:
     module_path = os.path.dirname(__file__)
     dataset_path = os.path.join(module_path, "datasets", f"{name}.csv")
 
+    import pandas as pd
+
     return pd.read_csv(dataset_path)
 
 
@@ -74,13 +83,97 @@ def _round_to_decimals(n, decimals, round_func):
         return round_func(n * multiplier) / multiplier
 
 
-def timedelta_round(x):
-    """Given a numpy timedelta, find the largest time unit without changing value"""
-    units = ["Y", "M", "D", "h", "m", "s", "ms", "us", "ns"]
-    for unit in units:
-        x_rounded = x.astype(f"timedelta64[{unit}]")
-        if x_rounded == x:  # TODO: apparently raises a # WARNING: ?
-            return unit
+class ChunkedArray:
+    """1d array-like that is only ever accessed in chunks.
+
+    This allows to plot data that does not fit into memory, e.g. from a
+    `np.memmap` or from iterators over the chunks of a file. Please note that
+    the chunks are iterated over at least twice when plotting (once to fit the
+    axes, once to draw), hence one-shot iterators are not supported.
+    """
+
+    def __init__(self, chunks, chunksize: int = 2**20):
+        """Instantiate a new chunked array.
+
+        Parameters
+        ----------
+        chunks : np.ndarray, sequence of array-like or callable
+            Either an array that is read in slices of `chunksize` (e.g. a
+            `np.memmap`), a sequence of 1d chunks, or a function that returns a
+            new iterator over 1d chunks on every call (e.g. a generator function)
+        chunksize : int, optional
+            Size of the slices that arrays are read in, default 2**20
+        """
+        if (
+            not callable(chunks)
+            and not isinstance(chunks, np.ndarray)
+            and iter(chunks) is chunks
+        ):
+            raise TypeError(
+                "Chunks can only be iterated over once! Please provide a function "
+                "that returns an iterator over the chunks instead."
+            )
+        self._sources = [chunks]
+        self.chunksize = chunksize
+        self._id = next(_chunked_array_ids)
+
+    def __iter__(self):
+        for source in self._sources:
+            if isinstance(source, np.ndarray):
+                for start in range(0, len(source), self.chunksize):
+                    yield np.asarray(source[start : start + self.chunksize])
+            else:
+                chunks = source() if callable(source) else source
+                for chunk in chunks:
+                    yield numpy_1d(chunk)
+
+    def concatenate(self, arrays) -> "ChunkedArray":
+        """Return a new chunked array, with arrays appended to the end"""
+        chunked_array = ChunkedArray(self._sources[0], chunksize=self.chunksize)
+        chunked_array._sources = self._sources + [numpy_1d(x) for x in arrays]
+        return chunked_array
+
+
+def chunked(x) -> ChunkedArray:
+    """Convert array-like to chunked array"""
+    if isinstance(x, ChunkedArray):
+        return x
+    return ChunkedArray(numpy_1d(x))
+
+
+def is_chunked(x) -> bool:
+    """Whether x should be accessed in chunks, i.e. is chunked or memory mapped"""
+    return isinstance(x, ChunkedArray) or (isinstance(x, np.memmap) and x.ndim == 1)
+
+
+def zip_chunks(*arrays):
+    """Iterate over aligned chunks of (chunked) arrays of the same length"""
+    iterators = [iter(chunked(x)) for x in arrays]
+    buffers = [np.empty(0)] * len(arrays)
+
+    while True:
+        for ii, iterator in enumerate(iterators):
+            while len(buffers[ii]) == 0:
+                chunk = next(iterator, None)
+                if chunk is None:
+                    if any(len(buffer) > 0 for buffer in buffers) or any(
+                        len(next(other, [])) > 0 for other in iterators
+                    ):
+                        raise ValueError("Chunked arrays need to be of same length!")
+                    return
+                buffers[ii] = chunk
+
+        size = min(len(buffer) for buffer in buffers)
+        yield tuple(buffer[:size] for buffer in buffers)
+        buffers = [buffer[size:] for buffer in buffers]
+
+
+def code_points(lines: List[str], width: int) -> np.ndarray:
+    """Lines as 2d array of unicode code points, padded with blanks to width"""
+    code_points = np.array(lines, dtype=f"U{width}").view(np.uint32)
+    code_points = code_points.reshape(len(lines), width)
+    code_points[code_points == 0] = ord(" ")
+    return code_points
 
 
 def remove_any_nan(x, y):
@@ -89,9 +182,44 @@ def remove_any_nan(x, y):
     return x[~is_any_nan], y[~is_any_nan]
 
 
+def factorize(x: np.ndarray):
+    """Integer codes of the values of x, and the sorted unique values
+
+    Missing values (nan or NaT) get the code -1, and are not among the unique
+    values. If pandas has been imported, its (hash based) factorize is used.
+    """
+    if "pandas" in sys.modules:
+        import pandas as pd
+
+        codes, values = pd.factorize(x, sort=True)
+        return codes, np.asarray(values)
+
+    values, codes = np.unique(x, return_inverse=True)
+    codes = codes.reshape(-1)
+    if values.dtype.kind in "fcmM" and len(values) > 0 and np.isnan(values[-1]):
+        # nan (or NaT) sorts last, possibly more than once
+        n_values = np.argmax(np.isnan(values))
+        codes[codes >= n_values] = -1
+        values = values[:n_values]
+    return codes, values
+
+
+def group_slices(codes: np.ndarray, n_groups: int):
+    """Order that sorts the codes (stable), and the slice of each group in it.
+    Negative codes (missing values) are dropped."""
+    if n_groups < 2**15:  # numpy sorts 16 bit integers by radix sort, in O(N)
+        codes = codes.astype(np.int16)
+    order = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes + 1, minlength=n_groups + 1)
+    bounds = np.cumsum(counts)  # the first count is of the missing values
+    return order, [slice(bounds[ii], bounds[ii + 1]) for ii in range(n_groups)]
+
+
 @singledispatch
 def numpy_2d(x):
     """Reshape and transform various array-like inputs to 2d np arrays"""
+    if _register_pandas():
+        return numpy_2d(x)
 
 
 @numpy_2d.register
@@ -104,17 +232,6 @@ def _(x: np.ndarray):
         raise ValueError("Array dimensions need to be <= 2!")
 
 
-@numpy_2d.register
-def _(x: pd.DataFrame):
-    return x.to_numpy().transpose()
-
-
-@numpy_2d.register(pd.Series)
-@numpy_2d.register(pd.Index)
-def _(x):
-    return x.to_numpy()[np.newaxis]
-
-
 @numpy_2d.register
 def _(x: list):
     if isinstance(x[0], np.ndarray):
@@ -128,6 +245,8 @@ def _(x: list):
 @singledispatch
 def numpy_1d(x):
     """Reshape and transform various array-like inputs to 1d np arrays"""
+    if _register_pandas():
+        return numpy_1d(x)
 
 
 @numpy_1d.register(np.ndarray)
@@ -135,17 +254,6 @@ def _(x):
     return x
 
 
-@numpy_1d.register(pd.Series)
-@numpy_1d.register(pd.Index)
-def _(x):
-    return x.to_numpy()
-
-
-@numpy_1d.register(pd.DataFrame)
-def _(x):
-    return x.to_numpy().squeeze()
-
-
 @numpy_1d.register(list)
 @numpy_1d.register(tuple)
 def _(x):
@@ -153,6 +261,8 @@ def _(x):
 
 
 @numpy_1d.register(str)
+@numpy_1d.register(numbers.Number)
+@numpy_1d.register(np.generic)
 def _(x):  # TODO: this should be any non-iterable
     return np.array([x])
 
@@ -160,28 +270,113 @@ def _(x):  # TODO: this should be any non-iterable
 @singledispatch
 def get_label(x):
     """Try to get names out of array-like inputs"""
-    pass
+    if _register_pandas():
+        return get_label(x)
 
 
-@get_label.register(pd.DataFrame)
-def _(x):
-    return list(x)
+@singledispatch
+def get_index(x):
+    """Try to get index out of array-like inputs"""
+    if _register_pandas():
+        return get_index(x)
+
+
+@singledispatch
+def fingerprint(x) -> Hashable:
+    """Hashable fingerprint of the content of x, used to cache drawn figures
+
+    Arrays are fingerprinted by hashing their content, containers by the
+    fingerprints of their items. Other hashable objects are their own
+    fingerprint, while fingerprints of unknown objects never compare equal.
+    """
+    if _register_pandas():
+        return fingerprint(x)
+    try:
+        hash(x)
+    except TypeError:
+        return object()
+    return x
 
 
-@get_label.register(pd.Series)
+@fingerprint.register(np.ndarray)
 def _(x):
-    return x.name
+    if x.dtype.hasobject:
+        return ("ndarray", x.shape, tuple(fingerprint(v) for v in x.ravel().tolist()))
+    data = np.ascontiguousarray(x).view(np.uint8)
+    return ("ndarray", x.dtype.str, x.shape, hashlib.sha1(data).hexdigest())
 
 
-@singledispatch
-def get_index(x):
-    """Try to get index out of array-like inputs"""
+@fingerprint.register(list)
+@fingerprint.register(tuple)
+def _(x):
+    return (type(x).__name__, tuple(fingerprint(v) for v in x))
 
 
-@get_index.register(pd.Series)
-@get_index.register(pd.DataFrame)
+@fingerprint.register(dict)
 def _(x):
-    return np.array(x.index)
+    return ("dict", tuple((k, fingerprint(v)) for k, v in x.items()))
+
+
+@fingerprint.register(ChunkedArray)
+def _(x):  # chunks are not read, their content is assumed not to change
+    return ("ChunkedArray", x._id)
+
+
+# -----------------------------------------------------------------------------
+# Pandas support, registered lazily to not import pandas with shellplot
+# -----------------------------------------------------------------------------
+
+_pandas_registered = False
+
+
+def _register_pandas() -> bool:
+    """Register the pandas handlers of the dispatch functions above, once pandas
+    has been imported (i.e. pandas objects can exist). This is called by their
+    fallbacks, and returns whether handlers were newly registered, in which case
+    the call should be dispatched again."""
+    global _pandas_registered
+    if _pandas_registered or "pandas" not in sys.modules:
+        return False
+
+    import pandas as pd
+
+    numpy_2d.register(pd.DataFrame, lambda x: x.to_numpy().transpose())
+    numpy_2d.register(pd.Series, lambda x: x.to_numpy()[np.newaxis])
+    numpy_2d.register(pd.Index, lambda x: x.to_numpy()[np.newaxis])
+
+    numpy_1d.register(pd.Series, lambda x: x.to_numpy())
+    numpy_1d.register(pd.Index, lambda x: x.to_numpy())
+    numpy_1d.register(pd.DataFrame, lambda x: x.to_numpy().squeeze())
+
+    get_label.register(pd.DataFrame, lambda x: list(x))
+    get_label.register(pd.Series, lambda x: x.name)
+
+    get_index.register(pd.Series, lambda x: np.array(x.index))
+    get_index.register(pd.DataFrame, lambda x: np.array(x.index))
+
+    fingerprint.register(pd.Series, _fingerprint_series)
+    fingerprint.register(pd.Index, _fingerprint_index)
+    fingerprint.register(pd.DataFrame, _fingerprint_dataframe)
+
+    _pandas_registered = True
+    return True
+
+
+def _fingerprint_series(x):
+    return ("Series", x.name, fingerprint(x.to_numpy()), fingerprint(x.index))
+
+
+def _fingerprint_index(x):
+    return ("Index", x.name, fingerprint(x.to_numpy()))
+
+
+def _fingerprint_dataframe(x):
+    return (
+        "DataFrame",
+        tuple(x.columns),
+        fingerprint(x.to_numpy()),
+        fingerprint(x.index),
+    )
 
 
 def is_datetime(x):
@@ -193,13 +388,24 @@ def is_datetime(x):
 
 
 def to_numeric(x):
-    """Convert np array to numeric values"""
+    """Convert np array to numeric values, i.e. datetimes (and timedeltas) to
+    int64 nanoseconds since the epoch. These are a view of datetimes that are in
+    nanoseconds already, see `as_nanoseconds`."""
     x = numpy_1d(x)
-    if is_datetime(x):
-        return x.astype("datetime64[ns]") - ANCHOR_DATETIME
+    if x.dtype.kind in np.typecodes["Datetime"]:
+        return as_nanoseconds(x).view(np.int64)
     else:
         return x
 
 
+def as_nanoseconds(x):
+    """Datetimes (and timedeltas) in nanoseconds, without copy if they are in
+    nanoseconds already. Other arrays are returned as they are."""
+    if x.dtype.kind in np.typecodes["Datetime"]:
+        return x.astype(f"{x.dtype.kind}8[ns]", copy=False)
+    return x
+
+
 def to_datetime(x):
-    return x + ANCHOR_DATETIME
+    """Convert numeric values (int64 nanoseconds since the epoch) to datetimes"""
+    return np.asarray(x, dtype=np.int64).view("datetime64[ns]")
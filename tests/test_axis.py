@@ -49,6 +49,49 @@ def test_axis_transform(x, expected_display_x):
     np.testing.assert_array_equal(display_x, expected_display_x)
 
 
+@pytest.mark.parametrize(
+    "subcells, expected_display_x",
+    [
+        (1, [0, 1, 1, 5]),
+        (2, [1, 2, 3, 11]),
+        (4, [2, 4, 7, 22]),
+    ],
+)
+def test_axis_transform_subcells(subcells, expected_display_x):
+    """Sub-cells divide each display cell, which is centered on its coordinate"""
+    axis = Axis(display_length=6)
+    axis.limits = (0, 5)
+    display_x = axis.transform(np.array([0.1, 0.6, 1.4, 5.2]), subcells=subcells)
+
+    np.testing.assert_array_equal(display_x, expected_display_x)
+
+
+@pytest.mark.parametrize("subcells", [1, 2, 4])
+@pytest.mark.parametrize(
+    "x",
+    [
+        np.array([-1.0, 0.1, 0.6, 1.4, 2.5, 5.2, 5.8, 9]),
+        np.arange(-2, 8),
+        np.array([[0.1, 6.0], [2.5, 3.5]]),
+    ],
+)
+def test_axis_display_coordinates(x, subcells):
+    axis = Axis(display_length=6)
+    axis.limits = (0, 5)
+    out = np.empty(x.shape)
+    display_x, visible = axis.display_coordinates(x, subcells=subcells, out=out)
+
+    scaled = x * axis.display_max / 5
+    if subcells == 1:
+        expected = np.around(scaled).astype(int)
+    else:
+        expected = np.floor((scaled + 0.5) * subcells).astype(int)
+    n_subcells = (axis.display_max + 1) * subcells
+    np.testing.assert_array_equal(display_x, expected)
+    np.testing.assert_array_equal(visible, (expected >= 0) & (expected < n_subcells))
+    np.testing.assert_array_equal(out, display_x)  # the buffer was used
+
+
 @pytest.mark.parametrize(
     "axis, expected_n_ticks",
     [
@@ -100,6 +143,96 @@ def test_axis_datetime_ticks(limits, n_ticks, expected_labels):
     assert list(ticklabels) == list(expected_labels)
 
 
+@pytest.mark.parametrize(
+    "limits, expected_labels",
+    [
+        (
+            ("2001-01-01T00:00", "2001-01-01T07:13"),
+            ["2001-01-01T00", "2001-01-01T02", "2001-01-01T04", "2001-01-01T06"],
+        ),
+        (
+            ("2001-02-10", "2002-09-01"),
+            ["2001-07", "2002-01", "2002-07"],
+        ),
+        (
+            ("1958-06-01", "2011-01-01"),
+            ["1960", "1980", "2000"],
+        ),
+        (
+            ("1705-01-01", "1995-01-01"),
+            ["1800", "1900"],
+        ),
+        (
+            ("1905-01-01", "2140-01-01"),
+            ["1950", "2000", "2050", "2100"],
+        ),
+        (
+            ("2019-12-20", "2020-02-10"),
+            ["2019-12-23", "2020-01-06", "2020-01-20", "2020-02-03"],
+        ),
+        (
+            ("2019-12-20", "2020-01-20"),
+            ["2019-12-23", "2019-12-30", "2020-01-06", "2020-01-13", "2020-01-20"],
+        ),
+        (
+            ("2001-01-01T00:00:00.010", "2001-01-01T00:00:00.090"),
+            [f"2001-01-01T00:00:00.0{ms}" for ms in range(20, 100, 20)],
+        ),
+    ],
+)
+def test_axis_datetime_ticks_are_calendar_aligned(limits, expected_labels):
+    axis = Axis(display_length=79)
+    axis.nticks = 6
+    axis.limits = np.array(limits, dtype="datetime64[ns]")
+    axis._is_datetime = True
+
+    assert list(axis.ticklabels) == expected_labels
+
+
+@pytest.mark.parametrize(
+    "x, expected_limits",
+    [
+        (("2019-12-20", "2020-03-01"), ("2019-12-09", "2020-03-02")),  # Mondays
+        (("1705-03-01", "1990-01-01"), ("1700-01-01", "2000-01-01")),
+        (("1921-03-01", "2021-07-01"), ("1920-01-01", "2040-01-01")),
+    ],
+)
+def test_axis_datetime_limits_are_calendar_aligned(x, expected_limits):
+    axis = Axis(display_length=79).fit(np.array(x, dtype="datetime64[ns]"))
+    expected_limits = np.array(expected_limits, dtype="datetime64[ns]")
+
+    np.testing.assert_array_equal(axis.limits, expected_limits.view(np.int64))
+
+
+def test_axis_datetime_ticks_fall_back_to_limits():
+    axis = Axis(display_length=79)
+    axis.nticks = 2  # the week step has no Monday within the limits
+    axis.limits = np.array(["2001-01-02", "2001-01-06"], dtype="datetime64[ns]")
+    axis._is_datetime = True
+
+    assert list(axis.ticklabels) == ["2001-01-02", "2001-01-06"]
+
+
+@pytest.mark.parametrize(
+    "lower, span",
+    [
+        (1651182162470025678, 10**12),  # rounding via float misses the data
+        (1654959368767305952, 10**4),
+        (1694864944713724397, 200),  # rounding to decimals overflows
+        (-1, 2),
+    ],
+)
+def test_axis_datetime_limits_cover_data(lower, span):
+    x = np.array([lower, lower + span]).astype("datetime64[ns]")
+    axis = Axis(display_length=79).fit(x)
+    lower, upper = axis.limits
+
+    assert isinstance(lower, int) and isinstance(upper, int)
+    assert lower <= x.view(np.int64).min() and upper >= x.view(np.int64).max()
+    assert not axis.exceeds_limits(x)
+    assert len(axis.ticks) > 0
+
+
 @pytest.mark.parametrize(
     # fmt: off
     "limits,ticks,expected_tick_labels",
@@ -216,3 +349,17 @@ def test_axis_ticks_set_updates_ticklabels():
 
     axis.ticks = (0.0, 0.2)
     np.testing.assert_array_equal(axis.ticklabels, np.array([0.0, 0.2]))
+
+
+def test_axis_reset_keeps_set_limits():
+    axis = Axis(display_length=80)
+    axis.fit(np.array([0, 10]))
+    assert axis.exceeds_limits(np.array([20]))
+
+    axis.reset()
+    assert axis.limits is None
+
+    axis.limits = (0, 10)
+    axis.reset()
+    assert not axis.exceeds_limits(np.array([20]))
+    np.testing.assert_array_equal(axis.limits, np.array([0, 10]))
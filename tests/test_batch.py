@@ -0,0 +1,52 @@
+"""Test batch rendering of plots
+"""
+import pytest
+
+import numpy as np
+
+from shellplot.batch import PlotSpec, _share_arrays, render_many
+from shellplot.plots import hist, plot
+
+
+@pytest.fixture
+def specs():
+    x = np.linspace(0, 1, 100)
+    specs = [
+        PlotSpec("plot", (x, np.sin(x * ii)), {"label": "sin"}) for ii in range(1, 6)
+    ]
+    specs.append(PlotSpec("hist", (np.cos(x),), {"bins": 5, "figsize": (30, 10)}))
+    return specs
+
+
+@pytest.fixture
+def expected(specs):
+    x = specs[0].args[0]
+    expected = [
+        plot(x, np.sin(x * ii), label="sin", return_type="str") for ii in range(1, 6)
+    ]
+    expected.append(hist(np.cos(x), bins=5, figsize=(30, 10), return_type="str"))
+    return expected
+
+
+@pytest.mark.parametrize(
+    "workers, executor", [(1, "process"), (2, "thread"), (2, "process")]
+)
+def test_render_many(specs, expected, workers, executor):
+    assert render_many(specs, workers=workers, executor=executor) == expected
+
+
+def test_render_many_invalid_executor(specs):
+    with pytest.raises(ValueError):
+        render_many(specs, executor="cluster")
+
+
+def test_share_arrays_copies_arrays_once(specs):
+    shm, shared_specs = _share_arrays(specs)
+    try:
+        x_refs = {spec.args[0] for spec in shared_specs[:-1]}
+        assert len(x_refs) == 1
+        assert shm.size >= 7 * specs[0].args[0].nbytes
+        assert shared_specs[0].kwargs == {"label": "sin"}
+    finally:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,181 @@
+"""Test the command line interface
+"""
+import io
+import queue
+import sys
+import threading
+import time
+
+import pytest
+
+import numpy as np
+
+from shellplot.cli import (
+    ColumnParser,
+    _enqueue_lines,
+    _follow_blocks,
+    main,
+    parse_args,
+    run,
+)
+from shellplot.figure import Figure, figure
+from shellplot.histogram import Histogram
+from shellplot.plots import plot
+
+X = np.arange(50)
+Y = np.sin(X / 5)
+
+
+def write_csv(path, columns, delimiter=",", header=None):
+    lines = [delimiter.join(header)] if header is not None else []
+    lines += [delimiter.join(str(val) for val in row) for row in zip(*columns)]
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+def run_cli(capsys, args):
+    main(args)
+    return capsys.readouterr().out
+
+
+@pytest.mark.parametrize("delimiter", [",", "\t", " "])
+@pytest.mark.parametrize("chunksize", [7, 2**16])
+def test_cli_plot(tmp_path, capsys, delimiter, chunksize):
+    path = write_csv(tmp_path / "data.csv", [X, Y], delimiter, header=["x", "y"])
+    plt_str = run_cli(
+        capsys, [path, "-x", "x", "--figsize", "40", "20", f"--chunksize={chunksize}"]
+    )
+    expected = plot(X, Y, xlabel="x", ylabel="y", figsize=(40, 20), return_type="str")
+    assert plt_str == expected + "\n"
+
+
+def test_cli_plot_stdin(monkeypatch, capsys):
+    lines = "\n".join(f"{y} {2 * y}" for y in Y)
+    monkeypatch.setattr(sys, "stdin", io.StringIO(lines))
+    plt_str = run_cli(capsys, ["--figsize", "40", "20"])
+
+    expected = figure(figsize=(40, 20))
+    expected.plot(X, Y, label="0")
+    expected.plot(X, 2 * Y, label="1")
+    assert plt_str == expected.draw() + "\n"
+
+
+def test_cli_hist(tmp_path, capsys):
+    path = write_csv(tmp_path / "data.csv", [X, Y], header=["x", "y"])
+    plt_str = run_cli(capsys, [path, "-k", "hist", "-y", "1", "--bins", "5"])
+
+    expected = figure(xlabel="y", ylabel="counts")
+    expected.hist(Histogram(bins=5).update(Y))
+    assert plt_str == expected.draw() + "\n"
+
+
+def test_cli_barh_blocks(tmp_path, capsys, monkeypatch):
+    labels, values = [f"l{ii}" for ii in range(20)], np.arange(20)
+    path = write_csv(tmp_path / "data.csv", [labels, values], header=["x", "y"])
+    barh_calls = list()
+    barh = Figure.barh
+    monkeypatch.setattr(
+        Figure,
+        "barh",
+        lambda *args, **kwargs: barh_calls.append(1) or barh(*args, **kwargs),
+    )
+    plt_str = run_cli(capsys, [path, "-k", "barh", "-x", "x", "--chunksize", "3"])
+    assert len(barh_calls) == 1  # once for all blocks
+
+    expected = figure(xlabel="y")
+    expected.barh(values.astype(float), labels=np.array(labels))
+    assert plt_str == expected.draw() + "\n"
+
+
+def test_cli_multiple_files(tmp_path, capsys):
+    paths = [
+        write_csv(tmp_path / "a.csv", [X[:20], Y[:20]], header=["x", "y"]),
+        write_csv(tmp_path / "b.csv", [X[20:], Y[20:]], header=["x", "y"]),
+    ]
+    plt_str = run_cli(capsys, paths + ["-x", "0"])
+    expected = plot(X, Y, xlabel="x", ylabel="y", return_type="str")
+    assert plt_str == expected + "\n"
+
+
+def test_cli_follow(monkeypatch, capsys):
+    lines = "\n".join(f"{x} {y}" for x, y in zip(X, Y))
+    monkeypatch.setattr(sys, "stdin", io.StringIO(lines))
+    plt_str = run_cli(capsys, ["-x", "0", "--follow", "--chunksize", "10"])
+    assert plt_str.count("└") >= 2  # redrawn, at least on exit
+
+
+def test_cli_no_data(monkeypatch):
+    monkeypatch.setattr(sys, "stdin", io.StringIO("\n\n"))
+    with pytest.raises(SystemExit):
+        main([])
+
+
+def test_cli_unknown_column(tmp_path, monkeypatch):
+    path = write_csv(tmp_path / "data.csv", [X, Y], header=["x", "y"])
+    monkeypatch.setattr(sys, "argv", ["shellplot", path, "-y", "z"])
+    with pytest.raises(SystemExit, match="Column z not found"):
+        run()
+
+
+def test_parse_args_follow_multiple_files():
+    with pytest.raises(SystemExit):
+        parse_args(["a.csv", "b.csv", "--follow"])
+
+
+# -----------------------------------------------------------------------------
+# Test parsing of columns
+# -----------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "lines, delimiter, has_header",
+    [
+        (["a,b\n", "1,2\n"], ",", True),
+        (["1\t2\n"], "\t", False),
+        (["# comment\n", "\n", "1 2\n"], None, False),
+    ],
+)
+def test_column_parser_detects_format(lines, delimiter, has_header):
+    parser = ColumnParser()
+    x, y = parser.parse(lines)
+
+    assert parser.delimiter == delimiter
+    assert parser.has_header == has_header
+    np.testing.assert_array_equal(x, [0])
+    np.testing.assert_array_equal(y, [[1], [2]])
+
+
+def test_column_parser_columns():
+    parser = ColumnParser(x="b", y="2,a")
+    x, y = parser.parse(["a,b,c\n", "1,2,3\n", "4,5,6\n"])
+
+    assert parser.x_name == "b"
+    assert parser.y_names == ["c", "a"]
+    np.testing.assert_array_equal(x, [2, 5])
+    np.testing.assert_array_equal(y, [[3, 6], [1, 4]])
+
+
+def test_follow_blocks():
+    stream = io.StringIO("".join(f"{ii}\n" for ii in range(25)))
+    blocks = list(_follow_blocks(stream, chunksize=10, interval=0.1))
+
+    assert sum(blocks, []) == [f"{ii}\n" for ii in range(25)]
+    assert all(len(block) <= 10 for block in blocks)
+
+
+def test_follow_partial_line(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("1,2\n3,")
+    lines = queue.Queue()
+    with open(path) as stream:
+        reader = threading.Thread(
+            target=_enqueue_lines, args=(stream, lines, True, 0.01), daemon=True
+        )
+        reader.start()
+        assert lines.get(timeout=1) == "1,2\n"
+        time.sleep(0.05)  # the reader has hit the partial line
+        assert lines.empty()
+
+        with open(path, "a") as writer:
+            writer.write("4\n")
+        assert lines.get(timeout=1) == "3,4\n"
@@ -4,15 +4,27 @@ import pytest
 
 import numpy as np
 
+from shellplot import drawing
 from shellplot.axis import Axis
 from shellplot.drawing import (
+    CANVAS_DTYPE,
+    N_CODES,
+    PALETTE,
+    USER_CODES,
     LegendItem,
     _draw_canvas,
     _draw_legend,
     _draw_title,
     _draw_x_axis,
     _draw_y_axis,
+    _pack_subcanvas,
     _pad_lines,
+    canvas_code_points,
+    draw_frame,
+    draw_lines,
+    empty_canvas,
+    register_symbol,
+    xy_view,
 )
 
 
@@ -116,10 +128,119 @@ def test_draw_y_axis(axis, label, limits, expected_axis_lines):
                     [1, 0, 0, 0, 0],
                 ]
             ),
-            ["@    ", " x   ", "  o  ", "   * ", "    +"],
+            ["    @", "   x ", "  o  ", " *   ", "+    "],
         ),
     ],
 )
 def test_draw_canvas(canvas, expected_canvas_lines):
     canvas_lines = _draw_canvas(canvas)
     assert canvas_lines == expected_canvas_lines
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (7, 3), (71, 27), (200, 60)])
+def test_draw_canvas_all_symbols(shape):
+    """Vectorised drawing needs to match a cell by cell lookup in the palette"""
+    rng = np.random.default_rng(42)
+    canvas = rng.choice(list(PALETTE.keys()), size=shape)
+
+    expected_canvas_lines = ["".join(PALETTE[val] for val in row) for row in canvas]
+    assert _draw_canvas(canvas) == expected_canvas_lines
+
+
+@pytest.mark.parametrize(
+    "mode, subcells, expected_symbol",
+    [
+        ("braille", [(0, 0)], "⡀"),
+        ("braille", [(0, 3)], "⠁"),
+        ("braille", [(1, 3), (1, 2)], "⠘"),
+        ("braille", [(x, y) for x in range(2) for y in range(4)], "⣿"),
+        ("quadrant", [(1, 0)], "▗"),
+        ("quadrant", [(0, 0), (0, 1)], "▌"),
+        ("quadrant", [(x, y) for x in range(2) for y in range(2)], "█"),
+    ],
+)
+def test_pack_subcanvas(mode, subcells, expected_symbol):
+    """Sub-cells (x, y), from the bottom left, as pattern of a character"""
+    n_x, n_y = (2, 4) if mode == "braille" else (2, 2)
+    subcanvas = np.zeros((n_y, 2 * n_x), dtype=bool)  # 2x1 characters
+    for x, y in subcells:
+        xy_view(subcanvas)[n_x + x, y] = True
+
+    assert _draw_canvas(np.zeros((1, 2), dtype=int), subcanvas, mode) == [
+        " " + expected_symbol
+    ]
+
+
+def test_draw_canvas_with_subcanvas():
+    """Characters of the canvas take precedence over the sub-cells"""
+    canvas = np.array([[0, 0, 20]])
+    subcanvas = np.ones((4, 6), dtype=bool)
+    subcanvas[:, :2] = False
+    assert _draw_canvas(canvas, subcanvas, "braille") == [" ⣿|"]
+    np.testing.assert_array_equal(
+        _pack_subcanvas(subcanvas, "braille"), [[ord(" "), 0x28FF, 0x28FF]]
+    )
+
+
+def test_canvas_code_points_into_buffer():
+    canvas = np.array([[0, 0, 20]])
+    subcanvas = np.ones((4, 6), dtype=bool)
+    buffer = np.full((3, 5), ord("."), dtype=np.uint32)
+    canvas_code_points(canvas, subcanvas, "braille", out=buffer[1:2, 1:4])
+
+    lines = buffer.view("U5").ravel().tolist()
+    assert lines == [".....", ".⣿⣿|.", "....."]
+
+
+@pytest.mark.parametrize("title", [None, "title"])
+def test_draw_frame_around_canvas(title):
+    canvas = np.array([[1, 0, 0], [0, 0, 20]])
+    x_axis = Axis(display_length=3, label="x", limits=(0, 3))
+    y_axis = Axis(display_length=2, label="y", limits=(0, 1))
+    legend = [LegendItem(1, "a")]
+    frame = draw_frame(canvas.shape, x_axis, y_axis, legend, title)
+
+    lines = list(frame.lines)
+    for ii, canvas_line in enumerate(_draw_canvas(canvas)):
+        lines[frame.row + ii] += canvas_line + frame.right[ii]
+    assert lines == draw_lines(canvas, x_axis, y_axis, legend, title)
+    assert lines[frame.row][frame.col :] == "+  "
+    assert frame.right == ["", "  + a"]  # the legend is bottom aligned
+
+
+def test_register_symbol():
+    assert register_symbol("+") == 1  # known symbols keep their code
+
+    code = register_symbol("#")
+    assert USER_CODES <= code < N_CODES
+    assert register_symbol("#") == code
+
+    canvas = empty_canvas((1, 2))
+    canvas[0, 1] = code
+    assert canvas.dtype == CANVAS_DTYPE
+    assert _draw_canvas(canvas) == [" #"]
+
+
+@pytest.mark.parametrize("symbol", ["", "ab", 1])
+def test_register_symbol_invalid(symbol):
+    with pytest.raises(ValueError):
+        register_symbol(symbol)
+
+
+def test_register_symbol_palette_full(monkeypatch):
+    monkeypatch.setattr(drawing, "PALETTE", dict(PALETTE))
+    monkeypatch.setattr(drawing, "PALETTE_LUT", drawing.PALETTE_LUT.copy())
+    monkeypatch.setattr(drawing, "_PALETTE_CODES", dict(drawing._PALETTE_CODES))
+
+    symbols = [chr(0x4E00 + ii) for ii in range(N_CODES)]  # unused symbols
+    with pytest.raises(ValueError, match="Palette is full"):
+        for symbol in symbols:
+            register_symbol(symbol)
+    assert max(drawing.PALETTE) == N_CODES - 1
+
+
+def test_xy_view():
+    canvas = empty_canvas((3, 2))  # 3 rows, 2 columns
+    xy_view(canvas)[1, 0] = 1  # bottom right
+    xy_view(canvas)[0, 2] = 2  # top left
+    np.testing.assert_array_equal(canvas, [[2, 0], [0, 0], [0, 1]])
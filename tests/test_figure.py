@@ -4,7 +4,12 @@ import pytest
 
 import numpy as np
 
-from shellplot.figure import array_split, figure
+from shellplot import _plotting
+from shellplot._plotting import PlotCall
+from shellplot.drawing import LEGEND_SYMBOLS, PALETTE, register_symbol
+from shellplot.figure import array_split, color_split, figure
+from shellplot.histogram import Histogram
+from shellplot.utils import ChunkedArray
 
 
 @pytest.mark.parametrize(
@@ -55,6 +60,20 @@ def test_array_split_label_kwargs(kwargs, expected_kwargs):
         assert kwargs == expected_kwargs.pop(0)
 
 
+def test_color_split():
+    x, y = np.arange(6), np.arange(6) * 2
+    color = np.array(["b", "a", "b", "c", "a", "b"])
+
+    groups = list(color_split(x, y, color, {"line": True}))
+
+    assert [kwargs for _, _, kwargs in groups] == [
+        {"line": True, "label": label} for label in ["a", "b", "c"]
+    ]
+    for (x_group, y_group, kwargs), expected_x in zip(groups, [[1, 4], [0, 2, 5], [3]]):
+        np.testing.assert_array_equal(x_group, expected_x)
+        np.testing.assert_array_equal(y_group, np.array(expected_x) * 2)
+
+
 def test_figure_setters():
     """Faux test for checking that setters do not fail"""
     fig = figure()
@@ -78,3 +97,394 @@ def test_empty_figure_show_raises():
 
     with pytest.raises(ValueError):
         fig.show()
+
+
+def test_plot_datetime():
+    x = np.arange("2001-01-01", "2001-01-08", dtype="datetime64[D]")
+    fig = figure(figsize=(40, 20))
+    fig.plot(x, np.arange(7))
+    plt_str = fig.draw()
+
+    assert fig._plot_builder._plot_calls[0].args[0].dtype == "datetime64[ns]"
+    assert "2001-01-02" in plt_str and "2001-01-06" in plt_str  # every 2nd day
+
+
+# -----------------------------------------------------------------------------
+# Test appending points to a figure
+# -----------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("line", [None, True])
+@pytest.mark.parametrize("xlim, ylim", [((0, 99), (-2, 2)), (None, None)])
+def test_append_matches_plot(line, xlim, ylim):
+    x = np.arange(0, 100)
+    y = np.sin(x / 10)
+
+    fig = figure(figsize=(40, 20), xlim=xlim, ylim=ylim)
+    fig.plot(x[:60], y[:60], line=line, label="sin")
+    fig.draw()
+    fig.append(x[60:80], y[60:80])
+    fig.append(x[80:], y[80:], series="sin")
+
+    expected_fig = figure(figsize=(40, 20), xlim=xlim, ylim=ylim)
+    expected_fig.plot(x, y, line=line, label="sin")
+
+    assert fig.draw() == expected_fig.draw()
+
+
+def test_append_lines_keep_markers():
+    rng = np.random.default_rng(0)
+    x, y = rng.uniform(-1, 1, 40), rng.uniform(-1, 1, 40)
+
+    fig = figure(figsize=(40, 20), xlim=(-1, 1), ylim=(-1, 1))
+    fig.plot(x[:20], y[:20], line=True)
+    fig.draw()
+    for ii in range(20, 40):  # lines of unsorted points cross earlier markers
+        fig.append(x[ii : ii + 1], y[ii : ii + 1])
+        fig.draw()
+
+    expected_fig = figure(figsize=(40, 20), xlim=(-1, 1), ylim=(-1, 1))
+    expected_fig.plot(x, y, line=True)
+    assert fig.draw() == expected_fig.draw()
+
+
+def create_raises(fig):
+    raise AssertionError("Figure should not be re-created!")
+
+
+def test_draw_unchanged_figure_is_cached(monkeypatch):
+    fig = figure(figsize=(40, 20))
+    fig.plot(np.array([0, 10]), np.array([0, 10]), line=True)
+    plt_str = fig.draw()
+
+    monkeypatch.setattr(fig._plot_builder, "create", create_raises)
+    assert fig.draw() == plt_str
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda fig: fig.set_xlim((0, 20)),
+        lambda fig: fig.set_ylabel("y"),
+        lambda fig: fig.set_title("title"),
+        lambda fig: fig.clear() or fig.plot(np.array([0, 20]), np.array([0, 10])),
+        lambda fig: fig.plot(np.array([5]), np.array([5])),
+        lambda fig: fig.append(np.array([20]), np.array([20])),
+    ],
+)
+def test_draw_changed_figure_is_redrawn(change):
+    fig = figure(figsize=(40, 20))
+    fig.plot(np.array([0, 10]), np.array([0, 10]))
+    plt_str = fig.draw()
+    change(fig)
+    assert fig.draw() != plt_str
+
+
+def test_draw_updated_histogram_is_redrawn():
+    hist = Histogram(bins=4).update(np.arange(10))
+    fig = figure(figsize=(40, 20))
+    fig.hist(hist)
+    plt_str = fig.draw()
+    assert fig.draw() == plt_str
+
+    hist.update(np.arange(5))
+    assert fig.draw() != plt_str
+
+
+def test_append_within_limits_is_incremental(monkeypatch):
+    fig = figure(figsize=(40, 20))
+    fig.plot(np.array([0, 10]), np.array([0, 10]))
+    fig.draw()
+
+    monkeypatch.setattr(fig._plot_builder, "create", create_raises)
+    fig.append(np.array([5]), np.array([5]))
+    assert fig.draw().count("+") == 3
+
+
+def test_append_outside_limits_refits():
+    fig = figure(figsize=(40, 20))
+    fig.plot(np.array([0, 10]), np.array([0, 10]))
+    fig.draw()
+    fig.append(np.array([100]), np.array([100]))
+
+    expected_fig = figure(figsize=(40, 20))
+    expected_fig.plot(np.array([0, 10, 100]), np.array([0, 10, 100]))
+
+    assert fig.draw() == expected_fig.draw()
+    np.testing.assert_array_equal(fig.x_axis.limits, expected_fig.x_axis.limits)
+
+
+def test_refit_uses_cached_limits(monkeypatch):
+    x = np.arange(100)
+    fig = figure(figsize=(40, 20))
+    fig.plot(x, x, label="a")
+    fig.plot(x, -x, label="b")
+    fig.draw()
+
+    reductions = list()
+    xy_limits = _plotting._xy_limits
+    monkeypatch.setattr(
+        _plotting,
+        "_xy_limits",
+        lambda x, y: reductions.append(len(x)) or xy_limits(x, y),
+    )
+    fig.set_title("title")
+    fig.append(np.array([200]), np.array([300]), series="b")
+    fig.draw()
+
+    assert reductions == [3]  # the limits and the appended point of b
+    np.testing.assert_array_equal(fig._plot_builder.fit_data()[1], [0, 99, -99, 300])
+
+
+def test_append_new_series():
+    fig = figure(figsize=(40, 20))
+    fig.plot(np.array([0, 10]), np.array([0, 10]), label="a")
+    fig.append(5, 5, series="b")
+    fig.draw()
+
+    assert [item.name for item in fig.legend] == ["a", "b"]
+
+
+def test_append_many_times():
+    fig = figure(figsize=(40, 20))
+    fig.plot(np.array([0, 10]), np.array([0, 10]))
+    plt_str = fig.draw()
+    for _ in range(1000):
+        fig.append(np.array([5]), np.array([5]))
+    assert fig.draw() != plt_str
+
+
+def test_plot_custom_symbols():
+    fig = figure(figsize=(40, 20))
+    fig.plot(np.array([0, 10]), np.array([0, 10]), marker="#", line="~", label="a")
+    plt_str = fig.draw()
+
+    assert fig.canvas.dtype == np.uint8
+    assert plt_str.count("#") == 3  # 2 markers and the legend
+    assert "~" in plt_str
+
+
+# -----------------------------------------------------------------------------
+# Test layers of plots
+# -----------------------------------------------------------------------------
+
+
+@pytest.fixture
+def count_renders(monkeypatch):
+    """Names of the rendered layers, where series may be rendered in batches"""
+    renders = list()
+    render, plot_series = PlotCall.render, _plotting._plot_series
+
+    def counted_render(self, fig, layer, args):
+        if self.name != "plot":
+            renders.append(self.name)
+        return render(self, fig, layer, args)
+
+    def counted_plot_series(fig, canvases, xs, *args):
+        renders.extend(["plot"] * len(xs))
+        return plot_series(fig, canvases, xs, *args)
+
+    monkeypatch.setattr(PlotCall, "render", counted_render)
+    monkeypatch.setattr(_plotting, "_plot_series", counted_plot_series)
+    return renders
+
+
+@pytest.mark.parametrize("zorder, expected_symbol", [(None, "·"), (0, "-")])
+def test_plot_zorder(zorder, expected_symbol):
+    fig = figure(figsize=(30, 10))
+    fig.hist(np.array([0, 1, 1, 2]), bins=3)
+    kwargs = {} if zorder is None else {"zorder": zorder}
+    fig.plot([0, 2], [1, 1], line=True, marker=None, **kwargs)
+
+    # the line crosses the top of the first bar, at half the height
+    canvas_row = fig.draw().split("\n")[6]
+    assert canvas_row[5] == expected_symbol
+
+
+def test_changed_plot_only_renders_its_layer(count_renders):
+    fig = figure(figsize=(40, 20))
+    fig.hist(np.arange(10))
+    fig.plot(np.array([0, 10]), np.array([0, 5]), label="a")
+    fig.plot(np.array([0, 10]), np.array([5, 0]), label="b")
+    fig.draw()
+    assert sorted(count_renders) == ["hist", "plot", "plot"]
+
+    count_renders.clear()
+    fig.set_title("title")
+    fig.draw()
+    assert count_renders == []
+
+    fig.append(np.array([5]), np.array([5]), series="a")
+    fig.draw()
+    assert count_renders == ["plot"]
+
+
+def test_plot_many_series_matches_each_series():
+    x = np.linspace(0, 10, 200)
+    styles = [("a", None), ("b", "-"), (None, "c"), ("d", "e")]
+
+    fig = figure(figsize=(40, 20))
+    for ii, (marker, line) in enumerate(styles):
+        fig.plot(x, np.sin(x + ii), marker=marker, line=line)
+    fig.draw()
+
+    for ii, (marker, line) in enumerate(styles):
+        expected_fig = figure(figsize=(40, 20), xlim=fig.x_axis.limits)
+        expected_fig.set_ylim(fig.y_axis.limits)
+        expected_fig.plot(x, np.sin(x + ii), marker=marker, line=line)
+        expected_fig.draw()
+
+        layer = fig._plot_builder._layers[ii]
+        np.testing.assert_array_equal(layer.canvas, expected_fig.canvas)
+
+
+@pytest.mark.parametrize("canvas_mode", ["char", "braille", "quadrant"])
+def test_plot_batches_fit_canvas_stack(monkeypatch, canvas_mode):
+    fig = figure(figsize=(40, 20), canvas_mode=canvas_mode)
+    stack = fig.canvas if fig.subcanvas is None else fig.subcanvas
+    batch_sizes = list()
+    batches, plot_series = _plotting._batches, _plotting._plot_series
+
+    def batches_of_two(indices, canvas_size):
+        return batches(indices, canvas_size, max_cells=2 * stack.size)
+
+    def sized_plot_series(fig, canvases, xs, *args):
+        batch_sizes.append(len(xs))
+        return plot_series(fig, canvases, xs, *args)
+
+    monkeypatch.setattr(_plotting, "_batches", batches_of_two)
+    monkeypatch.setattr(_plotting, "_plot_series", sized_plot_series)
+    for ii in range(5):
+        fig.plot([0, 1], [ii, ii])
+    fig.draw()
+
+    assert batch_sizes == [2, 2, 1]
+
+
+def test_append_keeps_zorder():
+    x = np.arange(20)
+    fig = figure(figsize=(40, 20))
+    fig.plot(x[:10], x[:10], label="a")
+    fig.plot(x, x, label="b", zorder=3)
+    fig.draw()
+    fig.append(x[10:], x[10:], series="a")  # overlaps b, which is on top
+
+    expected_fig = figure(figsize=(40, 20))
+    expected_fig.plot(x, x, label="a")
+    expected_fig.plot(x, x, label="b", zorder=3)
+    assert fig.draw() == expected_fig.draw()
+    assert not np.any(fig.canvas == register_symbol("+"))  # a is below b
+
+
+# -----------------------------------------------------------------------------
+# Test sub-cell canvas modes
+# -----------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "canvas_mode, n_x, n_y", [("braille", 2, 4), ("quadrant", 2, 2)]
+)
+def test_plot_canvas_mode(canvas_mode, n_x, n_y):
+    x = np.linspace(0, 10, 1000)
+    fig = figure(figsize=(40, 20), canvas_mode=canvas_mode)
+    fig.plot(x, np.sin(x), label="sin")
+    plt_str = fig.draw()
+
+    assert fig.subcanvas.shape == (20 * n_y, 40 * n_x)
+    assert fig.subcanvas.sum() > fig.canvas.shape[1] * n_x  # finer than cells
+    assert "+" not in plt_str
+    assert f"{PALETTE[LEGEND_SYMBOLS[canvas_mode]]} sin" in plt_str
+
+
+def test_append_canvas_mode():
+    x = np.linspace(0, 10, 100)
+    fig = figure(figsize=(40, 20), canvas_mode="braille")
+    fig.plot(x[:50], np.sin(x[:50]))
+    fig.draw()
+    fig.append(x[50:], np.sin(x[50:]))
+
+    expected_fig = figure(figsize=(40, 20), canvas_mode="braille")
+    expected_fig.plot(x, np.sin(x))
+    assert fig.draw() == expected_fig.draw()
+
+
+def test_canvas_mode_invalid():
+    with pytest.raises(ValueError):
+        figure(canvas_mode="pixels")
+
+
+# -----------------------------------------------------------------------------
+# Test plotting of chunked arrays
+# -----------------------------------------------------------------------------
+
+
+def to_memmap(tmp_path, x, y):
+    y[::7] = np.nan
+    x_map = np.memmap(tmp_path / "x.bin", dtype=float, mode="w+", shape=x.shape)
+    y_map = np.memmap(tmp_path / "y.bin", dtype=float, mode="w+", shape=y.shape)
+    x_map[:], y_map[:] = x, y
+    return x_map, y_map
+
+
+@pytest.fixture
+def memmap_xy(tmp_path):
+    x = np.linspace(0, 10, 1000)
+    return to_memmap(tmp_path, x, np.sin(x))
+
+
+@pytest.fixture
+def random_memmap_xy(tmp_path):
+    """Points that are not sorted, such that lines cross markers of other chunks"""
+    rng = np.random.default_rng(0)
+    return to_memmap(tmp_path, rng.standard_normal(1000), rng.standard_normal(1000))
+
+
+@pytest.mark.parametrize("line", [None, True])
+def test_plot_chunked_matches_plot(random_memmap_xy, line):
+    x_map, y_map = random_memmap_xy
+    x_chunks = ChunkedArray(x_map, chunksize=64)
+    y_chunks = ChunkedArray(lambda: np.array_split(np.asarray(y_map), 9))
+
+    expected_fig = figure(figsize=(40, 20))
+    expected_fig.plot(np.array(x_map), np.array(y_map), line=line)
+
+    for x, y in [(x_map, y_map), (x_chunks, y_chunks), (x_chunks, np.array(y_map))]:
+        fig = figure(figsize=(40, 20))
+        fig.plot(x, y, line=line)
+        assert fig.draw() == expected_fig.draw()
+
+
+def test_append_to_chunked_reuses_last_point(memmap_xy):
+    x_map, y_map = memmap_xy
+    passes = list()
+
+    def y_chunks():
+        passes.append(1)
+        return np.array_split(np.asarray(y_map), 9)
+
+    fig = figure(figsize=(40, 20))
+    fig.plot(ChunkedArray(x_map, chunksize=64), ChunkedArray(y_chunks), line=True)
+    expected_fig = figure(figsize=(40, 20))
+    expected_fig.plot(np.array(x_map), np.array(y_map), line=True)
+    fig.draw()
+    expected_fig.draw()
+
+    passes.clear()
+    for x, y in [(2.0, 0.5), (5.0, -0.5), (9.0, 0.0)]:
+        fig.append(x, y)
+        expected_fig.append(x, y)
+        assert fig.draw() == expected_fig.draw()
+    assert passes == []
+
+
+@pytest.mark.parametrize("bins", [10, np.linspace(-1, 1, 11)])
+def test_hist_chunked_matches_hist(memmap_xy, bins):
+    _, y_map = memmap_xy
+
+    expected_fig = figure(figsize=(40, 20))
+    expected_fig.hist(np.array(y_map), bins=bins)
+
+    for x in [y_map, ChunkedArray(y_map, chunksize=100)]:
+        fig = figure(figsize=(40, 20))
+        fig.hist(x, bins=bins)
+        assert fig.draw() == expected_fig.draw()
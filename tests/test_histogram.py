@@ -0,0 +1,98 @@
+"""Test histogram accumulation
+"""
+import pytest
+
+import numpy as np
+
+from shellplot.figure import figure
+from shellplot.histogram import Histogram
+
+
+@pytest.fixture
+def x():
+    rng = np.random.default_rng(42)
+    x = rng.standard_normal(1000)
+    x[::10] = np.nan
+    return x
+
+
+@pytest.mark.parametrize("bins", [10, np.linspace(-2, 2, 9)])
+def test_histogram_matches_numpy(x, bins):
+    expected_counts, expected_edges = np.histogram(x[~np.isnan(x)], bins)
+
+    hist = Histogram(bins)
+    if isinstance(bins, int):  # auto expanding bins are set by the first chunk
+        hist.update(x)
+    else:
+        for chunk in np.array_split(x, 7):
+            hist.update(chunk)
+
+    np.testing.assert_array_equal(hist.counts, expected_counts)
+    np.testing.assert_allclose(hist.edges, expected_edges)
+
+
+def test_histogram_expands(x):
+    hist = Histogram(bins=10, range=(0, 1))
+    hist.update(x)
+
+    assert hist.counts.sum() == np.sum(~np.isnan(x))
+    assert hist.edges[0] <= np.nanmin(x) and hist.edges[-1] >= np.nanmax(x)
+    bin_widths = np.diff(hist.edges)
+    np.testing.assert_allclose(bin_widths, bin_widths[0])
+    n_doubled = np.log2(bin_widths[0] / 0.1)
+    assert n_doubled == pytest.approx(np.round(n_doubled))
+
+
+def test_histogram_expands_edges():
+    hist = Histogram(bins=np.linspace(0, 1, 5), expand=True)
+    hist.update([0.5, 3])
+
+    np.testing.assert_allclose(hist.edges, np.linspace(0, 4, 5))
+    np.testing.assert_array_equal(hist.counts, [1, 0, 0, 1])
+    with pytest.raises(ValueError, match="uniform width"):
+        Histogram(bins=[0, 1, 3], expand=True)
+
+
+def test_histogram_fixed_ignores_outside(x):
+    hist = Histogram(bins=10, range=(0, 1), expand=False)
+    hist.update(x)
+
+    assert hist.counts.sum() == np.sum((x >= 0) & (x <= 1))
+    np.testing.assert_allclose(hist.edges, np.linspace(0, 1, 11))
+
+
+def test_histogram_merge(x):
+    worker_hists = [Histogram(bins=8, range=(0, 1)) for _ in range(3)]
+    for hist, chunk in zip(worker_hists, np.array_split(x, 3)):
+        hist.update(chunk)
+
+    hist = Histogram(bins=8, range=(0, 1))
+    hist.update(x)
+
+    merged = Histogram(bins=8)
+    for worker_hist in worker_hists:
+        merged.merge(worker_hist)
+
+    np.testing.assert_array_equal(merged.counts, hist.counts)
+    np.testing.assert_allclose(merged.edges, hist.edges)
+
+
+def test_histogram_merge_fixed_bins_error():
+    hist = Histogram(bins=[0, 1, 2]).update([0.5])
+    with pytest.raises(ValueError):
+        hist.merge(Histogram(bins=[0, 1, 3]).update([0.5]))
+
+
+def test_figure_hist_of_histogram(x):
+    expected_fig = figure(figsize=(40, 20))
+    expected_fig.hist(x, bins=10)
+
+    hist = Histogram(bins=10)
+    fig = figure(figsize=(40, 20))
+    fig.hist(hist)
+
+    with pytest.raises(ValueError):
+        fig.draw()
+
+    hist.update(x)
+    assert fig.draw() == expected_fig.draw()
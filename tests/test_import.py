@@ -0,0 +1,70 @@
+"""Testing the import of shellplot, which should be fast for use in scripts
+"""
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+import shellplot
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+
+# Own import time of shellplot, excluding numpy, measured at ~50ms. The budget
+# leaves room for slow machines, but not for importing pandas (~300ms)
+IMPORT_TIME_BUDGET = 0.2  # seconds
+
+
+def run_python(code, *args):
+    env = {  # without coverage of subprocesses, which slows down imports
+        key: val for key, val in os.environ.items() if not key.startswith("COV_")
+    }
+    env["PYTHONPATH"] = SRC_DIR
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def import_times(stderr):
+    """Cumulative import time in seconds, per module"""
+    times = dict()
+    for line in stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s+(\S+)$", line)
+        if match is not None:
+            times[match.group(2)] = int(match.group(1)) / 1e6
+    return times
+
+
+@pytest.mark.parametrize("module", ["pandas", "pkg_resources"])
+def test_import_does_not_import(module):
+    result = run_python(f"import sys, shellplot; print({module!r} in sys.modules)")
+    assert result.stdout.strip() == "False"
+
+
+def test_import_time_within_budget():
+    own_times = list()
+    for _ in range(5):  # best of, to be robust against noise
+        times = import_times(run_python("import shellplot", "-X", "importtime").stderr)
+        own_times.append(times["shellplot"] - times.get("numpy", 0.0))
+    assert min(own_times) < IMPORT_TIME_BUDGET
+
+
+def test_pandas_support_registered_lazily():
+    code = (
+        "import shellplot, pandas as pd;"
+        "s = pd.Series([1, 2, 3], name='series');"
+        "print(shellplot.plot(s.index, s, return_type='str'))"
+    )
+    assert "series" in run_python(code).stdout
+
+
+def test_lazy_attributes():
+    assert isinstance(shellplot.__version__, str)
+    assert shellplot.pandas_api.plot is not None
+    with pytest.raises(AttributeError):
+        shellplot.does_not_exist
@@ -0,0 +1,104 @@
+"""Test grid layouts of figures
+"""
+import pytest
+
+import numpy as np
+
+from shellplot import drawing
+from shellplot.figure import figure
+from shellplot.layout import subplots
+
+
+@pytest.fixture
+def x():
+    return np.linspace(0, 10, 50)
+
+
+def rstrip_lines(plt_str):
+    return [line.rstrip() for line in plt_str.split("\n")]
+
+
+def test_layout_single_panel_matches_figure(x):
+    layout = subplots(figsize=(40, 20))
+    layout[0, 0].plot(x, np.sin(x), label="sin")
+
+    fig = figure(figsize=(40, 20))
+    fig.plot(x, np.sin(x), label="sin")
+
+    assert rstrip_lines(layout.draw()) == rstrip_lines(fig.draw())
+
+
+@pytest.mark.parametrize("canvas_mode", ["char", "braille"])
+def test_layout_writes_canvas_code_points(monkeypatch, x, canvas_mode):
+    kwargs = dict(figsize=(40, 20), canvas_mode=canvas_mode, title="title")
+    fig = figure(**kwargs)
+    fig.plot(x, np.sin(x), label="sin")
+    fig.plot(x, np.cos(x), label="cos")
+    expected = rstrip_lines(fig.draw())
+
+    layout = subplots(**kwargs)
+    layout[0, 0].plot(x, np.sin(x), label="sin")
+    layout[0, 0].plot(x, np.cos(x), label="cos")
+    monkeypatch.setattr(drawing, "_draw_canvas", None)  # canvases are not strings
+    assert rstrip_lines(layout.draw()) == expected
+
+
+def test_layout_panels_side_by_side(x):
+    layout = subplots(1, 2, figsize=(30, 10), wspace=3)
+    layout[0].plot(x, np.sin(x))
+    layout[1].hist(np.sin(x), bins=5)
+    plt_lines = layout.draw().split("\n")
+
+    left_lines = figure_lines(lambda fig: fig.plot(x, np.sin(x)))
+    right_lines = figure_lines(lambda fig: fig.hist(np.sin(x), bins=5))
+    width = max(map(len, left_lines)) + 3
+
+    assert len(plt_lines) == max(len(left_lines), len(right_lines))
+    for line, left, right in zip(plt_lines, left_lines, right_lines):
+        assert line[:width].rstrip() == left.rstrip()
+        assert line[width:].rstrip() == right.rstrip()
+
+
+def figure_lines(plot_func):
+    fig = figure(figsize=(30, 10))
+    plot_func(fig)
+    return fig.draw().split("\n")
+
+
+@pytest.mark.parametrize(
+    "sharex, sharey, expected_ylim", [(True, False, (0, 10)), ("col", "row", (0, 20))]
+)
+def test_layout_shared_axes(x, sharex, sharey, expected_ylim):
+    layout = subplots(2, 2, figsize=(30, 10), sharex=sharex, sharey=sharey)
+    layout[0, 0].plot(x, x)
+    layout[0, 1].plot(x, 2 * x)
+    layout[1, 0].plot(2 * x, x)
+    layout.draw()
+
+    assert layout[0, 0].x_axis is layout[1, 0].x_axis
+    np.testing.assert_array_equal(layout[0, 0].x_axis.limits, (0, 20))
+    np.testing.assert_array_equal(layout[0, 0].y_axis.limits, expected_ylim)
+    assert layout[1, 1]._plot_builder.is_empty()
+
+
+def test_layout_shared_axes_requires_plot(x):
+    layout = subplots(1, 2, sharey=True)
+    layout[0].plot(x, x)
+    layout[1].hist(x)
+    with pytest.raises(ValueError):
+        layout.draw()
+
+
+def test_layout_is_cached(x):
+    layout = subplots(1, 2, figsize=(30, 10))
+    layout[0].plot(x, x)
+    plt_str = layout.draw()
+    assert layout.draw() is plt_str
+
+    layout[1].plot(x, x)
+    assert layout.draw() != plt_str
+
+
+def test_empty_layout_raises():
+    with pytest.raises(ValueError):
+        subplots(2, 2).draw()
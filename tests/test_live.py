@@ -0,0 +1,115 @@
+"""Test live display of figures
+"""
+import io
+import re
+
+import pytest
+
+import numpy as np
+
+from shellplot.figure import figure
+
+ANSI_CODES = re.compile(r"\x1b\[(\?25[hl]|\d*[ABFGJ])|\r|\n")
+
+
+def render_terminal(output):
+    """Emulate the screen of a terminal, for the ANSI codes of the live display"""
+    screen, row, col = [[]], 0, 0
+    pos = 0
+    for match in ANSI_CODES.finditer(output):
+        for char in output[pos : match.start()]:  # write text at the cursor
+            line = screen[row]
+            line.extend(" " * (col + 1 - len(line)))
+            line[col] = char
+            col += 1
+        pos = match.end()
+
+        code = match.group(0)
+        n = int(code[2:-1] or 1) if code.startswith("\x1b[") and code[2] != "?" else 0
+        if code == "\n":
+            row, col = row + 1, 0
+        elif code == "\r":
+            col = 0
+        elif code.endswith("A"):
+            row -= n
+        elif code.endswith("B"):
+            row += n
+        elif code.endswith("F"):
+            row, col = row - n, 0
+        elif code.endswith("G"):
+            col = n - 1
+        elif code.endswith("J"):
+            screen = screen[:row] + [screen[row][:col]]
+        screen.extend([] for _ in range(row + 1 - len(screen)))
+    return ["".join(line).rstrip() for line in screen]
+
+
+def screen_of(plt_str):
+    return [line.rstrip() for line in (plt_str + "\n").split("\n")]
+
+
+@pytest.fixture
+def streamed_fig():
+    x = np.linspace(0, 10, 200)
+    fig = figure(figsize=(60, 20))
+    fig.plot(x[:100], np.sin(x[:100]), line=True, label="sin")
+    chunks = [(x[ii : ii + 10], np.sin(x[ii : ii + 10])) for ii in range(100, 200, 10)]
+    return fig, chunks
+
+
+def test_live_redraws_in_place(streamed_fig):
+    fig, chunks = streamed_fig
+    out = io.StringIO()
+    with fig.live(fps=None, out=out, ansi=True) as live:
+        live.refresh()
+        for x, y in chunks:
+            fig.append(x, y)
+            live.refresh()
+            assert render_terminal(out.getvalue()) == screen_of(fig.draw())
+
+    n_frames = len(chunks) + 1
+    assert live.bytes_written < n_frames * len(fig.draw().encode()) / 2
+
+
+def test_live_frame_changes_shape():
+    fig = figure(figsize=(40, 10))
+    fig.plot(np.arange(10), np.arange(10))
+    out = io.StringIO()
+    with fig.live(fps=None, out=out, ansi=True) as live:
+        live.refresh()
+        fig.set_title("title")  # adds a line to the frame
+        live.refresh()
+    assert render_terminal(out.getvalue()) == screen_of(fig.draw())
+
+
+def test_live_unchanged_figure_writes_nothing(streamed_fig):
+    fig, _ = streamed_fig
+    with fig.live(fps=None, out=io.StringIO(), ansi=True) as live:
+        live.refresh()
+        bytes_written = live.bytes_written
+        live.refresh()
+        assert live.bytes_written == bytes_written
+
+
+def test_live_is_throttled(streamed_fig):
+    fig, chunks = streamed_fig
+    out = io.StringIO()
+    with fig.live(fps=1e-3, out=out, ansi=True) as live:
+        assert live.refresh()
+        for x, y in chunks:
+            fig.append(x, y)
+            assert not live.refresh()
+    # the pending refresh is displayed on exit
+    assert render_terminal(out.getvalue()) == screen_of(fig.draw())
+
+
+def test_live_without_ansi_writes_frames(streamed_fig):
+    fig, chunks = streamed_fig
+    out = io.StringIO()
+    with fig.live(fps=None, out=out) as live:  # out is not a terminal
+        live.refresh()
+        fig.append(*chunks[0])
+        live.refresh()
+    assert "\x1b" not in out.getvalue()
+    assert out.getvalue().count(fig.draw()) == 1
+    assert out.getvalue().endswith(fig.draw() + "\n")
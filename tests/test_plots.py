@@ -234,16 +234,16 @@ def expected_interp_plot():
     return "\n".join(
         [
             "",
-            " 9┤                   ",
-            "  |:              ÷÷÷ ",
-            "  |:             ÷    ",
-            " 6┤:          ÷÷÷     ",
-            "  |:         ÷        ",
-            "  |:      ÷÷÷         ",
-            " 3┤:     ÷            ",
-            "  |:  ÷÷÷             ",
-            "  |: ÷                ",
-            " 0┤÷÷················ ",
+            " 9┤:                ÷÷",
+            "  |:              ÷÷  ",
+            "  |:            ÷÷    ",
+            " 6┤:          ÷÷      ",
+            "  |:        ÷÷        ",
+            "  |:      ÷÷          ",
+            " 3┤:    ÷÷            ",
+            "  |:  ÷÷              ",
+            "  |:÷÷                ",
+            " 0┤÷··················",
             "  └┬-----┬-----┬-----┬",
             "   0     3     6     9",
             "",
@@ -521,7 +521,7 @@ def expected_hist_with_line():
         [
             "",
             "counts",
-            " 9┤···························   ",
+            " 9┤····························  ",
             "  |                  |        |  ",
             "  |                  |        |  ",
             " 6┤                  |        |  ",
@@ -4,7 +4,8 @@ import pytest
 
 import numpy as np
 
-from shellplot._plotting import _add_hbar, _add_vbar
+from shellplot._plotting import _add_hbar, _add_series, _add_vbar, _rasterize_lines
+from shellplot.drawing import xy_view
 
 # -----------------------------------------------------------------------------
 # Test canvas elements
@@ -47,3 +48,94 @@ def test_add_hbar(expected_canvas_hbar):
     canvas = np.zeros(shape=(5, 5), dtype=int)
     canvas = _add_hbar(canvas, start=0, width=2, height=2)
     np.testing.assert_equal(canvas, expected_canvas_hbar)
+
+
+# -----------------------------------------------------------------------------
+# Test decimation of points, which must not change the canvas
+# -----------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("sort", [True, False])
+@pytest.mark.parametrize("n_points", [1, 10, 10000])
+@pytest.mark.parametrize("shape", [(71, 27), (5, 40)])
+def test_add_series_matches_full_resolution(sort, n_points, shape):
+    rng = np.random.default_rng(42)
+    idx = rng.integers(0, shape[0], n_points)
+    idy = np.cumsum(rng.integers(-3, 4, n_points)) % shape[1]
+    series = np.zeros(n_points, dtype=int)
+    if sort:
+        idx = np.sort(idx)
+
+    expected_canvas = np.zeros(shape=shape, dtype=np.uint8)
+    x_line, y_line, _ = _rasterize_lines(idx, idy, series)
+    expected_canvas[x_line, y_line] = 10
+    expected_canvas[idx, idy] = 1
+
+    canvases = np.zeros(shape=(1,) + shape[::-1], dtype=np.uint8)
+    _add_series(canvases, series, idx, idy, np.array([1]), np.array([10]))
+    np.testing.assert_equal(xy_view(canvases[0]), expected_canvas)
+
+
+@pytest.mark.parametrize("sort", [True, False])
+def test_add_series_matches_each_series(sort):
+    rng = np.random.default_rng(42)
+    n_series, n_points, shape = 5, 1000, (71, 27)
+    series = np.repeat(np.arange(n_series), n_points)
+    idx = rng.integers(0, shape[0], n_series * n_points)
+    idy = np.cumsum(rng.integers(-3, 4, n_series * n_points)) % shape[1]
+    if sort:
+        idx = np.sort(idx.reshape(n_series, n_points), axis=1).ravel()
+    markers = np.array([1, 0, 2, 3, 0])
+    lines = np.array([10, 11, 0, 12, 0])
+
+    canvases = np.zeros(shape=(n_series,) + shape[::-1], dtype=np.uint8)
+    _add_series(canvases, series, idx, idy, markers, lines)
+
+    for ii in range(n_series):
+        points = series == ii
+        expected_canvases = np.zeros(shape=(1,) + shape[::-1], dtype=np.uint8)
+        _add_series(
+            expected_canvases,
+            series[points] * 0,
+            idx[points],
+            idy[points],
+            markers[ii : ii + 1],
+            lines[ii : ii + 1],
+        )
+        np.testing.assert_equal(canvases[ii], expected_canvases[0])
+
+
+@pytest.mark.parametrize(
+    "x, y, expected_x, expected_y",
+    [
+        ([0, 3], [0, 1], [0, 1, 2, 3], [0, 0, 1, 1]),
+        ([0, 1], [0, 3], [0, 0, 1, 1], [0, 1, 2, 3]),
+        ([2, 2, 0], [0, 2, 2], [2, 2, 2, 1, 0], [0, 1, 2, 2, 2]),
+        ([1, 1], [1, 1], [1], [1]),
+        ([4], [2], [4], [2]),
+    ],
+)
+def test_rasterize_lines(x, y, expected_x, expected_y):
+    series = np.zeros(len(x), dtype=int)
+    x_line, y_line, s_line = _rasterize_lines(np.array(x), np.array(y), series)
+    np.testing.assert_array_equal(x_line, expected_x)
+    np.testing.assert_array_equal(y_line, expected_y)
+    np.testing.assert_array_equal(s_line, 0)
+
+
+def test_rasterize_lines_is_connected():
+    rng = np.random.default_rng(42)
+    x, y = rng.integers(0, 100, 50), rng.integers(0, 100, 50)
+    x_line, y_line, _ = _rasterize_lines(x, y, np.zeros(50, dtype=int))
+
+    assert np.all(np.abs(np.diff(x_line)) <= 1)
+    assert np.all(np.abs(np.diff(y_line)) <= 1)
+    assert set(zip(x, y)) <= set(zip(x_line, y_line))
+
+
+def test_rasterize_lines_does_not_connect_series():
+    x, y = np.array([0, 3, 3, 0]), np.array([0, 0, 3, 3])
+    x_line, y_line, s_line = _rasterize_lines(x, y, np.array([0, 0, 1, 1]))
+
+    cells = set(zip(s_line, x_line, y_line))
+    assert cells == {(0, ii, 0) for ii in range(4)} | {(1, ii, 3) for ii in range(4)}
@@ -0,0 +1,63 @@
+"""Test profiling of the plotting and drawing stages
+"""
+import pytest
+
+import numpy as np
+
+from shellplot._config import register_profile_hook, unregister_profile_hook
+from shellplot.figure import figure
+from shellplot.profiling import is_profiling, profile, stage
+
+
+@pytest.fixture
+def fig():
+    fig = figure(figsize=(40, 20))
+    fig.plot(np.arange(100), np.arange(100), line=True)
+    return fig
+
+
+def test_draw_profile(fig):
+    plt_str = fig.draw(profile=True)
+    assert plt_str == fig.draw()
+
+    stages = fig.profile_report.stages
+    for name in ["create/fit", "create/plot/line", "draw/canvas", "draw/join"]:
+        assert stages[name].calls == 1
+        assert stages[name].seconds > 0
+    assert stages["create/plot/transform"].count == 100
+    assert stages["create/plot/transform"].bytes > 0
+    assert fig.profile_report.seconds >= stages["create"].seconds
+
+
+def test_profile_hooks(fig):
+    reports = list()
+    register_profile_hook(reports.append)
+    try:
+        fig.draw()
+        fig.draw()
+    finally:
+        unregister_profile_hook(reports.append)
+    fig.draw()
+
+    assert len(reports) == 2
+    assert "create" in reports[0].stages
+    assert list(reports[1].stages) == ["cached"]
+
+
+def test_profile_context():
+    with profile(memory=False) as report:
+        fig = figure(figsize=(40, 20))
+        fig.hist(np.arange(100))
+        with profile() as inner_report:  # profiles are not nested
+            fig.draw(profile=True)
+
+    assert inner_report is report
+    assert fig.profile_report is report
+    assert report.stages["create/hist"].bytes is None
+    assert report.to_dict()["stages"][0]["stage"] == "create/fit"
+    assert not is_profiling()
+
+
+def test_stage_without_profile():
+    with stage("stage") as record:
+        assert record is None
@@ -0,0 +1,86 @@
+"""Test approximate quantile sketches
+"""
+import pytest
+
+import numpy as np
+
+from shellplot.figure import figure
+from shellplot.quantiles import QuantileSketch
+from shellplot.utils import ChunkedArray
+
+QUANTILES = [0, 0.01, 0.25, 0.5, 0.75, 0.99, 1]
+
+
+@pytest.fixture
+def x():
+    rng = np.random.default_rng(42)
+    return rng.standard_normal(100_000)
+
+
+def rank_error(x, quantiles, q):
+    """Maximum deviation of the ranks of the quantiles from q"""
+    ranks = np.searchsorted(np.sort(x), quantiles) / len(x)
+    return np.max(np.abs(ranks - q))
+
+
+def test_quantile_sketch_small_data_is_exact():
+    x = np.array([0, 1, 1, 1, 2, 2, 3, 3, 3, 5, np.nan])
+    sketch = QuantileSketch().update(x)
+    np.testing.assert_array_equal(
+        sketch.quantile([0, 0.25, 0.5, 0.75, 1]), [0, 1, 2, 3, 5]
+    )
+    assert sketch.n == 10
+
+
+@pytest.mark.parametrize("eps", [0.05, 0.01])
+def test_quantile_sketch_rank_error(x, eps):
+    sketch = QuantileSketch(eps=eps, seed=0)
+    for chunk in np.array_split(x, 50):
+        sketch.update(chunk)
+
+    quantiles = sketch.quantile(QUANTILES)
+    assert rank_error(x, quantiles, QUANTILES) <= eps
+    assert quantiles[0] == x.min()
+    assert quantiles[-1] == x.max()
+    assert sum(len(c) for c in sketch._compactors) < 3 * sketch.k
+
+
+def test_quantile_sketch_merge(x):
+    shards = [QuantileSketch(seed=i).update(s) for i, s in enumerate(np.split(x, 4))]
+    sketch = QuantileSketch()
+    for shard in shards:
+        sketch.merge(shard)
+
+    assert sketch.n == len(x)
+    assert rank_error(x, sketch.quantile(QUANTILES), QUANTILES) <= sketch.eps
+
+
+def test_quantile_sketch_empty():
+    sketch = QuantileSketch().merge(QuantileSketch()).update([np.nan])
+    with pytest.raises(ValueError):
+        sketch.quantile(0.5)
+
+
+@pytest.mark.parametrize(
+    "to_input",
+    [
+        lambda x: QuantileSketch().update(x),
+        lambda x: ChunkedArray(x, chunksize=3),
+        lambda x: [QuantileSketch().update(x)],
+    ],
+)
+def test_boxplot_sketch_matches_exact(to_input):
+    x = np.array([0, 1, 1, 1, 2, 2, 3, 3, 3, 5])
+    fig = figure(figsize=(41, 9))
+    fig.boxplot(x)
+    fig_sketch = figure(figsize=(41, 9))
+    fig_sketch.boxplot(to_input(x))
+    assert fig_sketch.draw() == fig.draw()
+
+
+def test_boxplot_sketch_eps(x):
+    fig = figure(figsize=(41, 9))
+    fig.boxplot(np.stack([x, x + 1]), labels=["a", "b"])
+    fig_sketch = figure(figsize=(41, 9))
+    fig_sketch.boxplot(np.stack([x, x + 1]), labels=["a", "b"], sketch_eps=0.001)
+    assert fig_sketch.draw() == fig.draw()
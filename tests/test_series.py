@@ -0,0 +1,98 @@
+"""Test the internal series container
+"""
+import pickle
+
+import pytest
+
+import numpy as np
+
+from shellplot._series import Series, as_series, drop_any_nan
+from shellplot.axis import Axis
+from shellplot.utils import fingerprint, numpy_1d
+
+
+@pytest.mark.parametrize(
+    "values, expected_count, expected_limits",
+    [
+        (np.array([3.0, np.nan, 1.0, 2.0]), 3, [1.0, 3.0]),
+        (np.array([3, 1, 2]), 3, [1, 3]),
+        (np.array([np.nan, np.nan]), 0, []),
+        (
+            np.array(["2001-01-03", "NaT", "2001-01-01"], dtype="datetime64[D]"),
+            2,
+            np.array(["2001-01-01", "2001-01-03"], dtype="datetime64[ns]"),
+        ),
+    ],
+)
+def test_series_stats(values, expected_count, expected_limits):
+    series = Series(values)
+
+    assert series.count == expected_count
+    assert (series.nan_mask is None) == (expected_count == len(values))
+    np.testing.assert_array_equal(series.limits(), expected_limits)
+    assert series.limits().dtype == series.dtype
+
+
+def test_series_stats_are_cached():
+    series = Series(np.array([1.0, np.nan, 3.0]))
+    assert series.nan_mask is series.nan_mask
+    assert series.limits() is series.limits()
+
+
+def test_series_numeric_is_a_view():
+    x = np.array(["2001-01-01", "2001-01-02"], dtype="datetime64[ns]")
+    series = Series(x)
+
+    assert series.numeric.dtype == np.int64
+    assert np.shares_memory(series.numeric, x)
+
+
+@pytest.mark.parametrize(
+    "values, expected_sorted",
+    [
+        (np.array([1, 2, 2, 3]), True),
+        (np.array([1, 3, 2]), False),
+        (np.array([1.0, np.nan, 2.0]), False),
+        (np.array([]), True),
+    ],
+)
+def test_series_is_sorted(values, expected_sorted):
+    assert Series(values).is_sorted == expected_sorted
+
+
+def test_series_dropna():
+    series = Series(np.array([1.0, np.nan, 3.0]))
+    valid = series.dropna()
+
+    np.testing.assert_array_equal(valid.values, [1.0, 3.0])
+    assert valid.nan_mask is None
+    assert valid.dropna() is valid
+
+
+def test_drop_any_nan():
+    x = Series(np.array([0.0, 1.0, np.nan, 3.0]))
+    y = Series(np.array([np.nan, 1.0, 2.0, 3.0]))
+    x, y = drop_any_nan(x, y)
+
+    np.testing.assert_array_equal(x.values, [1.0, 3.0])
+    np.testing.assert_array_equal(y.values, [1.0, 3.0])
+    assert drop_any_nan(x, y) == (x, y)
+
+
+def test_series_is_array_like():
+    x = np.array([1.0, 2.0])
+    series = as_series(x)
+
+    assert as_series(series) is series
+    assert numpy_1d(series) is series.values
+    assert fingerprint(series) == fingerprint(Series(x.copy()))
+    assert fingerprint(series) != fingerprint(Series(x + 1))
+    unpickled = pickle.loads(pickle.dumps(Series(np.array([1.0, np.nan]))))
+    np.testing.assert_array_equal(unpickled.nan_mask, [False, True])
+
+
+def test_axis_fit_series():
+    series = Series(np.array([0.0, np.nan, 100.0]))
+    axis = Axis(display_length=80).fit(series)
+
+    assert axis.limits == (0, 100)
@@ -1,19 +1,27 @@
+import sys
+
 import pytest
 
 import numpy as np
 import pandas as pd
 
 from shellplot.utils import (
+    ChunkedArray,
+    factorize,
+    fingerprint,
     get_index,
     get_label,
+    group_slices,
     load_dataset,
     numpy_1d,
     numpy_2d,
     remove_any_nan,
     round_down,
     round_up,
-    timedelta_round,
+    to_datetime,
+    to_numeric,
     tolerance_round,
+    zip_chunks,
 )
 
 
@@ -112,6 +120,8 @@ def test_numpy_2d(x, expected_np_2d):
         (pd.DataFrame(np.array([0, 1])), np.array([0, 1])),
         ([0, 1], np.array([0, 1])),
         ("box", np.array(["box"])),
+        (1.5, np.array([1.5])),
+        (np.datetime64("2001-01-01"), np.array([np.datetime64("2001-01-01")])),
     ],
 )
 def test_numpy_1d(x, expected_np_1d):
@@ -144,13 +154,86 @@ def test_get_index(x, expected_index):
     np.testing.assert_equal(index, expected_index)
 
 
+def test_chunked_array_iteration():
+    chunked = ChunkedArray(np.arange(10), chunksize=4)
+    chunked = chunked.concatenate([np.array([10, 11])])
+
+    chunks = [list(chunk) for chunk in chunked]
+    assert chunks == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9], [10, 11]]
+
+
+def test_chunked_array_one_shot_iterator_raises():
+    with pytest.raises(TypeError):
+        ChunkedArray(iter([np.arange(2)]))
+
+
+def test_zip_chunks():
+    x = ChunkedArray(lambda: iter([np.arange(3), np.arange(3, 10)]))
+    y = ChunkedArray(np.arange(10), chunksize=4)
+
+    for x_chunk, y_chunk in zip_chunks(x, y):
+        np.testing.assert_equal(x_chunk, y_chunk)
+
+    with pytest.raises(ValueError):
+        list(zip_chunks(x, np.arange(11)))
+    with pytest.raises(ValueError):
+        list(zip_chunks(np.arange(9), x))
+
+
+@pytest.mark.parametrize(
+    "x, same, other",
+    [
+        (np.arange(3), np.arange(3), np.arange(1, 4)),
+        (np.arange(3), np.arange(3), np.arange(3).astype(float)),
+        ([np.arange(3), "a"], [np.arange(3), "a"], [np.arange(3), "b"]),
+        ({"label": "a"}, {"label": "a"}, {"label": "b"}),
+        (np.array(["a", None]), np.array(["a", None]), np.array(["b", None])),
+        (pd.Series([1, 2], name="a"), pd.Series([1, 2], name="a"), pd.Series([1, 2])),
+    ],
+)
+def test_fingerprint(x, same, other):
+    assert fingerprint(x) == fingerprint(same)
+    assert fingerprint(x) != fingerprint(other)
+
+
+def test_fingerprint_chunked_array():
+    chunked = ChunkedArray(np.arange(10))
+    assert fingerprint(chunked) == fingerprint(chunked)
+    assert fingerprint(chunked) != fingerprint(ChunkedArray(np.arange(10)))
+
+
+@pytest.mark.parametrize("with_pandas", [True, False])
 @pytest.mark.parametrize(
-    "x, expected_unit",
+    "x, expected_codes, expected_values",
     [
-        (np.timedelta64(86400000000000, "ns"), "D"),
-        (np.timedelta64(3600000000000, "ns"), "h"),
-        (np.timedelta64(1000000, "ns"), "ms"),
+        (np.array([3, 1, 3, 2]), [2, 0, 2, 1], [1, 2, 3]),
+        (np.array(["b", "a", "b"]), [1, 0, 1], ["a", "b"]),
+        (np.array([2.0, np.nan, 1.0, np.nan]), [1, -1, 0, -1], [1.0, 2.0]),
+        (np.array([], dtype=float), [], []),
     ],
 )
-def test_timedelta_round(x, expected_unit):
-    assert timedelta_round(x) == expected_unit
+def test_factorize(monkeypatch, with_pandas, x, expected_codes, expected_values):
+    if not with_pandas:
+        monkeypatch.delitem(sys.modules, "pandas")
+    codes, values = factorize(x)
+    np.testing.assert_array_equal(codes, expected_codes)
+    np.testing.assert_array_equal(values, expected_values)
+
+
+def test_group_slices():
+    codes = np.array([1, -1, 0, 1, 0, 2])
+    order, slices = group_slices(codes, 4)
+
+    groups = [order[group].tolist() for group in slices]
+    assert groups == [[2, 4], [0, 3], [5], []]
+
+
+@pytest.mark.parametrize("unit", ["ns", "s", "D"])
+def test_to_numeric_datetime(unit):
+    x = np.array(["1969-12-31", "2001-01-01"], dtype=f"datetime64[{unit}]")
+    numeric = to_numeric(x)
+
+    assert numeric.dtype == np.int64
+    np.testing.assert_array_equal(numeric, [-86400 * 10**9, 978307200 * 10**9])
+    np.testing.assert_array_equal(to_datetime(numeric), x)
+    assert np.shares_memory(numeric, x) == (unit == "ns")  # a view, if possible